@@ -0,0 +1,78 @@
+# File: app/analysis/bands.py
+
+import numpy as np
+from endaq.calc.utils import sample_spacing
+from scipy import fft as sp_fft
+
+# Octave ratio and reference frequency of IEC 61260-1 (base-10 bands)
+OCTAVE_RATIO = 10.0 ** 0.3
+REFERENCE_FREQUENCY = 1000.0
+
+
+def band_edges(fraction: int, f_min: float, f_max: float):
+    """
+    Centre, lower and upper frequencies of the 1/fraction-octave bands overlapping f_min..f_max
+    (fraction 1: octaves, 3: third octaves), following IEC 61260-1.
+    Returns (centers, lower, upper).
+    """
+    if f_max <= 0 or f_max < f_min:
+        empty = np.empty(0)
+        return empty, empty, empty
+    half_band = OCTAVE_RATIO ** (1.0 / (2 * fraction))
+    f_min = max(f_min, np.finfo(float).tiny)
+    first = int(np.floor(fraction * np.log(f_min / half_band / REFERENCE_FREQUENCY) / np.log(OCTAVE_RATIO))) + 1
+    last = int(np.ceil(fraction * np.log(f_max * half_band / REFERENCE_FREQUENCY) / np.log(OCTAVE_RATIO))) - 1
+    centers = REFERENCE_FREQUENCY * OCTAVE_RATIO ** (np.arange(first, last + 1) / fraction)
+    return centers, centers / half_band, centers * half_band
+
+
+def power_spectrum(values, sample_spacing: float, workers: int = -1):
+    """
+    One-sided power of every spectral line of every column of values[sample, column] (Parseval-scaled,
+    so the lines of a column add up to its mean square), from one rfft of the whole block on all cores.
+    Returns (frequencies, power[frequency, column]).
+    """
+    # Columns as rows, so every transform runs over contiguous samples
+    values = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T)
+    length = values.shape[-1]
+    spectrum = sp_fft.rfft(values, axis=-1, workers=workers)
+    power = np.square(spectrum.real) + np.square(spectrum.imag)
+    power *= 2.0 / length ** 2
+    # DC and (for even lengths) Nyquist have no mirrored half
+    power[:, 0] /= 2
+    if length % 2 == 0:
+        power[:, -1] /= 2
+    return sp_fft.rfftfreq(length, d=sample_spacing), np.ascontiguousarray(power.T)
+
+
+def compute_power_spectrum(df):
+    """power_spectrum of all columns of a time-indexed DataFrame."""
+    return power_spectrum(df.to_numpy(), sample_spacing(df))
+
+
+def amplitude_power(amplitudes):
+    """Power (mean square, A² / 2) of the lines of amplitude spectra, e.g. FREQ-domain data[frequency, column]."""
+    return np.square(np.asarray(amplitudes, dtype=np.float64)) / 2
+
+
+def band_levels(frequencies, power, fraction: int):
+    """
+    RMS level of every 1/fraction-octave band for every column of power[frequency, column]: the power of the
+    lines whose frequency lies in the band, summed through one cumulative sum for all bands and columns.
+    Bands cover the positive frequency range of the lines; the DC line belongs to no band.
+    Returns (centers, lower, upper, levels[band, column]).
+    """
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    order = np.argsort(frequencies, kind='stable')
+    frequencies, power = frequencies[order], np.asarray(power, dtype=np.float64)[order]
+    positive = frequencies[frequencies > 0]
+    if positive.size == 0:
+        empty = np.empty(0)
+        return empty, empty, empty, np.empty((0, power.shape[1]))
+
+    centers, lower, upper = band_edges(fraction, positive[0], positive[-1])
+    cumulative = np.zeros((len(frequencies) + 1, power.shape[1]))
+    np.cumsum(power, axis=0, out=cumulative[1:])
+    start = np.searchsorted(frequencies, lower, side='left')
+    stop = np.searchsorted(frequencies, upper, side='left')
+    return centers, lower, upper, np.sqrt(np.maximum(cumulative[stop] - cumulative[start], 0.0))
@@ -1,5 +1,6 @@
 # File: app/analysis/data_processing.py
 
+import numpy as np
 import pandas as pd
 from scipy.signal.windows import tukey
 from scipy.signal import butter, filtfilt
@@ -87,6 +88,92 @@ def compute_sampling_rate_series(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+# --- Rolling statistics ---
+ROLLING_STATISTICS = ('rms', 'mean', 'std', 'peak')
+
+
+def _blocks(values, window, fill):
+    """values[column, sample] padded with fill to whole blocks of `window` samples: [column, block, sample]."""
+    num_cols, length = values.shape
+    num_blocks = -(-length // window)
+    blocks = np.full((num_cols, num_blocks * window), fill)
+    blocks[:, :length] = values
+    return blocks.reshape(num_cols, num_blocks, window)
+
+
+def _window_sums(values, window):
+    """
+    Sums of every run of `window` consecutive samples of values[column, sample]. The cumulative sum restarts
+    at every block of `window` samples, so its rounding error stays that of one window instead of growing
+    along the signal. A run starting inside block k is the rest of block k plus the head of block k + 1.
+    """
+    num_cols, length = values.shape
+    prefix = np.cumsum(_blocks(values, window, 0.0), axis=-1)
+    totals = prefix[..., -1]
+    prefix = prefix.reshape(num_cols, -1)
+    count = length - window + 1
+    head = prefix[:, window - 1:length]
+    rest = np.repeat(totals, window, axis=-1)[:, :count]
+    rest[:, 1:] -= prefix[:, :count - 1]
+    # A run starting at a block boundary is that block alone
+    rest[:, ::window] = 0.0
+    return rest + head
+
+
+def _window_maxima(values, window):
+    """Maxima of every run of `window` consecutive samples of values[column, sample] (van Herk / Gil-Werman)."""
+    num_cols, length = values.shape
+    blocks = _blocks(values, window, -np.inf)
+    prefix = np.maximum.accumulate(blocks, axis=-1).reshape(num_cols, -1)
+    suffix = np.maximum.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(num_cols, -1)
+    return np.maximum(suffix[:, :length - window + 1], prefix[:, window - 1:length])
+
+
+def rolling_statistic(values, window: int, statistic: str):
+    """
+    Trailing rolling statistic over `window` samples of every column of values[sample, column] in O(n):
+    'mean', 'rms' and 'std' (ddof=1) from blockwise cumulative sums, 'peak' (maximum absolute value) from
+    block prefix/suffix maxima, so the cost does not depend on the window. Like pandas' rolling(window),
+    the first window - 1 rows and every window that contains a NaN sample are NaN.
+    """
+    # Columns as rows, so every scan runs over contiguous samples
+    values = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T)
+    result = np.full(values.shape, np.nan)
+    window = min(max(int(window), 1), values.shape[1])
+    if values.shape[1] == 0:
+        return result.T
+
+    # NaN samples are zero-filled for the scans and only blank the windows that contain them
+    missing = np.isnan(values)
+    has_missing = bool(missing.any())
+    if has_missing:
+        values = np.where(missing, 0.0, values)
+
+    valid = result[:, window - 1:]
+    if statistic == 'peak':
+        valid[:] = _window_maxima(np.abs(values), window)
+    elif statistic == 'rms':
+        valid[:] = np.sqrt(np.maximum(_window_sums(np.square(values), window) / window, 0.0))
+    elif statistic in ('mean', 'std'):
+        # Summing the deviations from the column mean limits the cancellation in the variance
+        num_valid = values.shape[1] - missing.sum(axis=1, keepdims=True)
+        offset = values.sum(axis=1, keepdims=True) / np.maximum(num_valid, 1)
+        centered = values - offset
+        if has_missing:
+            centered[missing] = 0.0
+        sums = _window_sums(centered, window)
+        if statistic == 'mean':
+            valid[:] = sums / window + offset
+        elif window > 1:
+            squares = _window_sums(np.square(centered), window)
+            valid[:] = np.sqrt(np.maximum((squares - np.square(sums) / window) / (window - 1), 0.0))
+    else:
+        raise ValueError(f"Unknown rolling statistic '{statistic}'")
+    if has_missing:
+        valid[_window_sums(missing.astype(np.float64), window) > 0.5] = np.nan
+    return result.T
+
+
 # --- Builders that return per-folder DataFrames ready for plotting ---
 def build_series_by_folder(
         df: pd.DataFrame,
@@ -184,6 +271,39 @@ def build_fs_by_folder(
     return result
 
 
+def build_rolling_stat_by_folder(
+        df: pd.DataFrame,
+        selected_col: str,
+        statistic: str,
+        window_seconds: float,
+        section_enabled: bool = False,
+        t_min_text: str = '',
+        t_max_text: str = '',
+) -> dict:
+    """
+    Builds a dict of rolling-statistic DataFrames per DataFolder for one column (TIME domain).
+    The window is converted to samples with each folder's mean time step; folders with the same length
+    and window are computed as one 2-D block.
+    """
+    series = build_series_by_folder(df, selected_col, 'TIME', section_enabled, t_min_text, t_max_text)
+    groups = {}
+    for key, plot_df in series.items():
+        if len(plot_df) < 2:
+            continue
+        time = plot_df.index.to_numpy(dtype=float)
+        dt = (time[-1] - time[0]) / (len(time) - 1)
+        window = int(round(window_seconds / dt)) if dt > 0 else 1
+        groups.setdefault((len(plot_df), window), []).append(key)
+
+    result = {}
+    for (_, window), keys in groups.items():
+        block = rolling_statistic(np.column_stack([series[key].iloc[:, 0].to_numpy() for key in keys]),
+                                  window, statistic)
+        for i, key in enumerate(keys):
+            result[key] = pd.DataFrame({selected_col: block[:, i]}, index=series[key].index)
+    return {key: result[key] for key in series if key in result}
+
+
 # --- Single-folder builders ---
 def build_series_for_single(
         df: pd.DataFrame,
@@ -0,0 +1,94 @@
+# File: app/analysis/envelope.py
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+EnvelopeBlocks = namedtuple('EnvelopeBlocks', ['level', 'x_start', 'x_end', 'mins', 'maxs'])
+
+
+def _halve(values, reduce):
+    """Reduces pairs of consecutive samples with reduce (np.fmin / np.fmax); an odd last sample is carried over."""
+    even = len(values) & ~1
+    halved = np.empty((len(values) + 1) // 2, dtype=np.float32)
+    reduce(values[0:even:2], values[1:even:2], out=halved[:even // 2])
+    if len(values) % 2:
+        halved[-1] = values[-1]
+    return halved
+
+
+def _reduce_levels(values, reduce):
+    """Levels 1, 2, ... of a pyramid: each level halves the previous one until a single block is left."""
+    levels = []
+    while len(values) > 1:
+        values = _halve(values, reduce)
+        levels.append(values)
+    return levels
+
+
+class MinMaxPyramid:
+    """
+    Min/max envelope of a signal at power-of-two resolutions. Level k holds the minimum and maximum of
+    consecutive blocks of 2**k samples (level 0 is the signal itself), so the envelope for any number of
+    points and any x range is read from the closest level instead of rolling over the samples again.
+    Levels above 0 are stored in float32, which halves their memory and is exact enough for display.
+    NaN samples are ignored, like pandas' rolling min/max does.
+    """
+
+    def __init__(self, x, y, min_levels, max_levels):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.min_levels = [self.y] + list(min_levels)
+        self.max_levels = [self.y] + list(max_levels)
+
+    def __len__(self):
+        return len(self.x)
+
+    @property
+    def value_range(self):
+        """(minimum, maximum) of the whole signal, read from the top level."""
+        return float(self.min_levels[-1][0]), float(self.max_levels[-1][0])
+
+    def _sample_range(self, x_range):
+        """Sample indices inside x_range, widened by one sample on each side so lines reach the plot edges."""
+        if x_range is None:
+            return 0, len(self.x)
+        start = max(0, int(np.searchsorted(self.x, x_range[0], side='left')) - 1)
+        stop = min(len(self.x), int(np.searchsorted(self.x, x_range[1], side='right')) + 1)
+        return start, max(stop, start + 1)
+
+    def query(self, desired_num_points, x_range=None):
+        """
+        Returns the EnvelopeBlocks covering x_range (the whole signal by default) at the coarsest level that
+        still gives at least desired_num_points blocks. Ranges holding fewer than twice that many samples are
+        answered from level 0, i.e. with the samples themselves (x_start == x_end, mins == maxs).
+        """
+        start, stop = self._sample_range(x_range)
+        count = stop - start
+        level = 0
+        if desired_num_points > 0 and count >= 2 * desired_num_points:
+            level = min(int(np.log2(count / desired_num_points)), len(self.min_levels) - 1)
+
+        first, last = start >> level, ((stop - 1) >> level) + 1
+        block_starts = np.arange(first, last) << level
+        block_ends = np.minimum(block_starts + ((1 << level) - 1), len(self.x) - 1)
+        return EnvelopeBlocks(level, self.x[block_starts], self.x[block_ends],
+                              self.min_levels[level][first:last], self.max_levels[level][first:last])
+
+
+def build_pyramids(series, max_workers=None):
+    """
+    Builds the MinMaxPyramid of every (x, y) pair of a dict, keeping its keys.
+    The min and max levels of each series are reduced in separate threads; NumPy releases the GIL
+    during the reductions, so series (e.g. folders) are processed in parallel.
+    """
+    if not series:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for name, (x, y) in series.items():
+            y = np.asarray(y, dtype=np.float64)
+            futures[name] = (x, y, pool.submit(_reduce_levels, y, np.fmin), pool.submit(_reduce_levels, y, np.fmax))
+        return {name: MinMaxPyramid(x, y, mins.result(), maxs.result())
+                for name, (x, y, mins, maxs) in futures.items()}
@@ -0,0 +1,114 @@
+# File: app/analysis/fatigue.py
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+# Wöhler (S-N) slopes the damage-equivalent loads are computed for
+WOHLER_EXPONENTS = (3.0, 4.0, 5.0, 8.0, 10.0)
+# Damage-equivalent loads are normalised to this many cycles per second of signal (1 Hz equivalent loads)
+EQUIVALENT_FREQUENCY = 1.0
+# Below this many samples in total, starting worker processes costs more than it saves
+PROCESS_POOL_MIN_SAMPLES = 1 << 24
+
+FatigueResult = namedtuple('FatigueResult', ['dels', 'matrix', 'range_edges', 'mean_edges'])
+
+
+def turning_points(values):
+    """Peaks and valleys of a signal (plus its first and last sample); NaN and repeated samples are dropped."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size:
+        values = values[np.concatenate(([True], values[1:] != values[:-1]))]
+    if values.size < 3:
+        return values
+    rising = np.diff(values) > 0
+    return values[np.concatenate(([True], rising[1:] != rising[:-1], [True]))]
+
+
+def _alternate_in_runs(mask):
+    """Keeps every other True of each run of consecutive Trues (the 1st, 3rd, ...)."""
+    index = np.arange(mask.size)
+    run_start = np.maximum.accumulate(np.where(mask & ~np.concatenate(([False], mask[:-1])), index, 0))
+    return mask & ((index - run_start) % 2 == 0)
+
+
+def rainflow_cycles(values):
+    """
+    Rainflow count (four-point method) of a signal. Instead of walking a stack point by point, every pass
+    removes all non-overlapping closed cycles (b, c) with |c - b| <= |b - a| and |c - b| <= |d - c| at once;
+    removing a closed cycle never changes which others close, so the passes find the same cycles.
+    The residue is counted as half cycles. Returns (ranges, means, counts) with counts 1.0 or 0.5.
+    """
+    points = turning_points(values)
+    ranges, means = [], []
+    while points.size >= 4:
+        inner = np.abs(np.diff(points))
+        closed = (inner[1:-1] <= inner[:-2]) & (inner[1:-1] <= inner[2:])
+        # Neighbouring candidates share a point, so only every other one of a run is removed in this pass
+        closed = _alternate_in_runs(closed)
+        first = np.flatnonzero(closed) + 1
+        if first.size == 0:
+            break
+        ranges.append(inner[first])
+        means.append((points[first] + points[first + 1]) / 2)
+        keep = np.ones(points.size, dtype=bool)
+        keep[first] = keep[first + 1] = False
+        points = points[keep]
+
+    full_count = sum(r.size for r in ranges)
+    ranges.append(np.abs(np.diff(points)))
+    means.append((points[1:] + points[:-1]) / 2)
+    ranges, means = np.concatenate(ranges), np.concatenate(means)
+    counts = np.full(ranges.size, 0.5)
+    counts[:full_count] = 1.0
+    return ranges, means, counts
+
+
+def damage_equivalent_load(ranges, counts, wohler_exponent: float, equivalent_cycles: float):
+    """Constant range that causes the damage of the counted cycles (Miner's rule) in equivalent_cycles cycles."""
+    if equivalent_cycles <= 0 or ranges.size == 0:
+        return 0.0
+    return float((np.sum(counts * ranges ** wohler_exponent) / equivalent_cycles) ** (1.0 / wohler_exponent))
+
+
+def cycle_matrix(ranges, means, counts, range_bins: int = 32, mean_bins: int = 16):
+    """Cycle counts binned by range and mean. Returns (matrix[range bin, mean bin], range_edges, mean_edges)."""
+    range_edges = np.linspace(0.0, max(float(ranges.max(initial=0.0)), np.finfo(float).tiny), range_bins + 1)
+    low, high = (float(means.min()), float(means.max())) if means.size else (0.0, 0.0)
+    mean_edges = np.linspace(low, high if high > low else low + 1.0, mean_bins + 1)
+    matrix, _, _ = np.histogram2d(ranges, means, bins=(range_edges, mean_edges), weights=counts)
+    return matrix, range_edges, mean_edges
+
+
+def analyse_signal(values, equivalent_cycles: float, wohler_exponents=WOHLER_EXPONENTS,
+                   range_bins: int = 32, mean_bins: int = 16) -> FatigueResult:
+    """Rainflow count of one signal reduced to its damage-equivalent loads and cycle matrix."""
+    ranges, means, counts = rainflow_cycles(values)
+    dels = np.array([damage_equivalent_load(ranges, counts, m, equivalent_cycles) for m in wohler_exponents])
+    return FatigueResult(dels, *cycle_matrix(ranges, means, counts, range_bins, mean_bins))
+
+
+def analyse_signals(signals, wohler_exponents=WOHLER_EXPONENTS, range_bins: int = 32, mean_bins: int = 16,
+                    max_workers=None):
+    """
+    Fatigue results of several signals, e.g. every component of a side in every folder.
+    signals: key -> (values, duration in seconds); the DELs are normalised to EQUIVALENT_FREQUENCY.
+    Large batches are spread over a pool of worker processes (spawned, so it is safe to start from a
+    worker thread of the GUI); main.py calls multiprocessing.freeze_support for the frozen build.
+    Returns {key: FatigueResult} in the order of signals.
+    """
+    jobs = [(key, np.asarray(values, dtype=np.float64), duration * EQUIVALENT_FREQUENCY)
+            for key, (values, duration) in signals.items()]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1 or sum(values.size for _, values, _ in jobs) < PROCESS_POOL_MIN_SAMPLES:
+        return {key: analyse_signal(values, cycles, wohler_exponents, range_bins, mean_bins)
+                for key, values, cycles in jobs}
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        futures = {key: pool.submit(analyse_signal, values, cycles, wohler_exponents, range_bins, mean_bins)
+                   for key, values, cycles in jobs}
+        return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,95 @@
+# File: app/analysis/level_statistics.py
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Bins of a histogram / levels of a level-crossing count, spread evenly over each column's range
+DEFAULT_BINS = 64
+# Rows binned per step, so the temporary index arrays stay in the CPU cache
+ROW_BLOCK = 1 << 14
+
+
+def _column_bins(values, bins):
+    """Lower bound and bin width of every column of values[sample, column], and whether NaN samples occur."""
+    low, high = values.min(axis=0), values.max(axis=0)
+    has_nan = bool(np.isnan(low).any())
+    if has_nan:
+        with warnings.catch_warnings():
+            # All-NaN columns get an empty range
+            warnings.simplefilter('ignore', RuntimeWarning)
+            low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        low, high = np.nan_to_num(low), np.nan_to_num(high)
+    span = np.where(high > low, high - low, 1.0)
+    return low, span / bins, has_nan
+
+
+def histograms(values, bins: int = DEFAULT_BINS):
+    """
+    Sample histograms of every column of values[sample, column], each over its own min..max range.
+    Each block of rows is binned for all columns by one np.bincount over (column, bin) indices.
+    Returns (edges[column, bins + 1], counts[column, bins]).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    num_cols = values.shape[1]
+    low, width, has_nan = _column_bins(values, bins)
+    offsets = np.arange(num_cols) * bins
+    counts = np.zeros(num_cols * bins, dtype=np.int64)
+    for start in range(0, len(values), ROW_BLOCK):
+        position = (values[start:start + ROW_BLOCK] - low) / width
+        # The maximum of a column lies on the last edge and belongs to the last bin; NaN rows are dropped below
+        with np.errstate(invalid='ignore'):
+            index = np.minimum(position, bins - 1).astype(np.int64) + offsets
+        if has_nan:
+            index = index[~np.isnan(position)]
+        counts += np.bincount(index.ravel(), minlength=num_cols * bins)
+    edges = low[:, None] + width[:, None] * np.arange(bins + 1)
+    return edges, counts.reshape(num_cols, bins)
+
+
+def level_crossings(values, levels: int = DEFAULT_BINS):
+    """
+    Up-crossing counts of `levels` evenly spaced levels (the bin centres of histograms()) for every column of
+    values[sample, column]. A rising step from a to b crosses the levels a < level <= b; each step adds +1 at its
+    first and -1 after its last level in a difference array, so bincount and one cumulative sum count all
+    columns without looping over levels. Returns (levels[column, levels], counts[column, levels]).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    num_cols = values.shape[1]
+    low, width, _ = _column_bins(values, levels)
+    size = num_cols * (levels + 1)
+    steps = np.zeros(size, dtype=np.int64)
+    for start in range(0, max(len(values) - 1, 0), ROW_BLOCK):
+        # Level i sits at position i; blocks overlap by one row, so no step is lost between them
+        position = (values[start:start + ROW_BLOCK + 1] - low) / width - 0.5
+        before, after = position[:-1], position[1:]
+        with np.errstate(invalid='ignore'):
+            rows, cols = np.nonzero(after > before)
+        first = np.maximum(np.floor(before[rows, cols]) + 1, 0).astype(np.int64)
+        last = np.minimum(np.floor(after[rows, cols]), levels - 1).astype(np.int64)
+        crossing = first <= last
+        offset = cols[crossing] * (levels + 1)
+        steps += np.bincount(offset + first[crossing], minlength=size)
+        steps -= np.bincount(offset + last[crossing] + 1, minlength=size)
+    counts = np.cumsum(steps.reshape(num_cols, levels + 1), axis=1)[:, :-1]
+    return low[:, None] + width[:, None] * (np.arange(levels) + 0.5), counts
+
+
+def compute_level_statistics(blocks, statistic, bins: int = DEFAULT_BINS, max_workers=None):
+    """
+    Histograms ('histogram') or level crossings ('crossings') of several 2-D column blocks, e.g. one per
+    DataFolder or Part Loads side. Blocks are processed in parallel threads; NumPy releases the GIL in
+    the binning. Returns {key: (edges or levels, counts)} in the order of blocks.
+    """
+    if statistic == 'histogram':
+        compute = histograms
+    elif statistic == 'crossings':
+        compute = level_crossings
+    else:
+        raise ValueError(f"Unknown level statistic '{statistic}'")
+    if not blocks:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {key: pool.submit(compute, values, bins) for key, values in blocks.items()}
+        return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,110 @@
+# File: app/analysis/result_cache.py
+
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def default_cache_dir(name):
+    """Per-user cache folder of the application (e.g. %LOCALAPPDATA%\\WE-DAVIS\\<name>)."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'WE-DAVIS', name)
+
+
+def hash_arrays(*arrays):
+    """Content digest of NumPy arrays, used to recognise the same data across sessions."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode('ascii'))
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of computed results (any picklable value, e.g. a tuple of NumPy arrays or a dict
+    of DataFrames). The most recent entries are kept in memory; with a disk folder, entries are also pickled
+    to .pkl files, so results survive restarts. The least recently used files are deleted once the folder
+    grows past max_disk_bytes.
+    """
+
+    def __init__(self, max_entries=8, disk_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f'{name}.pkl')
+
+    def get(self, key):
+        """Returns the cached result for a key, or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                return result
+        if self.disk_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            # The modification time orders the files for eviction
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            return None
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        """Stores a result in memory and, if enabled, on disk. Disk errors only disable persistence of the entry."""
+        self._remember(key, result)
+        if self.disk_dir is None:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            print(f"Could not write the result cache: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _evict_disk(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,303 @@
+# File: app/analysis/spectral.py
+
+import warnings
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from endaq.calc.utils import sample_spacing
+from scipy import fft as sp_fft
+from scipy import signal
+
+# Frames are transformed in blocks of about this many samples to bound the temporary memory
+FRAME_BLOCK_SAMPLES = 1 << 23
+
+SpectrogramLayout = namedtuple('SpectrogramLayout', ['nperseg', 'step', 'num_frames', 'amplitude_scale'])
+
+
+@lru_cache(maxsize=32)
+def get_spectrogram_layout(length: int, num_slices: int, nperseg: int, num_f: int) -> SpectrogramLayout:
+    """
+    Frame layout of a rolling FFT, following endaq's spectrogram: boxcar frames of nperseg samples,
+    stepped so that a signal num_f frames long yields about num_slices frames.
+    Cached, since only num_slices changes between most spectrum updates of a signal.
+    """
+    nperseg = max(1, min(nperseg, length))
+    step = max(1, nperseg * num_f // max(1, num_slices))
+    num_frames = max(0, (length - nperseg) // step + 1)
+
+    # 'unit' scaling: a sinusoid of amplitude A peaks at A. The one-sided spectrum doubles the power of every
+    # bin except DC and (for even frames) Nyquist, so those bins get sqrt(2)/n instead of 2/n.
+    num_bins = nperseg // 2 + 1
+    amplitude_scale = np.full(num_bins, 2.0 / nperseg, dtype=np.float32)
+    amplitude_scale[0] = np.sqrt(2.0) / nperseg
+    if nperseg % 2 == 0 and num_bins > 1:
+        amplitude_scale[-1] = np.sqrt(2.0) / nperseg
+    amplitude_scale.setflags(write=False)
+    return SpectrogramLayout(nperseg, step, num_frames, amplitude_scale)
+
+
+def _centered_float32(values):
+    """
+    values minus the mean of each signal (along the last axis) as a C-contiguous float32 array. The mean is
+    removed in float64, since a large offset would leave float32 too little resolution for the fluctuation
+    around it; the frame detrend in float32 then only removes what is left of it.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    offset = values.mean(axis=-1, keepdims=True)
+    if not np.isfinite(offset).all():
+        # NaN samples keep spoiling only their own frames
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            offset = np.nanmean(values, axis=-1, keepdims=True)
+        offset = np.where(np.isfinite(offset), offset, 0.0)
+    centered = np.empty(values.shape, dtype=np.float32)
+    np.subtract(values, offset, out=centered, casting='same_kind')
+    return centered
+
+
+def rolling_spectrum(values, sample_spacing: float, num_slices: int, bin_width: float = 1.0, workers: int = -1):
+    """
+    Computes the amplitude spectrum of overlapping frames of a signal.
+    Equivalent to endaq.calc.fft.rolling_fft (boxcar window, constant detrend, 'unit' scaling),
+    computed in float32 with scipy.fft.rfft on all cores.
+    values may also be a 2-D stack of equally long signals (one per row), transformed in the same pass.
+    Returns (frequencies, frame center times relative to the first sample, amplitudes[..., frame, bin]).
+    """
+    values = _centered_float32(values)
+    fs = 1.0 / sample_spacing
+    length = values.shape[-1]
+    layout = get_spectrogram_layout(length, int(num_slices), int(fs / bin_width), int(length / fs / bin_width))
+    nperseg, step, num_frames = layout.nperseg, layout.step, layout.num_frames
+
+    frequencies = sp_fft.rfftfreq(nperseg, d=sample_spacing)
+    times = (np.arange(num_frames) * step + nperseg / 2) / fs
+    amplitudes = np.empty(values.shape[:-1] + (num_frames, nperseg // 2 + 1), dtype=np.float32)
+    if num_frames == 0:
+        return frequencies, times, amplitudes
+
+    # Strided view of all frames; no samples are copied until a block is detrended
+    frames = np.lib.stride_tricks.sliding_window_view(values, nperseg, axis=-1)[..., ::step, :]
+    block = max(1, FRAME_BLOCK_SAMPLES // (nperseg * max(1, values[..., 0].size)))
+    for start in range(0, num_frames, block):
+        chunk = frames[..., start:start + block, :]
+        chunk = chunk - chunk.mean(axis=-1, keepdims=True, dtype=np.float32)
+        spectrum = sp_fft.rfft(chunk, axis=-1, workers=workers)
+        np.abs(spectrum, out=amplitudes[..., start:start + block, :])
+    amplitudes *= layout.amplitude_scale
+    return frequencies, times, amplitudes
+
+
+def compute_spectrum(df, num_slices: int):
+    """
+    Rolling spectrum of the first column of a time-indexed DataFrame.
+    Returns (frequencies, absolute frame times, amplitudes[frame, bin]).
+    """
+    frequencies, times, amplitudes = rolling_spectrum(df.iloc[:, 0].to_numpy(), sample_spacing(df), num_slices)
+    return frequencies, times + df.index[0], amplitudes
+
+
+def _group_equal_signals(df_dict):
+    """
+    Groups time-indexed DataFrames by (length, sampling rate), so each group can be stacked into one 2-D array.
+    Signals of fewer than two samples have no sampling rate and are left out.
+    Returns a list of (sample spacing, [(key, df), ...]).
+    """
+    groups = {}
+    for name, df in df_dict.items():
+        if df is None or len(df) < 2:
+            continue
+        spacing = sample_spacing(df)
+        # Rates are compared rounded, since the spacing is estimated from each frame's time stamps
+        groups.setdefault((len(df), round(1.0 / spacing, 6)), (spacing, []))[1].append((name, df))
+    return list(groups.values())
+
+
+def compute_spectra(df_dict, num_slices: int):
+    """
+    Rolling spectra of several time-indexed single-column DataFrames (e.g. one per DataFolder).
+    Signals with the same sampling rate and length are stacked into a 2-D array and transformed together,
+    so a batch of load cases costs one rolling_spectrum call per distinct (rate, length).
+    Returns {key: compute_spectrum() result} in the order of df_dict.
+    """
+    spectra = {}
+    for spacing, members in _group_equal_signals(df_dict):
+        stack = np.stack([df.iloc[:, 0].to_numpy() for _, df in members])
+        frequencies, times, amplitudes = rolling_spectrum(stack, spacing, num_slices)
+        for (name, df), amplitude in zip(members, amplitudes):
+            spectra[name] = (frequencies, times + df.index[0], amplitude)
+    return {name: spectra[name] for name in df_dict if name in spectra}
+
+
+def _welch_frames(values, sample_spacing: float, bin_width: float):
+    """
+    Welch frame layout shared by welch_psd and welch_csd: strided frames[column, frame, sample] of values[sample,
+    column] (periodic Hann frames of fs / bin_width samples, 50 % overlap), the window, the one-sided density
+    scale per bin and the frequencies. Returns (frames, window, scale, frequencies).
+    """
+    # Channels as rows, so every frame is a contiguous run of samples
+    values = _centered_float32(np.asarray(values).T)
+    fs = 1.0 / sample_spacing
+    length = values.shape[-1]
+    nperseg = max(1, min(int(fs / bin_width), length))
+    step = nperseg - nperseg // 2
+    num_bins = nperseg // 2 + 1
+
+    window = signal.get_window('hann', nperseg).astype(np.float32)
+    # One-sided density: every bin but DC and (for even frames) Nyquist carries the power of both sides
+    scale = np.full(num_bins, 2.0 / (fs * np.sum(window.astype(np.float64) ** 2)), dtype=np.float32)
+    scale[0] /= 2
+    if nperseg % 2 == 0 and num_bins > 1:
+        scale[-1] /= 2
+
+    frames = np.lib.stride_tricks.sliding_window_view(values, nperseg, axis=-1)[:, ::step, :]
+    return frames, window, scale, sp_fft.rfftfreq(nperseg, d=sample_spacing)
+
+
+def welch_psd(values, sample_spacing: float, bin_width: float = 1.0, workers: int = -1):
+    """
+    Welch power spectral density of every column of values[sample, column] at once.
+    Equivalent to endaq.calc.psd.welch / scipy.signal.welch defaults (periodic Hann frames of fs / bin_width
+    samples, 50 % overlap, constant detrend, mean of frames, 'density' scaling); the frames of all columns are
+    transformed as strided views with scipy.fft.rfft on all cores, in float32.
+    Returns (frequencies, psd[frequency, column]).
+    """
+    frames, window, scale, frequencies = _welch_frames(values, sample_spacing, bin_width)
+    num_cols, num_frames, nperseg = frames.shape
+    psd = np.empty((num_cols, scale.size), dtype=np.float32)
+    block = max(1, FRAME_BLOCK_SAMPLES // (num_frames * nperseg))
+    for start in range(0, num_cols, block):
+        chunk = frames[start:start + block]
+        chunk = (chunk - chunk.mean(axis=-1, keepdims=True, dtype=np.float32)) * window
+        spectrum = sp_fft.rfft(chunk, axis=-1, workers=workers)
+        power = np.square(spectrum.real) + np.square(spectrum.imag)
+        psd[start:start + block] = power.mean(axis=1)
+    psd *= scale
+    return frequencies, np.ascontiguousarray(psd.T)
+
+
+def welch_csd(values, pairs, sample_spacing: float, bin_width: float = 1.0, workers: int = -1):
+    """
+    Welch auto-spectra of every column of values[sample, column] and cross-spectral densities of the
+    (reference, response) column pairs, with the frames and scaling of welch_psd (Gxy = conj(X) Y, like
+    scipy.signal.csd). All columns go through one rfft per block of frames, so a column shared by many pairs is
+    transformed once. Returns (frequencies, auto[frequency, column], csd[frequency, pair]).
+    """
+    frames, window, scale, frequencies = _welch_frames(values, sample_spacing, bin_width)
+    num_cols, num_frames, nperseg = frames.shape
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    reference, response = pairs[:, 0], pairs[:, 1]
+    auto = np.zeros((num_cols, scale.size))
+    csd = np.zeros((len(pairs), scale.size), dtype=np.complex128)
+
+    # Blocks of frames of all columns, since a pair needs the spectra of both of its columns
+    block = max(1, FRAME_BLOCK_SAMPLES // (num_cols * nperseg))
+    for start in range(0, num_frames, block):
+        chunk = frames[:, start:start + block]
+        chunk = (chunk - chunk.mean(axis=-1, keepdims=True, dtype=np.float32)) * window
+        spectrum = sp_fft.rfft(chunk, axis=-1, workers=workers)
+        auto += (np.square(spectrum.real) + np.square(spectrum.imag)).sum(axis=1)
+        csd += (np.conj(spectrum[reference]) * spectrum[response]).sum(axis=1)
+    auto *= scale / num_frames
+    csd *= scale / num_frames
+    return frequencies, np.ascontiguousarray(auto.T), np.ascontiguousarray(csd.T)
+
+
+def compute_csd(df, pairs, bin_width: float = 1.0):
+    """welch_csd of the columns of a time-indexed DataFrame; pairs hold (reference, response) column positions."""
+    return welch_csd(df.to_numpy(), pairs, sample_spacing(df), bin_width)
+
+
+def coherence(auto_reference, auto_response, csd):
+    """Magnitude-squared coherence |Gxy|² / (Gxx Gyy); lines without power on either side are 0."""
+    denominator = auto_reference * auto_response
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.square(np.abs(csd)) / denominator
+    return np.where(denominator > 0, result, 0.0)
+
+
+def transfer_function_h1(auto_reference, csd):
+    """H1 estimate Gxy / Gxx of the frequency response from the reference to the response (NaN without input power)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(auto_reference > 0, csd / auto_reference, np.nan)
+
+
+def compute_psd(df, bin_width: float = 1.0):
+    """Welch PSD of all columns of a time-indexed DataFrame. Returns (frequencies, psd[frequency, column])."""
+    return welch_psd(df.to_numpy(), sample_spacing(df), bin_width)
+
+
+def compute_psds(df_dict, bin_width: float = 1.0):
+    """
+    Welch PSDs of several time-indexed single-column DataFrames (e.g. one per DataFolder); signals with the
+    same sampling rate and length go through welch_psd as one 2-D block.
+    Returns {key: (frequencies, psd)} in the order of df_dict.
+    """
+    psds = {}
+    for spacing, members in _group_equal_signals(df_dict):
+        frequencies, psd = welch_psd(np.column_stack([df.iloc[:, 0].to_numpy() for _, df in members]),
+                                     spacing, bin_width)
+        for i, (name, _) in enumerate(members):
+            psds[name] = (frequencies, psd[:, i])
+    return {name: psds[name] for name in df_dict if name in psds}
+
+
+def limit_spectrum(frequencies, amplitudes, freq_max=None):
+    """
+    Keeps positive frequencies up to freq_max and marks zero amplitudes as missing (NaN),
+    the same filtering endaq's spectrum_over_time applies before plotting.
+    """
+    keep = frequencies > 0.0
+    if freq_max is not None:
+        keep &= frequencies <= freq_max
+    amplitudes = amplitudes[:, keep]
+    return frequencies[keep], np.where(amplitudes > 0, amplitudes, np.float32(np.nan))
+
+
+def _pool_starts(count, max_bins):
+    """Start indices of at most max_bins nearly equal groups of count items."""
+    return np.unique(np.linspace(0, count, min(count, max_bins) + 1).astype(np.int64))[:-1]
+
+
+def _range_slice(values, value_range):
+    """Index slice of the sorted values inside value_range, widened by one sample on each side."""
+    if value_range is None:
+        return slice(0, len(values))
+    start = max(0, int(np.searchsorted(values, value_range[0], side='left')) - 1)
+    stop = min(len(values), int(np.searchsorted(values, value_range[1], side='right')) + 1)
+    return slice(start, max(stop, start + 1))
+
+
+def bin_spectrum(frequencies, times, amplitudes, max_times, max_freqs, log_freq=False,
+                 time_range=None, freq_range=None):
+    """
+    Reduces amplitudes[frame, bin] to at most max_times x max_freqs cells for display by max-pooling,
+    so narrow peaks stay visible. With log_freq, frequencies are pooled into log-spaced bins.
+    time_range / freq_range restrict the result to a zoomed region, which is then pooled at the same
+    resolution (finer tiles). Returns (times, frequencies, z[frequency, time]) like a heatmap expects.
+    """
+    time_slice = _range_slice(times, time_range)
+    freq_slice = _range_slice(frequencies, freq_range)
+    times, frequencies = times[time_slice], frequencies[freq_slice]
+    amplitudes = amplitudes[time_slice, freq_slice]
+    if times.size == 0 or frequencies.size == 0:
+        return times, frequencies, np.empty((frequencies.size, times.size), dtype=np.float32)
+
+    # fmax ignores NaN (missing cells) unless a whole group is missing
+    starts = _pool_starts(times.size, max_times)
+    ends = np.append(starts[1:], times.size) - 1
+    amplitudes = np.fmax.reduceat(amplitudes, starts, axis=0)
+    times = (times[starts] + times[ends]) / 2
+
+    if log_freq and frequencies[0] > 0 and frequencies.size > 1:
+        edges = np.geomspace(frequencies[0], frequencies[-1], min(frequencies.size, max_freqs) + 1)
+        starts = np.unique(np.searchsorted(frequencies, edges[:-1], side='left'))
+        ends = np.append(starts[1:], frequencies.size) - 1
+        amplitudes = np.fmax.reduceat(amplitudes, starts, axis=1)
+        frequencies = np.sqrt(frequencies[starts] * frequencies[ends])
+    else:
+        starts = _pool_starts(frequencies.size, max_freqs)
+        ends = np.append(starts[1:], frequencies.size) - 1
+        amplitudes = np.fmax.reduceat(amplitudes, starts, axis=1)
+        frequencies = (frequencies[starts] + frequencies[ends]) / 2
+    return times, frequencies, np.ascontiguousarray(amplitudes.T)
@@ -183,6 +183,34 @@ class ActionHandler(QtCore.QObject):
         except (ValueError, KeyError) as e:
             QMessageBox.critical(self.main_window, "Error", f"An error occurred during data extraction: {e}")
 
+    @QtCore.pyqtSlot()
+    def handle_part_loads_results_export(self):
+        """
+        Saves the tables behind the PSD / SRS / Rainflow plots of the Part Loads tab as CSV: the main table
+        under the chosen name, further tables (e.g. rainflow cycle matrices) next to it with their suffix.
+        """
+        tab = self.main_window.tab_part_loads
+        tables = tab.current_export_tables
+        if not tables:
+            QMessageBox.warning(self.main_window, "No Data", "No results to export. Please plot a PSD, SRS, Rainflow, level statistic or band levels first.")
+            return
+
+        plot_type = tab.plot_type_selector.currentText()
+        side = tab.side_filter_selector.currentText()
+        save_path, _ = QFileDialog.getSaveFileName(
+            self.main_window, "Save Results", f"{plot_type}_{side}.csv", "CSV Files (*.csv)"
+        )
+        if not save_path:
+            return
+        root, ext = os.path.splitext(save_path)
+        try:
+            for suffix, table in tables.items():
+                table.to_csv(f"{root}{suffix}{ext or '.csv'}")
+        except OSError as e:
+            QMessageBox.critical(self.main_window, "Error", f"Could not save the results: {e}")
+            return
+        QMessageBox.information(self.main_window, "Export Successful", f"Data successfully saved to:\n{save_path}")
+
     @QtCore.pyqtSlot()
     def handle_ansys_export(self):
         """Controller slot to manage the Ansys export process."""
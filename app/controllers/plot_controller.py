@@ -1,12 +1,44 @@
 # File: app/controllers/plot_controller.py
 
 import re
+import math
+import time
+from functools import partial
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from PyQt5 import QtCore
-from dataclasses import dataclass
-
+from PyQt5.QtWebEngineWidgets import QWebEngineView
+from dataclasses import dataclass, replace
+
+from .plot_tasks import PlotTask
+from .update_scheduler import UpdateScheduler
+from ..plotting.figure_cache import FigureCache
+from ..plotting.serialization import SerializedFigure
+from ..plotting.web_view import (
+    apply_style_to_webviews,
+    get_tile_url,
+    set_tile_provider,
+    set_webviews_busy,
+    set_webviews_suspended,
+)
+from ..analysis.result_cache import ResultCache, default_cache_dir, hash_arrays
+from ..analysis.bands import amplitude_power, band_levels, compute_power_spectrum
+from ..analysis.envelope import build_pyramids
+from ..analysis.fatigue import WOHLER_EXPONENTS, FatigueResult, analyse_signals
+from ..analysis.level_statistics import compute_level_statistics
+from ..analysis.shock import compute_srs
+from ..analysis.spectral import (
+    bin_spectrum,
+    coherence,
+    compute_csd,
+    compute_psd,
+    compute_psds,
+    compute_spectra,
+    compute_spectrum,
+    limit_spectrum,
+    transfer_function_h1,
+)
 from ..analysis.data_processing import (
     apply_data_section,
     apply_tukey_window,
@@ -16,11 +48,12 @@ from ..analysis.data_processing import (
     build_series_by_folder,
     build_dt_by_folder,
     build_fs_by_folder,
+    build_rolling_stat_by_folder,
     build_multi_series_for_single,
 )
 
 
-@dataclass
+@dataclass(frozen=True)
 class SingleDataOptions:
     selected_col: str
     section_enabled: bool
@@ -33,12 +66,34 @@ class SingleDataOptions:
     num_slices_text: str
     plot_type: str
     colorscale: str
+    # Source column and window of the 'Rolling ...' computed selections
+    rolling_source_col: str
+    rolling_window_text: str
+
+
+@dataclass(frozen=True)
+class SpectrumDisplayOptions:
+    # Pixel size of the spectrum view, rounded up to DISPLAY_SIZE_STEP so small resizes keep the cached figure
+    width: int
+    height: int
+    freq_max_text: str
+    log_freq: bool
+
+
+DISPLAY_SIZE_STEP = 128
 
 
 class PlotController(QtCore.QObject):
     # Constants for computed selections
     TIME_STEP_LABEL = 'Time Step (Δt)'
     FS_LABEL = 'Sampling Rate (Hz)'
+    # Rolling statistics of a source column: label -> statistic of data_processing.rolling_statistic
+    ROLLING_STAT_LABELS = {'Rolling RMS': 'rms', 'Rolling Mean': 'mean', 'Rolling Std': 'std', 'Rolling Peak': 'peak'}
+    # Sources (column, folders, section, filter) whose envelope pyramids are kept
+    ENVELOPE_PYRAMID_ENTRIES = 4
+
+    # Emitted after a view's figures were handed to its web views: (view, timings in seconds)
+    plot_timing = QtCore.pyqtSignal(str, object)
 
     """
     Handles all logic for updating plots in response to UI changes.
@@ -47,6 +102,38 @@ class PlotController(QtCore.QObject):
         super().__init__(parent)
         self.main_window = main_window
         self.plotter = self.main_window.plotter
+        self.figure_cache = FigureCache()
+        # Plot tabs whose figures are out of date; they are rebuilt when shown
+        self._stale_tabs = set()
+        self.update_scheduler = UpdateScheduler(parent=self)
+        # Figures are built off the GUI thread; each view keeps only its latest request
+        self.thread_pool = QtCore.QThreadPool(self)
+        self._tasks = {}
+        self._generations = {}
+        # Superseded tasks that already run in the pool, by (view, generation), kept until their signal arrives
+        self._retired_tasks = {}
+        # Spectral matrices by source data and options, so figure-only changes skip the FFT.
+        # Kept on disk as well, for the large runs that are reopened often (see set_spectrum_cache_dir).
+        self.spectrum_cache_dir = default_cache_dir('spectrum')
+        self.spectrum_cache = ResultCache(max_entries=8, disk_dir=self.spectrum_cache_dir)
+        self._source_digests = {}
+        # Welch PSDs by dataset version and options (memory only; one entry holds all folders of a Single Data
+        # column, or all components of a Part Loads side)
+        self.psd_cache = ResultCache(max_entries=16)
+        # Shock response spectra of Part Loads sides by dataset version and options (memory only)
+        self.srs_cache = ResultCache(max_entries=8)
+        # Rainflow results of Part Loads components by dataset version and options (memory only)
+        self.fatigue_cache = ResultCache(max_entries=32)
+        # Power spectra of Part Loads sides for the octave bands, by dataset version and options (memory only)
+        self.band_cache = ResultCache(max_entries=8)
+        # Auto / cross spectra of all common columns against a Compare Data reference, by both dataset versions
+        self.cross_spectra_cache = ResultCache(max_entries=4)
+        # Histograms / level crossings of Part Loads sides by dataset version and options (memory only)
+        self.level_stats_cache = ResultCache(max_entries=8)
+        # Rolling statistics by dataset version and options (memory only; one entry holds all folders)
+        self.rolling_cache = ResultCache(max_entries=16)
+        # Min/max pyramids of the envelope plot by source data and options (see ENVELOPE_PYRAMID_ENTRIES)
+        self._envelope_pyramids = {}
 
     def _get_df(self):
         return self.main_window.df
@@ -90,14 +177,11 @@ class PlotController(QtCore.QObject):
     def _get_data_domain(self):
         return self.main_window.data_domain
 
-    def _get_plot_df(self, cols, source_df=None):
+    @staticmethod
+    def _get_plot_df(cols, source_df, data_domain):
         """Prepares a DataFrame for plotting with the correct index."""
-        df = self._get_df()
-        if df is None:
+        if source_df is None:
             return pd.DataFrame()
-            
-        source_df = source_df if source_df is not None else df
-        data_domain = self._get_data_domain()
 
         if not all(col in source_df.columns for col in [data_domain] + cols):
             return pd.DataFrame()
@@ -117,30 +201,11 @@ class PlotController(QtCore.QObject):
             return False
 
     def _is_computed_metric(self, name: str) -> bool:
-        return name in (self.TIME_STEP_LABEL, self.FS_LABEL)
+        return name in (self.TIME_STEP_LABEL, self.FS_LABEL) or name in self.ROLLING_STAT_LABELS
 
     def _get_phase_col(self, col: str) -> str:
         return f'Phase_{col}'
 
-    def _update_phase_plot_for_single(self, selected_col: str, is_multi_folder: bool) -> None:
-        """Shows/hides the phase plot matching current behavior for Single Data tab."""
-        df = self._get_df()
-        tab = self.main_window.tab_single_data
-        if self._is_computed_metric(selected_col):
-            tab.set_phase_plot_visibility(False)
-            return
-        if self._get_data_domain() == 'FREQ' and not is_multi_folder:
-            phase_col = self._get_phase_col(selected_col)
-            if phase_col in df.columns:
-                phase_df = self._get_plot_df([phase_col])
-                phase_fig = self.plotter.create_standard_figure({phase_col: phase_df}, f'Phase of {selected_col}', 'Phase [deg]')
-                tab.set_phase_plot_visibility(True)
-                tab.display_phase_plot(phase_fig)
-            else:
-                tab.set_phase_plot_visibility(False)
-        else:
-            tab.set_phase_plot_visibility(False)
-
     def _snapshot_single_data_options(self) -> SingleDataOptions:
         tab = self.main_window.tab_single_data
         return SingleDataOptions(
@@ -155,10 +220,25 @@ class PlotController(QtCore.QObject):
             num_slices_text=tab.num_slices_input.text(),
             plot_type=tab.plot_type_selector.currentText(),
             colorscale=tab.colorscale_selector.currentText(),
+            rolling_source_col=tab.rolling_source_selector.currentText(),
+            rolling_window_text=tab.rolling_window_input.text(),
+        )
+
+    def _snapshot_spectrum_display_options(self) -> SpectrumDisplayOptions:
+        tab = self.main_window.tab_single_data
+        view = tab.spectrum_plot
+        ratio = view.devicePixelRatioF()
+        # A view that has not been laid out yet reports a tiny size; assume a typical plot area instead
+        width, height = max(view.width(), 800) * ratio, max(view.height(), 400) * ratio
+        return SpectrumDisplayOptions(
+            width=int(-(-width // DISPLAY_SIZE_STEP) * DISPLAY_SIZE_STEP),
+            height=int(-(-height // DISPLAY_SIZE_STEP) * DISPLAY_SIZE_STEP),
+            freq_max_text=tab.freq_max_input.text(),
+            log_freq=tab.log_freq_checkbox.isChecked(),
         )
 
     # Additional snapshot dataclasses and methods for other tabs
-    @dataclass
+    @dataclass(frozen=True)
     class InterfaceDataOptions:
         interface: str
         side: str
@@ -170,7 +250,7 @@ class PlotController(QtCore.QObject):
             side=tab.side_selector.currentText(),
         )
 
-    @dataclass
+    @dataclass(frozen=True)
     class PartLoadsOptions:
         side: str
         exclude: bool
@@ -179,6 +259,7 @@ class PlotController(QtCore.QObject):
         section_max_text: str
         tukey_enabled: bool
         tukey_alpha: float
+        plot_type: str
 
     def _snapshot_part_loads_options(self) -> 'PlotController.PartLoadsOptions':
         tab = self.main_window.tab_part_loads
@@ -190,19 +271,26 @@ class PlotController(QtCore.QObject):
             section_max_text=tab.section_max_input.text(),
             tukey_enabled=tab.tukey_checkbox.isChecked(),
             tukey_alpha=tab.tukey_alpha_spin.value(),
+            plot_type=tab.plot_type_selector.currentText(),
         )
 
-    @dataclass
+    @dataclass(frozen=True)
     class CompareDataOptions:
         selected_column: str
+        analysis: str
+        reference_column: str
 
     def _snapshot_compare_data_options(self) -> 'PlotController.CompareDataOptions':
         tab = self.main_window.tab_compare_data
+        analysis = tab.analysis_selector.currentText()
         return PlotController.CompareDataOptions(
             selected_column=tab.compare_column_selector.currentText(),
+            analysis=analysis,
+            # The reference only matters for the cross spectrum
+            reference_column=tab.reference_selector.currentText() if analysis == tab.CROSS_SPECTRUM else '',
         )
 
-    @dataclass
+    @dataclass(frozen=True)
     class ComparePartLoadsOptions:
         side: str
         exclude: bool
@@ -214,7 +302,7 @@ class PlotController(QtCore.QObject):
             exclude=tab.exclude_checkbox.isChecked(),
         )
 
-    @dataclass
+    @dataclass(frozen=True)
     class TimeDomainRepresentOptions:
         frequency_text: str
         selected_side: str
@@ -228,6 +316,27 @@ class PlotController(QtCore.QObject):
             selected_side=side,
         )
 
+    @dataclass(frozen=True)
+    class EnvelopeOptions:
+        enabled: bool
+        desired_num_points_text: str
+        plot_as_bars: bool
+
+    def _snapshot_envelope_options(self) -> 'PlotController.EnvelopeOptions':
+        settings_tab = self.main_window.tab_settings
+        return PlotController.EnvelopeOptions(
+            enabled=settings_tab.rolling_min_max_checkbox.isChecked(),
+            desired_num_points_text=settings_tab.desired_num_points_input.text(),
+            plot_as_bars=settings_tab.plot_as_bars_checkbox.isChecked(),
+        )
+
+    def _render_key(self, *options, compare=False):
+        """Builds the figure cache key from the dataset version(s), the plotter data settings and the option snapshots."""
+        key = (self.main_window.data_version, self._get_data_domain(), self.plotter.get_data_key()) + options
+        if compare:
+            key += (self.main_window.compare_data_version,)
+        return key
+
     def _should_exclude_component(self, col_name: str) -> bool:
         """
         Checks if a column should be excluded based on the T2/T3/R2/R3 filter,
@@ -268,13 +377,10 @@ class PlotController(QtCore.QObject):
 
         return final_cols
 
-    def _calculate_differences(self, columns):
+    @staticmethod
+    def _calculate_differences(df, df_compare, columns, data_domain):
         """Calculates the absolute difference between two dataframes for given columns,
            gracefully skipping columns not present in both dataframes."""
-        df = self._get_df()
-        df_compare = self._get_compare_df()
-        data_domain = self._get_data_domain()
-
         if df is None or df_compare is None:
             return pd.DataFrame()
 
@@ -331,10 +437,7 @@ class PlotController(QtCore.QObject):
         return pd.DataFrame(diff_dict) if diff_dict else pd.DataFrame()
 
     # region Signal Slots
-    @QtCore.pyqtSlot()
-    def update_all_plots_from_settings(self):
-        if self._get_df() is None: return
-
+    def _read_style_settings(self):
         settings_tab = self.main_window.tab_settings
         self.plotter.legend_font_size = int(settings_tab.legend_font_size_selector.currentText())
         self.plotter.default_font_size = int(settings_tab.default_font_size_selector.currentText())
@@ -345,42 +448,304 @@ class PlotController(QtCore.QObject):
         except Exception:
             self.plotter.trace_opacity = 1.0
 
-        self.update_single_data_plots()
-        self.update_interface_data_plots()
-        self.update_part_loads_plots()
-        self.update_time_domain_represent_plot()
-        self.update_compare_data_plots()
-        self.update_compare_part_loads_plots()
+    def set_spectrum_cache_dir(self, disk_dir):
+        """Moves the on-disk spectrum cache to another folder (e.g. a temporary one for benchmarks)."""
+        self.spectrum_cache_dir = disk_dir
+        if self.spectrum_cache.disk_dir is not None:
+            self.spectrum_cache.disk_dir = disk_dir
+
+    @QtCore.pyqtSlot(bool)
+    def set_spectrum_disk_cache_enabled(self, enabled):
+        """Turns writing and reading spectra on disk on or off; the in-memory entries stay either way."""
+        self.spectrum_cache.disk_dir = self.spectrum_cache_dir if enabled else None
 
     @QtCore.pyqtSlot()
-    def update_single_data_plots(self):
-        df = self._get_df()
-        if df is None: return
-        tab = self.main_window.tab_single_data
-        opts = self._snapshot_single_data_options()
-        selected_col = opts.selected_col
-        if not selected_col: return
+    def update_all_plots_from_settings(self):
+        if self._get_df() is None: return
 
-        is_multi_folder = self._is_multi_folder()
+        self._read_style_settings()
+        self.plotter.webgl_point_threshold = self.main_window.tab_settings.webgl_threshold_spin.value()
+
+        self.refresh_visible_tab()
+
+    @QtCore.pyqtSlot()
+    def apply_style_from_settings(self):
+        self._read_style_settings()
+        self.apply_plot_style()
+
+    def apply_plot_style(self):
+        """Pushes the current plotter style into every displayed figure without rebuilding any data."""
+        web_views = self.main_window.findChildren(QWebEngineView)
+        apply_style_to_webviews(web_views, self.plotter.get_style_update(), self.plotter.trace_opacity)
+
+    def _tab_updaters(self):
+        """Maps each plot tab to the slot that rebuilds its figures."""
+        mw = self.main_window
+        return {
+            mw.tab_single_data: self.update_single_data_plots,
+            mw.tab_interface_data: self.update_interface_data_plots,
+            mw.tab_part_loads: self.update_part_loads_plots,
+            mw.tab_time_domain_represent: self.update_time_domain_represent_plot,
+            mw.tab_compare_data: self.update_compare_data_plots,
+            mw.tab_compare_part_loads: self.update_compare_part_loads_plots,
+        }
+
+    def refresh_visible_tab(self):
+        """Updates the active plot tab now and marks every other plot tab stale."""
+        updaters = self._tab_updaters()
+        current_tab = self.main_window.tab_widget.currentWidget()
+        self._stale_tabs = set(updaters)
+        self._stale_tabs.discard(current_tab)
+        if current_tab in updaters:
+            updaters[current_tab]()
+
+    def request_tab_update(self, tab):
+        """Updates the tab if it is visible, otherwise defers the update until it is shown."""
+        if tab is self.main_window.tab_widget.currentWidget():
+            self._stale_tabs.discard(tab)
+            self._tab_updaters()[tab]()
+        else:
+            self._stale_tabs.add(tab)
+
+    def _scheduled_updates(self):
+        """Maps the view names accepted by schedule_update to the update they run."""
+        mw = self.main_window
+        return {
+            'single_data': partial(self.request_tab_update, mw.tab_single_data),
+            'single_data_spectrum': self.update_spectrum_plot_only,
+            'interface_data': partial(self.request_tab_update, mw.tab_interface_data),
+            'part_loads': partial(self.request_tab_update, mw.tab_part_loads),
+            'time_domain_represent': partial(self.request_tab_update, mw.tab_time_domain_represent),
+            'compare_data': partial(self.request_tab_update, mw.tab_compare_data),
+            'compare_part_loads': partial(self.request_tab_update, mw.tab_compare_part_loads),
+            'settings': self.update_all_plots_from_settings,
+            'style': self.apply_style_from_settings,
+        }
+
+    def schedule_update(self, view):
+        """Queues a debounced update; repeated requests for the same view within the delay run once."""
+        self.update_scheduler.schedule(view, self._scheduled_updates()[view])
+
+    def on_tab_shown(self, tab):
+        """Suspends the pages of hidden plot tabs and rebuilds the figures of the shown tab if they are stale."""
+        for other_tab in self._tab_updaters():
+            if other_tab is not tab:
+                set_webviews_suspended(other_tab.findChildren(QWebEngineView), True)
+        set_webviews_suspended(tab.findChildren(QWebEngineView), False)
+
+        if self._get_df() is None or tab not in self._stale_tabs: return
+        self._stale_tabs.discard(tab)
+        self._tab_updaters()[tab]()
+
+    # endregion
+
+    # region Background Rendering
+    def is_idle(self):
+        """True when no plot update is waiting in the scheduler and no figure is being built."""
+        return not self._tasks and not self.update_scheduler.has_pending()
+
+    def view_web_views(self, view):
+        """Returns the web views that display the figures of a view."""
+        mw = self.main_window
+        web_views = {
+            'single_data': [mw.tab_single_data.regular_plot, mw.tab_single_data.phase_plot],
+            'single_data_spectrum': [mw.tab_single_data.spectrum_plot],
+            'interface_data': [mw.tab_interface_data.t_series_plot, mw.tab_interface_data.r_series_plot],
+            'part_loads': [mw.tab_part_loads.t_series_plot, mw.tab_part_loads.r_series_plot],
+            'time_domain_represent': [mw.tab_time_domain_represent.time_domain_plot],
+            'compare_data': [mw.tab_compare_data.compare_regular_plot, mw.tab_compare_data.compare_absolute_diff_plot,
+                             mw.tab_compare_data.compare_percent_diff_plot],
+            'compare_part_loads': [mw.tab_compare_part_loads.t_series_plot, mw.tab_compare_part_loads.r_series_plot],
+        }
+        return web_views.get(view, [])
+
+    def _get_style_snapshot(self):
+        return self.plotter.get_style_update(), self.plotter.trace_opacity
+
+    def _submit(self, view, render_key, build, apply, on_error=None):
+        """
+        Runs build() in the thread pool and apply(result) on the GUI thread.
+        Every request gets a new generation ID per view, so results of superseded requests are dropped.
+        """
+        running = self._tasks.get(view)
+        if running is not None:
+            # The same figure is already being built
+            if running.render_key == render_key: return
+            running.cancel()
+            # A task that has not started leaves the pool here; a running one must outlive its worker thread
+            if not self.thread_pool.tryTake(running):
+                self._retired_tasks[(view, running.generation)] = running
+            del self._tasks[view]
+        if self.figure_cache.is_current(view, render_key):
+            set_webviews_busy(self.view_web_views(view), False)
+            return
+
+        generation = self._generations.get(view, 0) + 1
+        self._generations[view] = generation
+        task = PlotTask(view, generation, render_key, build, apply, on_error, style=self._get_style_snapshot())
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+        self._tasks[view] = task
+        set_webviews_busy(self.view_web_views(view), True)
+        self.thread_pool.start(task)
+
+    def _take_current_task(self, view, generation):
+        """Returns the task if it is the latest request of the view, None if it was superseded."""
+        task = self._tasks.get(view)
+        if task is None or task.generation != generation:
+            return None
+        del self._tasks[view]
+        return task
+
+    @QtCore.pyqtSlot(str, int, object)
+    def _on_task_finished(self, view, generation, result):
+        self._retired_tasks.pop((view, generation), None)
+        task = self._take_current_task(view, generation)
+        if task is None: return
+        web_views = self.view_web_views(view)
+        apply_started_at = time.perf_counter()
+        task.apply(result)
+        applied_at = time.perf_counter()
+        self.figure_cache.store(view, task.render_key)
+        # The figure was styled with the settings at request time; catch up if they changed meanwhile
+        if task.style != self._get_style_snapshot():
+            layout_update, opacity = self._get_style_snapshot()
+            apply_style_to_webviews(web_views, layout_update, opacity)
+        set_webviews_busy(web_views, False)
+        self.plot_timing.emit(view, {
+            'generation': generation,
+            'submitted_at': task.submitted_at,
+            'queued': task.started_at - task.submitted_at,
+            'build': task.finished_at - task.started_at,
+            'apply': applied_at - apply_started_at,
+            'applied_at': applied_at,
+        })
+
+    @QtCore.pyqtSlot(str, int, object)
+    def _on_task_failed(self, view, generation, error):
+        self._retired_tasks.pop((view, generation), None)
+        task = self._take_current_task(view, generation)
+        if task is None: return
+        print(f"Could not update '{view}' plots: {error}")
+        self.figure_cache.invalidate(view)
+        if task.on_error is not None:
+            task.on_error(error)
+        set_webviews_busy(self.view_web_views(view), False)
+    # endregion
+
+    # region Figure Builders (run in worker threads, must not touch widgets)
+    def _build_phase_figure(self, df, selected_col, is_multi_folder, data_domain):
+        """Returns the phase figure of the Single Data tab, or None when the phase plot is hidden."""
+        if self._is_computed_metric(selected_col):
+            return None
+        if data_domain == 'FREQ' and not is_multi_folder:
+            phase_col = self._get_phase_col(selected_col)
+            if phase_col in df.columns:
+                phase_df = self._get_plot_df([phase_col], df, data_domain)
+                phase_fig = self.plotter.create_standard_figure({phase_col: phase_df}, f'Phase of {selected_col}', 'Phase [deg]')
+                return SerializedFigure(phase_fig)
+        return None
+
+    def _envelope_pyramid_key(self, opts, is_multi_folder, data_version):
+        """Identifies the envelope pyramids of a Single Data request; the number of points and bar mode are not part of it."""
+        section = (opts.section_min_text, opts.section_max_text) if opts.section_enabled else None
+        low_pass = (opts.cutoff_frequency_text, opts.filter_order) if opts.filter_enabled else None
+        rolling = None
+        if opts.selected_col in self.ROLLING_STAT_LABELS:
+            rolling = (opts.rolling_source_col, opts.rolling_window_text)
+        return data_version, opts.selected_col, is_multi_folder, section, low_pass, rolling
+
+    def _store_envelope_pyramids(self, key, dfs_for_plot):
+        """Builds the min/max pyramids of every folder series and keeps the most recent ones."""
+        series = {name: (df.index.to_numpy(), df.iloc[:, 0].to_numpy())
+                  for name, df in dfs_for_plot.items() if df is not None and not df.empty}
+        x_axis_title = next((df.index.name for df in dfs_for_plot.values() if df is not None), None)
+        entry = (build_pyramids(series), x_axis_title)
+        # Replaced as a whole, since worker threads read the dict concurrently
+        pyramids = dict(self._envelope_pyramids)
+        pyramids[key] = entry
+        while len(pyramids) > self.ENVELOPE_PYRAMID_ENTRIES:
+            del pyramids[next(iter(pyramids))]
+        self._envelope_pyramids = pyramids
+        return entry
+
+    def _build_rolling_statistic(self, df, opts, is_multi_folder, data_version):
+        """
+        Rolling statistic of the source column of every DataFolder. Folders with the same length and window
+        form one 2-D block (data_processing.build_rolling_stat_by_folder). Switching back to a statistic or
+        window shown before reuses the cached folder -> series dict. Returns None if the window is not a
+        positive, finite number.
+        """
+        try:
+            window_seconds = float(opts.rolling_window_text)
+        except ValueError:
+            return None
+        # float() also accepts 'nan' and 'inf'
+        if not math.isfinite(window_seconds) or window_seconds <= 0:
+            return None
+
+        section = (opts.section_min_text, opts.section_max_text) if opts.section_enabled else None
+        cache_key = (data_version, opts.selected_col, opts.rolling_source_col, window_seconds, section)
+        dfs_for_plot = self.rolling_cache.get(cache_key)
+        if dfs_for_plot is None:
+            dfs_for_plot = build_rolling_stat_by_folder(
+                df,
+                selected_col=opts.rolling_source_col,
+                statistic=self.ROLLING_STAT_LABELS[opts.selected_col],
+                window_seconds=window_seconds,
+                section_enabled=opts.section_enabled,
+                t_min_text=opts.section_min_text,
+                t_max_text=opts.section_max_text,
+            )
+            self.rolling_cache.put(cache_key, dfs_for_plot)
+        # A single folder is named after the selection, like the Δt and sampling-rate plots
+        if not is_multi_folder and dfs_for_plot:
+            dfs_for_plot = {opts.selected_col: next(iter(dfs_for_plot.values()))}
+        return dfs_for_plot
+
+    def _build_single_data(self, df, opts, envelope_opts, is_multi_folder, data_version, data_domain):
+        selected_col = opts.selected_col
+        plot_title = f"{selected_col} Plot"
+        is_rolling = data_domain == 'TIME' and selected_col in self.ROLLING_STAT_LABELS
+        if is_rolling:
+            plot_title = f"{selected_col} of {opts.rolling_source_col} ({opts.rolling_window_text} s)"
+        use_envelope = (envelope_opts.enabled and data_domain == 'TIME'
+                        and selected_col not in (self.TIME_STEP_LABEL, self.FS_LABEL))
+        envelope_points = None
+        if use_envelope:
+            try:
+                envelope_points = int(envelope_opts.desired_num_points_text)
+            except ValueError:
+                pass
+
+        # Envelope pyramids of the same data are reused, so only the figure is rebuilt
+        envelope_key = envelope_entry = None
+        if envelope_points is not None:
+            envelope_key = self._envelope_pyramid_key(opts, is_multi_folder, data_version)
+            envelope_entry = self._envelope_pyramids.get(envelope_key)
+        if envelope_entry is not None:
+            dfs_for_plot = None
         # Use builders to construct the plot data map
-        if self._get_data_domain() == 'TIME' and selected_col == self.TIME_STEP_LABEL:
+        elif data_domain == 'TIME' and selected_col == self.TIME_STEP_LABEL:
             dfs_for_plot = build_dt_by_folder(df, section_enabled=opts.section_enabled,
                                               t_min_text=opts.section_min_text, t_max_text=opts.section_max_text)
             # Key for single-folder case should be selected_col to keep legend titles consistent
             if not is_multi_folder and dfs_for_plot:
                 only_key = next(iter(dfs_for_plot))
                 dfs_for_plot = {selected_col: dfs_for_plot[only_key]}
-        elif self._get_data_domain() == 'TIME' and selected_col == self.FS_LABEL:
+        elif data_domain == 'TIME' and selected_col == self.FS_LABEL:
             dfs_for_plot = build_fs_by_folder(df, section_enabled=opts.section_enabled,
                                               t_min_text=opts.section_min_text, t_max_text=opts.section_max_text)
             if not is_multi_folder and dfs_for_plot:
                 only_key = next(iter(dfs_for_plot))
                 dfs_for_plot = {selected_col: dfs_for_plot[only_key]}
+        elif is_rolling:
+            dfs_for_plot = self._build_rolling_statistic(df, opts, is_multi_folder, data_version)
         else:
             dfs_for_plot = build_series_by_folder(
                 df,
                 selected_col=selected_col,
-                data_domain=self._get_data_domain(),
+                data_domain=data_domain,
                 section_enabled=opts.section_enabled,
                 t_min_text=opts.section_min_text,
                 t_max_text=opts.section_max_text,
@@ -389,70 +754,65 @@ class PlotController(QtCore.QObject):
                 filter_order=opts.filter_order,
             )
 
-        plot_title = f"{selected_col} Plot"
+        tile_source = None
         if selected_col == self.TIME_STEP_LABEL:
             fig = self.plotter.create_standard_figure(dfs_for_plot, title=self.TIME_STEP_LABEL, y_axis_title='Time Step [s]')
         elif selected_col == self.FS_LABEL:
             fig = self.plotter.create_standard_figure(dfs_for_plot, title=self.FS_LABEL, y_axis_title='Sampling Rate [Hz]')
-        elif self.main_window.tab_settings.rolling_min_max_checkbox.isChecked() and self._get_data_domain() == 'TIME':
-            try:
-                points = int(self.main_window.tab_settings.desired_num_points_input.text())
-                as_bars = self.main_window.tab_settings.plot_as_bars_checkbox.isChecked()
-                fig = self.plotter.create_rolling_envelope_figure(dfs_for_plot, plot_title, points, as_bars)
-            except ValueError:
-                fig = self.plotter.create_standard_figure(dfs_for_plot, title=f"{plot_title} (Invalid Points)")
+        elif is_rolling and envelope_entry is None and dfs_for_plot is None:
+            fig = self.plotter.create_standard_figure({}, title=f"{selected_col} Plot (Invalid Window)")
+        elif use_envelope and envelope_points is None:
+            fig = self.plotter.create_standard_figure(dfs_for_plot, title=f"{plot_title} (Invalid Points)")
+        elif use_envelope:
+            if envelope_entry is None:
+                envelope_entry = self._store_envelope_pyramids(envelope_key, dfs_for_plot)
+            pyramids, x_axis_title = envelope_entry
+            as_bars = envelope_opts.plot_as_bars
+            fig = self.plotter.create_rolling_envelope_figure(pyramids, plot_title, envelope_points, as_bars,
+                                                              x_axis_title=x_axis_title,
+                                                              tile_url=get_tile_url('single_data'))
+            tile_source = (pyramids, envelope_points, as_bars)
         else:
             fig = self.plotter.create_standard_figure(dfs_for_plot, title=plot_title)
-        tab.display_regular_plot(fig)
 
-        self._update_phase_plot_for_single(selected_col, is_multi_folder)
+        return SerializedFigure(fig), self._build_phase_figure(df, selected_col, is_multi_folder, data_domain), tile_source
 
-        if self._get_data_domain() == 'TIME' and opts.spectrum_enabled and not is_multi_folder:
-            self.update_spectrum_plot_only()
-
-    @QtCore.pyqtSlot()
-    def update_interface_data_plots(self):
-        df = self._get_df()
-        if df is None: return
-        tab = self.main_window.tab_interface_data
-        opts = self._snapshot_interface_data_options()
-        interface = opts.interface
-        side = opts.side
-        if not interface or not side: return
+    def _envelope_tile(self, pyramids, desired_num_points, plot_as_bars, query):
+        """Answers a zoom tile request of the envelope plot: the envelope of the visible x range."""
+        x_range = (float(query['x0']), float(query['x1'])) if 'x0' in query else None
+        return self.plotter.get_envelope_tile(pyramids, desired_num_points, plot_as_bars, x_range)
 
+    def _build_interface_data(self, df, opts, data_domain):
+        interface, side = opts.interface, opts.side
         t_cols = [c for c in df.columns if c.startswith(interface) and side in c and any(s in c for s in ['T1', 'T2', 'T3', 'T2/T3']) and 'Phase_' not in c]
         r_cols = [c for c in df.columns if c.startswith(interface) and side in c and any(s in c for s in ['R1', 'R2', 'R3', 'R2/R3']) and 'Phase_' not in c]
 
         t_df = build_multi_series_for_single(
             df,
             columns=t_cols,
-            data_domain=self._get_data_domain(),
+            data_domain=data_domain,
             section_enabled=False,
         )
         r_df = build_multi_series_for_single(
             df,
             columns=r_cols,
-            data_domain=self._get_data_domain(),
+            data_domain=data_domain,
             section_enabled=False,
         )
+        return (SerializedFigure(self.plotter.create_standard_figure(t_df, f'Translational Components - {side}')),
+                SerializedFigure(self.plotter.create_standard_figure(r_df, f'Rotational Components - {side}')))
 
-        tab.display_t_series_plot(self.plotter.create_standard_figure(t_df, f'Translational Components - {side}'))
-        tab.display_r_series_plot(self.plotter.create_standard_figure(r_df, f'Rotational Components - {side}'))
-
-    @QtCore.pyqtSlot()
-    def update_part_loads_plots(self):
-        df = self._get_df()
-        if df is None: return
-        opts = self._snapshot_part_loads_options()
-        tab = self.main_window.tab_part_loads
+    def _build_part_loads(self, df, opts, data_version, data_domain):
+        """
+        Part Loads plots of the side. data_version and data_domain are captured when the build is submitted,
+        so a reload during the build cannot file old results under the new dataset.
+        """
         side = opts.side
-        if not side: return
-
         exclude = opts.exclude
         df_processed = df.copy()
 
         # Call helper functions for data processing
-        if self._get_data_domain() == 'TIME':
+        if data_domain == 'TIME':
             if opts.section_enabled:
                 df_processed = apply_data_section(df_processed, opts.section_min_text, opts.section_max_text)
 
@@ -463,171 +823,338 @@ class PlotController(QtCore.QObject):
         t_cols = self._filter_part_load_cols(df_processed.columns, side, ['T1', 'T2', 'T3', 'T2/T3'], exclude)
         r_cols = self._filter_part_load_cols(df_processed.columns, side, ['R1', 'R2', 'R3', 'R2/R3'], exclude)
 
+        if opts.plot_type in self.plotter.BAND_FRACTIONS:
+            return self._build_part_loads_bands(df_processed, opts, t_cols, r_cols, data_version, data_domain)
+        if opts.plot_type in (self.plotter.PSD, self.plotter.SRS) and data_domain == 'TIME':
+            return self._build_part_loads_spectrum(df_processed, opts, t_cols, r_cols, data_version)
+        if opts.plot_type == self.plotter.RAINFLOW and data_domain == 'TIME':
+            return self._build_part_loads_rainflow(df_processed, opts, t_cols, r_cols, data_version)
+        if (opts.plot_type in (self.plotter.HISTOGRAM, self.plotter.LEVEL_CROSSINGS)
+                and data_domain == 'TIME'):
+            return self._build_part_loads_level_statistics(df_processed, opts, t_cols, r_cols, data_version)
+
         # Use the processed DataFrame as the source for the plots (single-folder builder)
         t_df = build_multi_series_for_single(
             df_processed,
             columns=t_cols,
-            data_domain=self._get_data_domain(),
+            data_domain=data_domain,
             section_enabled=False,
             tukey_enabled=False,
         )
         r_df = build_multi_series_for_single(
             df_processed,
             columns=r_cols,
-            data_domain=self._get_data_domain(),
+            data_domain=data_domain,
             section_enabled=False,
             tukey_enabled=False,
         )
-        tab.display_t_series_plot(self.plotter.create_standard_figure(t_df, f'Translational Components - {side}'))
-        tab.display_r_series_plot(self.plotter.create_standard_figure(r_df, f'Rotational Components- {side}'))
-    
-    @QtCore.pyqtSlot()
-    def update_time_domain_represent_plot(self):
-        df = self._get_df()
-        if df is None or self._get_data_domain() != 'FREQ': return
-        
-        tab = self.main_window.tab_time_domain_represent
-        try:
-            opts = self._snapshot_time_domain_represent_options()
-            freq_text = opts.frequency_text
-            if not freq_text or "Select a frequency" in freq_text: return
-            freq = float(freq_text)
-
-            selected_side = opts.selected_side
-            if not selected_side:
-                tab.display_plot(go.Figure())
-                return
+        return (SerializedFigure(self.plotter.create_standard_figure(t_df, f'Translational Components - {side}')),
+                SerializedFigure(self.plotter.create_standard_figure(r_df, f'Rotational Components- {side}')),
+                {})
 
-            side_pattern = re.compile(rf'\b{re.escape(selected_side)}\b')
-            plot_cols = [c for c in df.columns if side_pattern.search(c) and not c.startswith('Phase_') and
-                         any(s in c for s in ['T1', 'T2', 'T3', 'R1', 'R2', 'R3', 'T2/T3', 'R2/R3'])]
-
-            theta = np.linspace(0, 360, 361)
-            rads = np.radians(theta)
-            plot_data = {}
-            tab.current_plot_data = {}
-            data_at_freq = df[df['FREQ'] == freq].iloc[0]
+    def _build_part_loads_spectrum(self, df_processed, opts, t_cols, r_cols, data_version):
+        """
+        PSD or SRS of all translational and rotational components of the side, computed as one 2-D block.
+        The CSV export gets the spectra with one column per component.
+        """
+        columns = t_cols + r_cols
+        is_psd = opts.plot_type == self.plotter.PSD
+        cache = self.psd_cache if is_psd else self.srs_cache
+        cache_key = (data_version, opts)
+        cached = cache.get(cache_key)
+        if cached is None:
+            block_df = build_multi_series_for_single(df_processed, columns=columns, data_domain='TIME')
+            if block_df.empty or len(block_df) < 2:
+                return SerializedFigure(go.Figure()), SerializedFigure(go.Figure()), {}
+            cached = compute_psd(block_df) if is_psd else compute_srs(block_df)
+            cache.put(cache_key, cached)
+        frequencies, values = cached
+        lines = {col: (frequencies, values[:, i]) for i, col in enumerate(columns)}
+        create_figure = self.plotter.create_psd_figure if is_psd else self.plotter.create_srs_figure
+        side = opts.side
+        fig_t = create_figure({col: lines[col] for col in t_cols}, f'Translational Components, {opts.plot_type} - {side}')
+        fig_r = create_figure({col: lines[col] for col in r_cols}, f'Rotational Components, {opts.plot_type} - {side}')
+        spectrum_df = pd.DataFrame(values, index=pd.Index(frequencies, name='Frequency [Hz]'), columns=columns)
+        return SerializedFigure(fig_t), SerializedFigure(fig_r), {'': spectrum_df}
 
-            for col in plot_cols:
-                phase_col = f'Phase_{col}'
-                if phase_col in data_at_freq:
-                    amplitude = data_at_freq[col]
-                    phase_deg = data_at_freq[phase_col]
-                    y_data = amplitude * np.cos(rads - np.radians(phase_deg))
-                    plot_data[col] = y_data
-                    tab.current_plot_data[col] = {'theta': theta, 'y_data': y_data}
-            
-            df_time_domain = pd.DataFrame(plot_data, index=theta)
-            df_time_domain.index.name = "Theta [deg]"
-            
-            title = f'Time Domain Representation at {freq} Hz for {selected_side}'
-            fig = self.plotter.create_standard_figure(df_time_domain, title)
-            tab.display_plot(fig)
+    def _build_part_loads_rainflow(self, df_processed, opts, t_cols, r_cols, data_version):
+        """
+        Rainflow counts of all translational and rotational components of the side in one batch
+        (analysis.fatigue.analyse_signals), cached per component. Also returns the damage-equivalent loads
+        (component x Wöhler exponent) and the cycle matrices (one row per non-empty cell) for the CSV export.
+        """
+        columns = t_cols + r_cols
+        base_key = (data_version, opts)
+        results = {col: self.fatigue_cache.get(base_key + (col,)) for col in columns}
+        if any(result is None for result in results.values()):
+            block_df = build_multi_series_for_single(df_processed, columns=columns, data_domain='TIME')
+            if block_df.empty or len(block_df) < 2:
+                return SerializedFigure(go.Figure()), SerializedFigure(go.Figure()), {}
+            duration = float(block_df.index[-1] - block_df.index[0])
+            results = analyse_signals({col: (block_df[col].to_numpy(), duration) for col in columns})
+            for col, result in results.items():
+                self.fatigue_cache.put(base_key + (col,), result)
+        results = {col: FatigueResult(*result) for col, result in results.items()}
 
-        except (ValueError, IndexError) as e:
-            print(f"Could not update time domain representation plot: {e}")
-            tab.display_plot(go.Figure())
+        side = opts.side
+        fig_t = self.plotter.create_rainflow_figure({col: results[col] for col in t_cols},
+                                                    f'Translational Components, Rainflow - {side}')
+        fig_r = self.plotter.create_rainflow_figure({col: results[col] for col in r_cols},
+                                                    f'Rotational Components, Rainflow - {side}')
+
+        del_df = pd.DataFrame([result.dels for result in results.values()],
+                              index=pd.Index(list(results), name='Component'),
+                              columns=[f'DEL m={m:g}' for m in WOHLER_EXPONENTS])
+        cells = []
+        for col, result in results.items():
+            range_bins, mean_bins = np.nonzero(result.matrix)
+            cells.append(pd.DataFrame({
+                'Component': col,
+                'Range Min': result.range_edges[range_bins],
+                'Range Max': result.range_edges[range_bins + 1],
+                'Mean Min': result.mean_edges[mean_bins],
+                'Mean Max': result.mean_edges[mean_bins + 1],
+                'Cycles': result.matrix[range_bins, mean_bins],
+            }))
+        cycles_df = pd.concat(cells, ignore_index=True).set_index('Component') if cells else pd.DataFrame()
+        return SerializedFigure(fig_t), SerializedFigure(fig_r), {'': del_df, '_cycles': cycles_df}
+
+    def _build_part_loads_level_statistics(self, df_processed, opts, t_cols, r_cols, data_version):
+        """
+        Histograms or level-crossing counts of all translational and rotational components of the side,
+        binned as one 2-D block (analysis.level_statistics). They are exported in long format, one row per
+        bin and component.
+        """
+        columns = t_cols + r_cols
+        is_histogram = opts.plot_type == self.plotter.HISTOGRAM
+        cache_key = (data_version, opts)
+        cached = self.level_stats_cache.get(cache_key)
+        if cached is None:
+            block_df = build_multi_series_for_single(df_processed, columns=columns, data_domain='TIME')
+            if block_df.empty:
+                return SerializedFigure(go.Figure()), SerializedFigure(go.Figure()), {}
+            statistic = 'histogram' if is_histogram else 'crossings'
+            cached = compute_level_statistics({opts.side: block_df.to_numpy()}, statistic)[opts.side]
+            self.level_stats_cache.put(cache_key, cached)
+        levels, counts = cached
+        statistics = {col: (levels[i], counts[i]) for i, col in enumerate(columns)}
+        side = opts.side
+        fig_t = self.plotter.create_level_statistics_figure(
+            {col: statistics[col] for col in t_cols}, f'Translational Components, {opts.plot_type} - {side}', opts.plot_type)
+        fig_r = self.plotter.create_level_statistics_figure(
+            {col: statistics[col] for col in r_cols}, f'Rotational Components, {opts.plot_type} - {side}', opts.plot_type)
+
+        if is_histogram:
+            table = {'Component': np.repeat(columns, counts.shape[1]),
+                     'Level Min': levels[:, :-1].ravel(), 'Level Max': levels[:, 1:].ravel(), 'Samples': counts.ravel()}
+        else:
+            table = {'Component': np.repeat(columns, counts.shape[1]),
+                     'Level': levels.ravel(), 'Up-Crossings': counts.ravel()}
+        return SerializedFigure(fig_t), SerializedFigure(fig_r), {'': pd.DataFrame(table).set_index('Component')}
 
-    @QtCore.pyqtSlot()
-    def update_compare_column_list(self):
+    def _build_part_loads_bands(self, df_processed, opts, t_cols, r_cols, data_version, data_domain):
         """
-        Fetches the common columns and tells the UI
-        to repopulate the compare_column_selector.
+        Octave or 1/3-octave band levels of all translational and rotational components of the side.
+        TIME data go through one FFT of the whole block, whose power spectrum is cached, so switching the
+        band width does not transform again; FREQ data are integrated directly over the FREQ lines.
+        Exports a band table: centre and edge frequencies followed by the level of each component.
         """
-        common_columns = self._get_common_columns()
-        self.main_window.tab_compare_data.update_column_selector(common_columns)
+        columns = t_cols + r_cols
+        # The power spectrum does not depend on the band width
+        cache_key = (data_version, data_domain, replace(opts, plot_type=''))
+        cached = self.band_cache.get(cache_key)
+        if cached is None:
+            block_df = build_multi_series_for_single(df_processed, columns=columns, data_domain=data_domain)
+            if block_df.empty or len(block_df) < 2:
+                return SerializedFigure(go.Figure()), SerializedFigure(go.Figure()), {}
+            if data_domain == 'TIME':
+                cached = compute_power_spectrum(block_df)
+            else:
+                cached = (block_df.index.to_numpy(dtype=float), amplitude_power(block_df.to_numpy()))
+            self.band_cache.put(cache_key, cached)
+        frequencies, power = cached
+        centers, lower, upper, levels = band_levels(frequencies, power, self.plotter.BAND_FRACTIONS[opts.plot_type])
 
-    @QtCore.pyqtSlot()
-    def update_compare_data_plots(self):
-        if self._get_df() is None or self._get_compare_df() is None: return
-        tab = self.main_window.tab_compare_data
-        selected_column = tab.compare_column_selector.currentText()
-        if not selected_column: return
+        side = opts.side
+        fig_t = self.plotter.create_band_figure(centers, {col: levels[:, columns.index(col)] for col in t_cols},
+                                                f'Translational Components, {opts.plot_type} - {side}')
+        fig_r = self.plotter.create_band_figure(centers, {col: levels[:, columns.index(col)] for col in r_cols},
+                                                f'Rotational Components, {opts.plot_type} - {side}')
+        band_df = pd.DataFrame(levels, columns=columns,
+                               index=pd.Index(centers, name='Band Centre [Hz]'))
+        band_df.insert(0, 'Lower [Hz]', lower)
+        band_df.insert(1, 'Upper [Hz]', upper)
+        return SerializedFigure(fig_t), SerializedFigure(fig_r), {'': band_df}
+
+    def _build_time_domain_represent(self, df, freq, selected_side):
+        if not selected_side:
+            return SerializedFigure(go.Figure()), {}
+
+        side_pattern = re.compile(rf'\b{re.escape(selected_side)}\b')
+        plot_cols = [c for c in df.columns if side_pattern.search(c) and not c.startswith('Phase_') and
+                     any(s in c for s in ['T1', 'T2', 'T3', 'R1', 'R2', 'R3', 'T2/T3', 'R2/R3'])]
+
+        theta = np.linspace(0, 360, 361)
+        rads = np.radians(theta)
+        plot_data = {}
+        current_plot_data = {}
+        data_at_freq = df[df['FREQ'] == freq].iloc[0]
+
+        for col in plot_cols:
+            phase_col = f'Phase_{col}'
+            if phase_col in data_at_freq:
+                amplitude = data_at_freq[col]
+                phase_deg = data_at_freq[phase_col]
+                y_data = amplitude * np.cos(rads - np.radians(phase_deg))
+                plot_data[col] = y_data
+                current_plot_data[col] = {'theta': theta, 'y_data': y_data}
+
+        df_time_domain = pd.DataFrame(plot_data, index=theta)
+        df_time_domain.index.name = "Theta [deg]"
+
+        title = f'Time Domain Representation at {freq} Hz for {selected_side}'
+        fig = self.plotter.create_standard_figure(df_time_domain, title)
+        return SerializedFigure(fig), current_plot_data
+
+    def _build_compare_data(self, df, df_compare, selected_column, data_domain):
+        df1 = self._get_plot_df([selected_column], df, data_domain)
+        df2 = self._get_plot_df([selected_column], df_compare, data_domain)
 
-        df1 = self._get_plot_df([selected_column])
-        df2 = self._get_plot_df([selected_column], source_df=self._get_compare_df())
-        
         fig_compare = self.plotter.create_comparison_figure(df1, df2, selected_column, f'{selected_column} Comparison')
-        tab.display_comparison_plot(fig_compare)
-        
-        diff_df = self._calculate_differences([selected_column])
-        if diff_df.empty: return
+
+        diff_df = self._calculate_differences(df, df_compare, [selected_column], data_domain)
+        if diff_df.empty:
+            return SerializedFigure(fig_compare), None, None
 
         # Build plot-ready DataFrame with domain index for absolute difference
-        domain_col = self._get_data_domain()
+        domain_col = data_domain
         abs_diff_df = pd.DataFrame({'Absolute Difference': diff_df.iloc[:, 0].values})
-        abs_diff_df.index = self._get_df()[domain_col]
+        abs_diff_df.index = df[domain_col]
         abs_diff_df.index.name = 'Time [s]' if domain_col == 'TIME' else 'Freq [Hz]'
         fig_abs_diff = self.plotter.create_standard_figure(abs_diff_df,
                                                            f'{selected_column} Absolute Difference')
-        tab.display_absolute_diff_plot(fig_abs_diff)
-        
+
         with np.errstate(divide='ignore', invalid='ignore'):
-            relative_diff = np.divide(100 * diff_df.iloc[:, 0], np.abs(self._get_df()[selected_column]))
+            relative_diff = np.divide(100 * diff_df.iloc[:, 0], np.abs(df[selected_column]))
             relative_diff.fillna(0, inplace=True)
         rel_diff_df = pd.DataFrame({'Relative Difference (%)': relative_diff.values})
-        rel_diff_df.index = self._get_df()[domain_col]
+        rel_diff_df.index = df[domain_col]
         rel_diff_df.index.name = 'Time [s]' if domain_col == 'TIME' else 'Freq [Hz]'
         fig_rel_diff = self.plotter.create_standard_figure(rel_diff_df,
                                                            f'{selected_column} Relative Difference (%)', "Percent (%)")
-        tab.display_relative_diff_plot(fig_rel_diff)
+        return SerializedFigure(fig_compare), SerializedFigure(fig_abs_diff), SerializedFigure(fig_rel_diff)
 
-    @QtCore.pyqtSlot()
-    def update_compare_part_loads_plots(self):
-        if self._get_df() is None or self._get_compare_df() is None: return
-        tab = self.main_window.tab_compare_part_loads
-        selected_side = tab.side_filter_selector.currentText()
-        if not selected_side: return
-
-        exclude = tab.exclude_checkbox.isChecked()
-
-        t_cols = self._filter_part_load_cols(self._get_df().columns, selected_side,
-                                             ["T1", "T2", "T3", "T2/T3"], exclude)
-        r_cols = self._filter_part_load_cols(self._get_df().columns, selected_side,
-                                             ["R1", "R2", "R3", "R2/R3"], exclude)
+    def _build_compare_cross_spectrum(self, df, df_compare, columns, opts, reference_is_compare, data_versions):
+        """
+        Auto-spectra and CSD, H1 transfer function and coherence of the selected column (response) against the
+        reference: the comparison data's column of the same name, or another primary column. All common columns
+        are paired with their reference in one Welch pass, which transforms every column once (the reference
+        column of the primary data only once for all pairs); the spectra are cached, so switching the column
+        only picks another pair. df_compare, the common columns, reference_is_compare (the reference is the
+        comparison data) and data_versions (primary, comparison) are read on the GUI thread by
+        update_compare_data_plots; the cache key pairs both versions.
+        """
+        selected = opts.selected_column
+        if selected not in columns or not (reference_is_compare or opts.reference_column in columns):
+            return SerializedFigure(go.Figure()), None, None
+
+        cache_key = data_versions + (opts.reference_column, tuple(columns))
+        cached = self.cross_spectra_cache.get(cache_key)
+        if cached is None:
+            block_df = build_multi_series_for_single(df, columns=columns, data_domain='TIME')
+            if reference_is_compare:
+                # Samples are paired by position; the longer dataset is cut to the shorter one
+                length = min(len(block_df), len(df_compare))
+                block_df = block_df.iloc[:length]
+                values = np.hstack((block_df.to_numpy(), df_compare[columns].to_numpy()[:length]))
+                pairs = [(len(columns) + i, i) for i in range(len(columns))]
+            else:
+                values = np.hstack((df[[opts.reference_column]].to_numpy(), block_df.to_numpy()))
+                pairs = [(0, i + 1) for i in range(len(columns))]
+            if len(block_df) < 2:
+                return SerializedFigure(go.Figure()), None, None
+            block_df = pd.DataFrame(values, index=block_df.index)
+            frequencies, auto, csd = compute_csd(block_df, pairs)
+            cached = (frequencies, auto[:, [x for x, _ in pairs]], auto[:, [y for _, y in pairs]], csd)
+            self.cross_spectra_cache.put(cache_key, cached)
+
+        frequencies, auto_reference, auto_response, csd = cached
+        i = columns.index(selected)
+        reference = f'Compare - {selected}' if reference_is_compare else opts.reference_column
+        fig_spectra = self.plotter.create_psd_figure({
+            f'Gxx {reference}': (frequencies, auto_reference[:, i]),
+            f'Gyy {selected}': (frequencies, auto_response[:, i]),
+            '|Gxy|': (frequencies, np.abs(csd[:, i])),
+        }, f'{selected} Auto and Cross Spectra (Reference: {reference})')
+        fig_h1 = self.plotter.create_transfer_function_figure(
+            {'H1': (frequencies, transfer_function_h1(auto_reference[:, i], csd[:, i]))},
+            f'{selected} Transfer Function H1')
+        fig_coherence = self.plotter.create_coherence_figure(
+            {'Coherence': (frequencies, coherence(auto_reference[:, i], auto_response[:, i], csd[:, i]))},
+            f'{selected} Coherence')
+        return SerializedFigure(fig_spectra), SerializedFigure(fig_h1), SerializedFigure(fig_coherence)
+
+    def _build_compare_part_loads(self, df, df_compare, opts, data_domain):
+        selected_side = opts.side
+        t_cols = self._filter_part_load_cols(df.columns, selected_side,
+                                             ["T1", "T2", "T3", "T2/T3"], opts.exclude)
+        r_cols = self._filter_part_load_cols(df.columns, selected_side,
+                                             ["R1", "R2", "R3", "R2/R3"], opts.exclude)
 
         # Build plot-ready DataFrames with domain index for differences
-        domain_col = self._get_data_domain()
-        t_diff = self._calculate_differences(t_cols)
-        r_diff = self._calculate_differences(r_cols)
+        domain_col = data_domain
+        t_diff = self._calculate_differences(df, df_compare, t_cols, data_domain)
+        r_diff = self._calculate_differences(df, df_compare, r_cols, data_domain)
         t_diff_df = pd.DataFrame(t_diff) if not t_diff.empty else pd.DataFrame()
         r_diff_df = pd.DataFrame(r_diff) if not r_diff.empty else pd.DataFrame()
         if not t_diff_df.empty:
-            t_diff_df.index = self._get_df()[domain_col]
+            t_diff_df.index = df[domain_col]
             t_diff_df.index.name = 'Time [s]' if domain_col == 'TIME' else 'Freq [Hz]'
         if not r_diff_df.empty:
-            r_diff_df.index = self._get_df()[domain_col]
+            r_diff_df.index = df[domain_col]
             r_diff_df.index.name = 'Time [s]' if domain_col == 'TIME' else 'Freq [Hz]'
-        
+
         fig_t = self.plotter.create_standard_figure(t_diff_df,
                                                     f'Translational Components, Difference (Δ) - {selected_side}')
-        tab.display_t_series_plot(fig_t)
-        
         fig_r = self.plotter.create_standard_figure(r_diff_df,
                                                     f'Rotational Components, Difference (Δ) - {selected_side}')
-        tab.display_r_series_plot(fig_r)
+        return SerializedFigure(fig_t), SerializedFigure(fig_r)
 
-    @QtCore.pyqtSlot()
-    def update_spectrum_plot_only(self):
-        """A dedicated function that only updates the spectrum plot."""
-        df = self._get_df()
-        if df is None or self._get_data_domain() != 'TIME': return
-
-        tab = self.main_window.tab_single_data
-        opts = self._snapshot_single_data_options()
+    def _spectrum_cache_key(self, df, opts, data_version):
+        """
+        Identifies the spectral matrix of a spectrum request: the content of the source column plus the
+        options that change the matrix. Plot type and colorscale are left out, they only affect the figure.
+        """
         selected_col = opts.selected_col
-        if not selected_col or selected_col in (self.TIME_STEP_LABEL, self.FS_LABEL) or not opts.spectrum_enabled: return
-
-        is_multi_folder = self._is_multi_folder()
-        if is_multi_folder: return
+        digest_key = (data_version, selected_col)
+        digest = self._source_digests.get(digest_key)
+        if digest is None:
+            digest = hash_arrays(df['TIME'].to_numpy(), df[selected_col].to_numpy())
+            self._source_digests = {digest_key: digest}
+        section = (opts.section_min_text, opts.section_max_text) if opts.section_enabled else None
+        low_pass = (opts.cutoff_frequency_text, opts.filter_order) if opts.filter_enabled else None
+        return digest, selected_col, section, low_pass, int(opts.num_slices_text)
+
+    @staticmethod
+    def _parse_freq_max(display):
+        if display.freq_max_text.strip():
+            try:
+                return float(display.freq_max_text)
+            except ValueError:
+                pass # Show all frequencies if the limit is not a valid number
+        return None
 
-        try:
+    def _build_spectrum(self, df, opts, display, data_version):
+        selected_col = opts.selected_col
+        cache_key = self._spectrum_cache_key(df, opts, data_version)
+        spectrum = self.spectrum_cache.get(cache_key)
+        if spectrum is None:
             # Re-create the source DataFrame for the spectrum plot
             source_df = df
             # Apply Section Data before spectrum if enabled
             if opts.section_enabled:
                 source_df = apply_data_section(source_df, opts.section_min_text, opts.section_max_text)
-            plot_df = self._get_plot_df([selected_col], source_df=source_df)
+            plot_df = self._get_plot_df([selected_col], source_df, 'TIME')
             if opts.filter_enabled:
                 try:
                     cutoff = float(opts.cutoff_frequency_text)
@@ -635,17 +1162,273 @@ class PlotController(QtCore.QObject):
                     plot_df = apply_low_pass_filter(plot_df, selected_col, cutoff, order)
                 except ValueError:
                     pass # Ignore if cutoff is not a valid number
+            if plot_df.empty:
+                return SerializedFigure(go.Figure()), None
+            spectrum = compute_spectrum(plot_df, int(opts.num_slices_text))
+            self.spectrum_cache.put(cache_key, spectrum)
+
+        freq_max = self._parse_freq_max(display)
+        fig_spec = self.plotter.create_spectrum_figure_from_result(
+            spectrum,
+            selected_col,
+            plot_type=opts.plot_type,
+            freq_max=freq_max,
+            colorscale=opts.colorscale,
+            resolution=(display.width, display.height),
+            log_freq=display.log_freq,
+            tile_url=get_tile_url('single_data_spectrum')
+        )
+        return SerializedFigure(fig_spec), (spectrum, freq_max, display.log_freq)
+
+    def _build_multi_spectrum(self, df, opts, display, data_version):
+        """
+        Spectrum of every DataFolder. Folders with the same sampling rate and length are transformed in one
+        batch (analysis.spectral.compute_spectra). The folder -> matrix dict is cached as one entry, so any
+        number of folders is found again in one lookup, and folders too short for a spectrum (left out of the
+        dict) do not cause a recomputation. Only Heatmap and Mean Spectrum have a multi-folder figure
+        (SingleDataTab disables the other plot types).
+        """
+        cache_key = self._spectrum_cache_key(df, opts, data_version) + ('by_folder',)
+        spectra = self.spectrum_cache.get(cache_key)
+        if spectra is None:
+            dfs_for_spectrum = build_series_by_folder(
+                df,
+                selected_col=opts.selected_col,
+                data_domain='TIME',
+                section_enabled=opts.section_enabled,
+                t_min_text=opts.section_min_text,
+                t_max_text=opts.section_max_text,
+                filter_enabled=opts.filter_enabled,
+                cutoff_text=opts.cutoff_frequency_text,
+                filter_order=opts.filter_order,
+            )
+            spectra = compute_spectra(dfs_for_spectrum, int(opts.num_slices_text))
+            self.spectrum_cache.put(cache_key, spectra)
+
+        fig_spec = self.plotter.create_multi_spectrum_figure(
+            spectra,
+            plot_type=opts.plot_type,
+            freq_max=self._parse_freq_max(display),
+            colorscale=opts.colorscale,
+            resolution=(display.width, display.height),
+            log_freq=display.log_freq,
+        )
+        return SerializedFigure(fig_spec), None
 
-            # Generate and display the spectrum plot
-            fig_spec = self.plotter.create_spectrum_figure(
-                plot_df,
-                num_slices=int(opts.num_slices_text),
-                plot_type=opts.plot_type,
-                colorscale=opts.colorscale
+    def _build_psd(self, df, opts, display, data_version):
+        """
+        Welch PSD of the selected column of every DataFolder. Folders with the same sampling rate and length
+        form one 2-D block (analysis.spectral.compute_psds). The folder -> PSD dict is one psd_cache entry.
+        """
+        section = (opts.section_min_text, opts.section_max_text) if opts.section_enabled else None
+        low_pass = (opts.cutoff_frequency_text, opts.filter_order) if opts.filter_enabled else None
+        cache_key = (data_version, opts.selected_col, section, low_pass)
+        psds = self.psd_cache.get(cache_key)
+        if psds is None:
+            dfs_for_psd = build_series_by_folder(
+                df,
+                selected_col=opts.selected_col,
+                data_domain='TIME',
+                section_enabled=opts.section_enabled,
+                t_min_text=opts.section_min_text,
+                t_max_text=opts.section_max_text,
+                filter_enabled=opts.filter_enabled,
+                cutoff_text=opts.cutoff_frequency_text,
+                filter_order=opts.filter_order,
             )
+            psds = compute_psds({folder: part for folder, part in dfs_for_psd.items() if len(part) > 1})
+            self.psd_cache.put(cache_key, psds)
+        # A single folder is named after the column, like the main plot
+        if len(psds) == 1:
+            psds = {opts.selected_col: next(iter(psds.values()))}
+
+        fig_psd = self.plotter.create_psd_figure(psds, f"PSD of {opts.selected_col}",
+                                                 freq_max=self._parse_freq_max(display), log_freq=display.log_freq)
+        return SerializedFigure(fig_psd), None
+
+    def _spectrum_tile(self, spectrum, freq_max, log_freq, query):
+        """Answers a zoom tile request of the spectrum heatmap: the requested region pooled to the page's pixel size."""
+        frequencies, times, amplitudes = spectrum
+        # Filtered like the initial heatmap, so zero amplitudes stay gaps when zoomed in
+        frequencies, amplitudes = limit_spectrum(frequencies, amplitudes, freq_max)
+        width = min(max(int(query.get('w', 1024)), 16), 8192)
+        height = min(max(int(query.get('h', 512)), 16), 8192)
+        time_range = (float(query['x0']), float(query['x1'])) if 'x0' in query else None
+        freq_range = (float(query['y0']), float(query['y1'])) if 'y0' in query else None
+        x, y, z = bin_spectrum(frequencies, times, amplitudes, width, height,
+                               log_freq=log_freq, time_range=time_range, freq_range=freq_range)
+        return {0: {'x': x, 'y': y, 'z': z}}
+    # endregion
+
+    # region Plot Update Slots
+    @QtCore.pyqtSlot()
+    def update_single_data_plots(self):
+        df = self._get_df()
+        if df is None: return
+        tab = self.main_window.tab_single_data
+        opts = self._snapshot_single_data_options()
+        envelope_opts = self._snapshot_envelope_options()
+        if not opts.selected_col: return
+
+        is_multi_folder = self._is_multi_folder()
+
+        def apply(result):
+            fig, phase_fig, tile_source = result
+            if tile_source is not None:
+                set_tile_provider('single_data', partial(self._envelope_tile, *tile_source))
+            tab.display_regular_plot(fig)
+            tab.set_phase_plot_visibility(phase_fig is not None)
+            if phase_fig is not None:
+                tab.display_phase_plot(phase_fig)
+
+        self._submit('single_data', self._render_key(opts, envelope_opts),
+                     partial(self._build_single_data, df, opts, envelope_opts, is_multi_folder,
+                             self.main_window.data_version, self._get_data_domain()), apply)
+
+        # The spectrum is built by its own task, so the main plot does not wait for it
+        if self._get_data_domain() == 'TIME' and opts.spectrum_enabled:
+            self.update_spectrum_plot_only()
+
+    @QtCore.pyqtSlot()
+    def update_interface_data_plots(self):
+        df = self._get_df()
+        if df is None: return
+        tab = self.main_window.tab_interface_data
+        opts = self._snapshot_interface_data_options()
+        if not opts.interface or not opts.side: return
+
+        def apply(result):
+            fig_t, fig_r = result
+            tab.display_t_series_plot(fig_t)
+            tab.display_r_series_plot(fig_r)
+
+        self._submit('interface_data', self._render_key(opts),
+                     partial(self._build_interface_data, df, opts, self._get_data_domain()), apply)
+
+    @QtCore.pyqtSlot()
+    def update_part_loads_plots(self):
+        df = self._get_df()
+        if df is None: return
+        opts = self._snapshot_part_loads_options()
+        tab = self.main_window.tab_part_loads
+        if not opts.side: return
+
+        def apply(result):
+            fig_t, fig_r, export_tables = result
+            tab.current_export_tables = export_tables
+            tab.display_t_series_plot(fig_t)
+            tab.display_r_series_plot(fig_r)
+
+        build = partial(self._build_part_loads, df, opts, self.main_window.data_version, self._get_data_domain())
+        self._submit('part_loads', self._render_key(opts), build, apply)
+
+    @QtCore.pyqtSlot()
+    def update_time_domain_represent_plot(self):
+        df = self._get_df()
+        if df is None or self._get_data_domain() != 'FREQ': return
+
+        tab = self.main_window.tab_time_domain_represent
+        opts = self._snapshot_time_domain_represent_options()
+        freq_text = opts.frequency_text
+        if not freq_text or "Select a frequency" in freq_text: return
+        try:
+            freq = float(freq_text)
+        except ValueError as e:
+            print(f"Could not update time domain representation plot: {e}")
+            tab.display_plot(go.Figure())
+            self.figure_cache.invalidate('time_domain_represent')
+            return
+
+        def apply(result):
+            fig, current_plot_data = result
+            tab.current_plot_data = current_plot_data
+            tab.display_plot(fig)
+
+        def on_error(error):
+            tab.current_plot_data = {}
+            tab.display_plot(go.Figure())
+
+        self._submit('time_domain_represent', self._render_key(opts),
+                     partial(self._build_time_domain_represent, df, freq, opts.selected_side), apply, on_error)
+
+    @QtCore.pyqtSlot()
+    def update_compare_column_list(self):
+        """
+        Fetches the common columns and tells the UI
+        to repopulate the compare_column_selector.
+        """
+        common_columns = self._get_common_columns()
+        self.main_window.tab_compare_data.update_column_selector(common_columns)
+
+    @QtCore.pyqtSlot()
+    def update_compare_data_plots(self):
+        df = self._get_df()
+        if df is None or self._get_compare_df() is None: return
+        tab = self.main_window.tab_compare_data
+        opts = self._snapshot_compare_data_options()
+        if not opts.selected_column: return
+
+        def apply(result):
+            fig_compare, fig_abs_diff, fig_rel_diff = result
+            tab.display_comparison_plot(fig_compare)
+            if fig_abs_diff is not None:
+                tab.display_absolute_diff_plot(fig_abs_diff)
+                tab.display_relative_diff_plot(fig_rel_diff)
+
+        df_compare = self._get_compare_df()
+        data_domain = self._get_data_domain()
+        if opts.analysis == tab.CROSS_SPECTRUM and data_domain == 'TIME':
+            data_versions = (self.main_window.data_version, self.main_window.compare_data_version)
+            build = partial(self._build_compare_cross_spectrum, df, df_compare, self._get_common_columns(),
+                            opts, opts.reference_column == tab.COMPARE_REFERENCE, data_versions)
+        else:
+            build = partial(self._build_compare_data, df, df_compare, opts.selected_column, data_domain)
+        self._submit('compare_data', self._render_key(opts, compare=True), build, apply)
+
+    @QtCore.pyqtSlot()
+    def update_compare_part_loads_plots(self):
+        df = self._get_df()
+        if df is None or self._get_compare_df() is None: return
+        tab = self.main_window.tab_compare_part_loads
+        opts = self._snapshot_compare_part_loads_options()
+        if not opts.side: return
+
+        def apply(result):
+            fig_t, fig_r = result
+            tab.display_t_series_plot(fig_t)
+            tab.display_r_series_plot(fig_r)
+
+        build = partial(self._build_compare_part_loads, df, self._get_compare_df(), opts, self._get_data_domain())
+        self._submit('compare_part_loads', self._render_key(opts, compare=True), build, apply)
+
+    @QtCore.pyqtSlot()
+    def update_spectrum_plot_only(self):
+        """A dedicated function that only updates the spectrum plot."""
+        df = self._get_df()
+        if df is None or self._get_data_domain() != 'TIME': return
+
+        tab = self.main_window.tab_single_data
+        opts = self._snapshot_single_data_options()
+        selected_col = opts.selected_col
+        if not selected_col or self._is_computed_metric(selected_col) or not opts.spectrum_enabled: return
+
+        display = self._snapshot_spectrum_display_options()
+
+        def apply(result):
+            fig_spec, tile_source = result
+            if tile_source is not None:
+                set_tile_provider('single_data_spectrum', partial(self._spectrum_tile, *tile_source))
             tab.set_spectrum_plot_visibility(True)
             tab.display_spectrum_plot(fig_spec)
-        except (ValueError, IndexError, ZeroDivisionError) as e:
-            print(f"Could not generate spectrum: {e}")
+
+        def on_error(error):
             tab.set_spectrum_plot_visibility(False)
-    # endregion
\ No newline at end of file
+
+        # Multi-folder selections get faceted heatmaps or an overlay of mean spectra
+        if opts.plot_type == self.plotter.PSD:
+            build_spectrum = self._build_psd
+        else:
+            build_spectrum = self._build_multi_spectrum if self._is_multi_folder() else self._build_spectrum
+        build = partial(build_spectrum, df, opts, display, self.main_window.data_version)
+        self._submit('single_data_spectrum', self._render_key(opts, display), build, apply, on_error)
+    # endregion
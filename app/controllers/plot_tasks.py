@@ -0,0 +1,55 @@
+# File: app/controllers/plot_tasks.py
+
+import time
+
+from PyQt5 import QtCore
+
+
+class PlotTaskSignals(QtCore.QObject):
+    """Signals of a PlotTask; QRunnable is not a QObject, so they live on a helper object."""
+    finished = QtCore.pyqtSignal(str, int, object)
+    failed = QtCore.pyqtSignal(str, int, object)
+
+
+class PlotTask(QtCore.QRunnable):
+    """
+    Builds the figures of one view in a worker thread.
+    build() must not touch any widget; it returns the result that apply(result) shows on the GUI thread.
+    The generation identifies the request, so the controller can drop results of superseded requests.
+    """
+
+    def __init__(self, view, generation, render_key, build, apply, on_error=None, style=None):
+        super().__init__()
+        # The controller keeps a reference until the result arrives and may still call tryTake()
+        self.setAutoDelete(False)
+        self.view = view
+        self.generation = generation
+        self.render_key = render_key
+        self.build = build
+        self.apply = apply
+        self.on_error = on_error
+        self.style = style
+        self.cancelled = False
+        self.signals = PlotTaskSignals()
+        # perf_counter timestamps, reported through PlotController.plot_timing
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    def cancel(self):
+        """Marks the task as superseded; a task that has not started yet skips its build."""
+        self.cancelled = True
+
+    def run(self):
+        if self.cancelled:
+            # Still reported, so the controller can release the superseded task
+            self.signals.finished.emit(self.view, self.generation, None)
+            return
+        self.started_at = time.perf_counter()
+        try:
+            result = self.build()
+        except Exception as e:
+            self.signals.failed.emit(self.view, self.generation, e)
+            return
+        self.finished_at = time.perf_counter()
+        self.signals.finished.emit(self.view, self.generation, result)
@@ -0,0 +1,54 @@
+# File: app/controllers/update_scheduler.py
+
+from PyQt5 import QtCore
+
+# Quiet period after the last request before pending updates run
+UPDATE_DELAY_MS = 150
+
+
+class UpdateScheduler(QtCore.QObject):
+    """
+    Debounces and coalesces plot update requests.
+    Requests arriving within the delay are merged per view, so a burst of signals
+    (typing into a line edit, several connections firing for one action) runs each view's update once.
+    """
+
+    def __init__(self, delay_ms=UPDATE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self._pending = {}
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def schedule(self, view, callback):
+        """Queues the update of a view; a pending request for the same view is superseded."""
+        self._pending[view] = callback
+        # Restarting the timer pushes the deadline back while requests keep arriving
+        self._timer.start()
+
+    def cancel(self, view=None):
+        """Drops the pending request of one view, or all pending requests when no view is given."""
+        if view is None:
+            self._pending.clear()
+        else:
+            self._pending.pop(view, None)
+        if not self._pending:
+            self._timer.stop()
+
+    def has_pending(self, view=None):
+        """Whether an update of the view, or of any view when none is given, is waiting to run."""
+        if view is None:
+            return bool(self._pending)
+        return view in self._pending
+
+    @QtCore.pyqtSlot()
+    def flush(self):
+        """Runs every pending update once, in the order the views were first requested."""
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        for view, callback in pending.items():
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error updating '{view}': {e}")
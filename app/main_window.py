@@ -2,6 +2,7 @@
 
 import os
 import re
+from functools import partial
 import pandas as pd
 from natsort import natsorted
 
@@ -33,6 +34,9 @@ class MainWindow(QMainWindow):
         self.df_compare = None
         self.data_domain = None
         self.raw_data_folder = None
+        # Incremented on every (re)load so cached figures of older datasets are never reused
+        self.data_version = 0
+        self.compare_data_version = 0
         
         # Core components
         self.plotter = Plotter()
@@ -49,11 +53,11 @@ class MainWindow(QMainWindow):
         # Custom logic for specific keys
         if key == QtCore.Qt.Key_K:
             self.plotter.cycle_legend_position()
-            self.plot_controller.update_all_plots_from_settings()
+            self.plot_controller.apply_plot_style()
 
         elif key == QtCore.Qt.Key_L:
             self.plotter.toggle_legend_visibility()
-            self.plot_controller.update_all_plots_from_settings()
+            self.plot_controller.apply_plot_style()
 
         else:
             # If program does not know what a key does,
@@ -113,21 +117,27 @@ class MainWindow(QMainWindow):
         self.open_action.triggered.connect(self.data_manager.load_data_from_directory)
         self.export_full_csv_action.triggered.connect(self._export_full_data_csv)
 
-        # Plot Update Signals (Connected to PlotController)
-        self.tab_single_data.plot_parameters_changed.connect(self.plot_controller.update_single_data_plots)
-        self.tab_single_data.spectrum_parameters_changed.connect(self.plot_controller.update_spectrum_plot_only)
-        self.tab_interface_data.plot_parameters_changed.connect(self.plot_controller.update_interface_data_plots)
-        self.tab_part_loads.plot_parameters_changed.connect(self.plot_controller.update_part_loads_plots)
-        self.tab_time_domain_represent.plot_parameters_changed.connect(self.plot_controller.update_time_domain_represent_plot)
-        self.tab_compare_data.plot_parameters_changed.connect(self.plot_controller.update_compare_data_plots)
-        self.tab_compare_part_loads.plot_parameters_changed.connect(self.plot_controller.update_compare_part_loads_plots)
-        self.tab_settings.settings_changed.connect(self.plot_controller.update_all_plots_from_settings)
-        self.tab_part_loads.plot_parameters_changed.connect(self.plot_controller.update_time_domain_represent_plot)
-
+        # Plot Update Signals (Debounced through the PlotController's update scheduler)
+        schedule = self.plot_controller.schedule_update
+        self.tab_single_data.plot_parameters_changed.connect(partial(schedule, 'single_data'))
+        self.tab_single_data.spectrum_parameters_changed.connect(partial(schedule, 'single_data_spectrum'))
+        self.tab_interface_data.plot_parameters_changed.connect(partial(schedule, 'interface_data'))
+        self.tab_part_loads.plot_parameters_changed.connect(partial(schedule, 'part_loads'))
+        self.tab_time_domain_represent.plot_parameters_changed.connect(partial(schedule, 'time_domain_represent'))
+        self.tab_compare_data.plot_parameters_changed.connect(partial(schedule, 'compare_data'))
+        self.tab_compare_part_loads.plot_parameters_changed.connect(partial(schedule, 'compare_part_loads'))
+        self.tab_settings.settings_changed.connect(partial(schedule, 'settings'))
+        self.tab_settings.style_changed.connect(partial(schedule, 'style'))
+        # The representation uses the Part Loads side filter, so it follows that tab's changes
+        self.tab_part_loads.plot_parameters_changed.connect(partial(schedule, 'time_domain_represent'))
+        # Only where spectra are cached; no plot changes
+        self.tab_settings.spectrum_disk_cache_checkbox.toggled.connect(
+            self.plot_controller.set_spectrum_disk_cache_enabled)
 
         # Action Signals (Connected to ActionHandler)
         self.tab_compare_data.select_compare_data_requested.connect(self.action_handler.handle_compare_data_selection)
         self.tab_part_loads.export_to_ansys_requested.connect(self.action_handler.handle_ansys_export)
+        self.tab_part_loads.export_results_requested.connect(self.action_handler.handle_part_loads_results_export)
         self.tab_time_domain_represent.extract_data_requested.connect(self.action_handler.handle_time_domain_represent_export)
 
         # Tab Change Signal (Refresh plots when tab becomes active)
@@ -135,24 +145,8 @@ class MainWindow(QMainWindow):
 
     @QtCore.pyqtSlot(int)
     def _on_tab_changed(self, index):
-        """Refresh the plot for the newly active tab."""
-        if self.df is None:
-            return
-
-        current_tab = self.tab_widget.widget(index)
-
-        if current_tab == self.tab_single_data:
-            self.plot_controller.update_single_data_plots()
-        elif current_tab == self.tab_interface_data:
-            self.plot_controller.update_interface_data_plots()
-        elif current_tab == self.tab_part_loads:
-            self.plot_controller.update_part_loads_plots()
-        elif current_tab == self.tab_time_domain_represent:
-            self.plot_controller.update_time_domain_represent_plot()
-        elif current_tab == self.tab_compare_data:
-            self.plot_controller.update_compare_data_plots()
-        elif current_tab == self.tab_compare_part_loads:
-            self.plot_controller.update_compare_part_loads_plots()
+        """Refresh the plot for the newly active tab if it went stale while hidden."""
+        self.plot_controller.on_tab_shown(self.tab_widget.widget(index))
 
     def _handle_time_domain_tab_visibility(self):
         is_present = self.tab_widget.indexOf(self.tab_time_domain_represent) != -1
@@ -167,6 +161,7 @@ class MainWindow(QMainWindow):
         # Block signals on all selectors to prevent triggering plot updates during population
         selectors_to_block = [
             self.tab_single_data.column_selector,
+            self.tab_single_data.rolling_source_selector,
             self.tab_interface_data.interface_selector,
             self.tab_part_loads.side_filter_selector,
             self.tab_compare_part_loads.side_filter_selector,
@@ -188,6 +183,9 @@ class MainWindow(QMainWindow):
             # Use controller's constants to keep labels consistent
             self.tab_single_data.column_selector.addItem(self.plot_controller.TIME_STEP_LABEL)
             self.tab_single_data.column_selector.addItem(self.plot_controller.FS_LABEL)
+            self.tab_single_data.column_selector.addItems(list(self.plot_controller.ROLLING_STAT_LABELS))
+        self.tab_single_data.rolling_source_selector.clear()
+        self.tab_single_data.rolling_source_selector.addItems(regular_cols)
 
         # Interface Data Tab
         interfaces = natsorted(list(set(re.match(r'I\d+[A-Za-z]?', c.split(' ')[0]).group(0) for c in self.df.columns if re.match(r'I\d+[A-Za-z]?', c.split(' ')[0]))))
@@ -215,6 +213,7 @@ class MainWindow(QMainWindow):
     @QtCore.pyqtSlot(pd.DataFrame, str, str)
     def on_data_loaded(self, data, data_domain, folder_path):
         self.df, self.data_domain, self.raw_data_folder = data, data_domain, folder_path
+        self.data_version += 1
         self.tab_interface_data.set_dataframe(self.df)
 
         num_folders = self.df['DataFolder'].nunique()
@@ -243,7 +242,9 @@ class MainWindow(QMainWindow):
 
         is_time_domain = self.data_domain == 'TIME'
         self.tab_single_data.set_time_domain_features_visibility(is_time_domain)
+        self.tab_single_data.set_multi_folder_spectrum_types(num_folders > 1)
         self.tab_part_loads.set_time_domain_features_visibility(is_time_domain)
+        self.tab_compare_data.set_time_domain_features_visibility(is_time_domain)
         self.tab_settings.rolling_min_max_checkbox.setEnabled(is_time_domain)
         if not is_time_domain:
             # Block signals to prevent triggering settings_changed and double plot update
@@ -254,7 +255,9 @@ class MainWindow(QMainWindow):
         # Show processing status before generating plots
         self.setWindowTitle("WE-DAVIS - Processing data and generating plots...")
         QtWidgets.QApplication.processEvents()  # Force UI update
-        
+
+        # Updates queued for the previous dataset are superseded by the full refresh below
+        self.plot_controller.update_scheduler.cancel()
         self.plot_controller.update_all_plots_from_settings()
         
         # Restore the final title after processing
@@ -275,6 +278,7 @@ class MainWindow(QMainWindow):
 
     @QtCore.pyqtSlot(pd.DataFrame)
     def on_comparison_data_loaded(self, df_compare):
+        self.compare_data_version += 1
         if self.df is None:
             QMessageBox.warning(self, "Error", "Please load the primary data first.")
             self.df_compare = None  # Ensure compare df is cleared
@@ -296,8 +300,8 @@ class MainWindow(QMainWindow):
         QMessageBox.information(self, "Success", "Comparison data loaded successfully.")
 
         # These will now use the updated (and valid) combobox selection
-        self.plot_controller.update_compare_data_plots()
-        self.plot_controller.update_compare_part_loads_plots()
+        self.plot_controller.request_tab_update(self.tab_compare_data)
+        self.plot_controller.request_tab_update(self.tab_compare_part_loads)
 
     @QtCore.pyqtSlot(list)
     def _on_directories_selected(self, folder_paths):
@@ -0,0 +1,26 @@
+# File: app/plotting/figure_cache.py
+
+
+class FigureCache:
+    """
+    Remembers, per view, the key of the figure that is currently displayed.
+    A key combines the dataset version, the options snapshot of the view and the plotter style,
+    so a view only needs to be rebuilt when one of those changes.
+    """
+
+    def __init__(self):
+        self._keys = {}
+
+    def is_current(self, view, key):
+        """Returns True if the view already shows the figure built for this key."""
+        return view in self._keys and self._keys[view] == key
+
+    def store(self, view, key):
+        self._keys[view] = key
+
+    def invalidate(self, view=None):
+        """Forgets the key of one view, or of all views when no view is given."""
+        if view is None:
+            self._keys.clear()
+        else:
+            self._keys.pop(view, None)
@@ -1,19 +1,38 @@
 # File: app/plotting/plotter.py
 
-import os
-import tempfile
-import traceback
+import numpy as np
+import plotly.colors as pc
 import plotly.graph_objects as go
 import plotly.io as pio
-from PyQt5 import QtCore
 import pandas as pd
-from endaq.calc.fft import rolling_fft
-from endaq.plot import rolling_min_max_envelope, spectrum_over_time
+from endaq.plot import spectrum_over_time
+
+from ..analysis.spectral import bin_spectrum, compute_spectrum, limit_spectrum
 
 
 class Plotter:
     """Handles all logic for creating Plotly figures."""
 
+    # Spectrum plot types assembled directly from the STFT arrays; the others go through endaq's spectrum_over_time
+    NATIVE_SPECTRUM_TYPES = ('Heatmap', 'Surface', 'Waterfall')
+    # Time-averaged amplitude spectrum; also the overlay of a multi-folder spectrum
+    MEAN_SPECTRUM = 'Mean Spectrum'
+    # Welch power spectral density, computed instead of the rolling FFT
+    PSD = 'PSD'
+    # Shock response spectrum (Part Loads)
+    SRS = 'SRS'
+    # Rainflow cycle histograms and damage-equivalent loads (Part Loads)
+    RAINFLOW = 'Rainflow'
+    # Sample histograms and level-crossing counts (Part Loads)
+    HISTOGRAM = 'Histogram'
+    LEVEL_CROSSINGS = 'Level Crossings'
+    # Fractional-octave band levels (Part Loads, TIME and FREQ): plot type -> bands per octave
+    OCTAVE_BANDS = 'Octave Bands'
+    THIRD_OCTAVE_BANDS = '1/3-Octave Bands'
+    BAND_FRACTIONS = {OCTAVE_BANDS: 1, THIRD_OCTAVE_BANDS: 3}
+    # Cells per axis of a spectrum Surface; WebGL surfaces beyond a few hundred thousand vertices become sluggish
+    surface_max_bins = 400
+
     def __init__(self):
         # Default settings, can be updated from the SettingsTab
         self.legend_font_size = 10
@@ -24,6 +43,12 @@ class Plotter:
         self.current_legend_position_index = 0 # 'default'
         self.legend_positions = ['default', 'top left', 'top right', 'bottom right', 'bottom left']
         self.trace_opacity = 1.0
+        # Figures holding more points than this are drawn with WebGL (Scattergl) traces
+        self.webgl_point_threshold = 100000
+        # Line figures are assembled as plain dicts, skipping graph_objects validation and copies
+        self.use_fast_figures = True
+        self._style_layout = None
+        self._style_layout_key = None
 
     def _get_legend_position(self):
         """Gets the dictionary for the current legend position setting."""
@@ -45,34 +70,89 @@ class Plotter:
         """Toggles the legend's visibility on or off."""
         self.legend_visible = not self.legend_visible
     
+    def get_data_key(self):
+        """
+        Returns a hashable snapshot of the settings that change the traces of a figure.
+        Style settings are not part of it; they are pushed to live figures with get_style_update().
+        """
+        return (self.webgl_point_threshold, self.use_fast_figures)
+
+    def get_style_update(self):
+        """Returns the style settings as a Plotly.relayout update (dotted attribute paths)."""
+        legend_pos = self._get_legend_position()
+        return {
+            'legend.font.size': self.legend_font_size,
+            'legend.x': legend_pos['x'],
+            'legend.y': legend_pos['y'],
+            'legend.xanchor': legend_pos.get('xanchor', 'auto'),
+            'legend.yanchor': legend_pos.get('yanchor', 'auto'),
+            'hoverlabel.font.size': self.hover_font_size,
+            'hovermode': self.hover_mode,
+            'font.size': self.default_font_size,
+            'showlegend': self.legend_visible,
+        }
+
+    def _get_scatter_type(self, num_points):
+        """Returns 'scattergl' for figures above the WebGL point threshold, 'scatter' otherwise."""
+        if self.webgl_point_threshold and num_points > self.webgl_point_threshold:
+            return 'scattergl'
+        return 'scatter'
+
     def _get_hover_template(self, index_name):
         """Generates the custom hovertemplate string based on the data domain."""
         is_freq_domain = 'freq' in index_name.lower()
         domain_label = 'Hz' if is_freq_domain else 'Time'
         return f"%{{fullData.name}}<br>{domain_label}: %{{x}}<br>Value: %{{y:.3f}}<extra></extra>"
 
+    def _scatter_trace(self, trace_type, x, y, name, hover_template, **properties):
+        """Builds a plain trace dict straight from the NumPy buffers of the index and column."""
+        trace = dict(
+            type=trace_type,
+            x=x.to_numpy() if hasattr(x, 'to_numpy') else x,
+            y=y.to_numpy() if hasattr(y, 'to_numpy') else y,
+            name=str(name),
+            hovertemplate=hover_template,
+            opacity=self.trace_opacity,
+        )
+        trace.update(properties)
+        return trace
+
+    def _make_figure(self, traces, title, x_axis_title, y_axis_title):
+        """Assembles the figure either as a plain dict (fast path) or as a validated go.Figure."""
+        if self.use_fast_figures:
+            return {'data': traces, 'layout': self._get_layout_dict(title, x_axis_title, y_axis_title)}
+        fig = go.Figure(data=traces)
+        self._apply_standard_layout(fig, title, x_axis_title, y_axis_title)
+        return fig
+
+    def _empty_figure(self):
+        if self.use_fast_figures:
+            return {'data': [], 'layout': {'template': _get_template_dict()}}
+        return go.Figure()
+
     def create_standard_figure(self, data_to_plot, title, y_axis_title="Value"):
         """
         This function intelligently handles two types of input:
         1. A single DataFrame with multiple columns (for plotting T1, T2, etc. on one graph)
         2. A dictionary of single-column DataFrames (for plotting multiple folders on one graph)
         """
-        fig = go.Figure()
+        traces = []
 
         if isinstance(data_to_plot, pd.DataFrame):
             # Case 1: Input is a DataFrame
             if data_to_plot.empty:
-                return go.Figure()
+                return self._empty_figure()
 
             hover_template = self._get_hover_template(data_to_plot.index.name)
+            trace_type = self._get_scatter_type(data_to_plot.size)
             for column_name in data_to_plot.columns:
-                fig.add_trace(go.Scatter(
-                    x=data_to_plot.index,
-                    y=data_to_plot[column_name],
+                traces.append(self._scatter_trace(
+                    trace_type,
+                    data_to_plot.index,
+                    data_to_plot[column_name],
+                    column_name,  # The trace name is the column name
+                    hover_template,
                     mode='lines',
-                    name=column_name,  # The trace name is the column name
-                    hovertemplate=hover_template,
-                    opacity=self.trace_opacity
                 ))
             x_axis_title = data_to_plot.index.name
 
@@ -80,8 +160,10 @@ class Plotter:
             # Case 2: Input is a dictionary of DataFrames
             df_dict = data_to_plot
             if not df_dict:
-                return go.Figure()
+                return self._empty_figure()
 
+            # All folders share one trace type so overlays keep a consistent draw order
+            trace_type = self._get_scatter_type(sum(len(df) for df in df_dict.values() if df is not None))
             for trace_name, df in df_dict.items():
                 if df is None or df.empty:
                     continue
@@ -90,23 +172,22 @@ class Plotter:
                 # This logic assumes each DataFrame in the dict has only one data column
                 col_name = df.columns[0]
 
-                fig.add_trace(go.Scatter(
-                    x=df.index,
-                    y=df[col_name],
+                traces.append(self._scatter_trace(
+                    trace_type,
+                    df.index,
+                    df[col_name],
+                    trace_name,  # The trace name is the dictionary key
+                    hover_template,
                     mode='lines',
-                    name=trace_name, # The trace name is the dictionary key
-                    hovertemplate=hover_template,
                     line=dict(dash='solid'),
-                    opacity=self.trace_opacity
                 ))
             # Assume all DataFrames have the same index name (x-axis label)
             x_axis_title = list(df_dict.values())[0].index.name
         else:
             # If input is neither, return an empty figure
-            return go.Figure()
+            return self._empty_figure()
 
-        self._apply_standard_layout(fig, title, x_axis_title, y_axis_title)
-        return fig
+        return self._make_figure(traces, title, x_axis_title, y_axis_title)
 
     def create_spectrum_figure(self, df, num_slices, plot_type, freq_max=None, colorscale='Hot'):
         """
@@ -114,149 +195,541 @@ class Plotter:
         """
         if df is None or df.empty:
             return go.Figure()
+        return self.create_spectrum_figure_from_result(
+            compute_spectrum(df, num_slices), df.columns[0], plot_type, freq_max, colorscale)
 
-        data_column_name = df.columns[0]
-        fft_df = rolling_fft(df, num_slices=num_slices, add_resultant=True)
+    def create_spectrum_figure_from_result(self, spectrum, data_column_name, plot_type, freq_max=None,
+                                           colorscale='Hot', resolution=None, log_freq=False, tile_url=None):
+        """
+        Creates the spectrum plot from a compute_spectrum() result, e.g. one taken from a ResultCache.
+        resolution: (width, height) in pixels. Heatmap and Surface matrices larger than that (Surface is also
+        capped at surface_max_bins) are max-pooled down to it; log_freq pools frequencies into log-spaced bins.
+        tile_url: stored in the layout meta of a pooled heatmap, so the page can fetch finer tiles on zoom.
+        """
+        if plot_type == self.MEAN_SPECTRUM:
+            return self.create_multi_spectrum_figure({data_column_name: spectrum}, plot_type, freq_max,
+                                                     log_freq=log_freq)
+        frequencies, times, amplitudes = spectrum
+        # Frame times are rounded like endaq's spectrum_over_time
+        times = np.round(times, 2)
+
+        if plot_type not in self.NATIVE_SPECTRUM_TYPES:
+            fig = spectrum_over_time(
+                _spectrum_long_frame(frequencies, times, amplitudes, data_column_name),
+                plot_type=plot_type,
+                freq_max=freq_max,
+                log_freq=log_freq,
+                var_to_process=data_column_name
+            )
+            self._apply_standard_layout(fig, f"Spectrum Plot ({plot_type})", "Frequency (Hz)", "Time (s)")
+            return fig
+
+        # Same filtering as spectrum_over_time: positive frequencies up to freq_max, non-zero amplitudes
+        frequencies, amplitudes = limit_spectrum(frequencies, amplitudes, freq_max)
+        if frequencies.size == 0 or times.size == 0:
+            return self._empty_figure()
+
+        pooled = False
+        if plot_type == 'Waterfall':
+            traces = _waterfall_traces(frequencies, times, amplitudes)
+        else:
+            max_times, max_freqs = resolution if resolution is not None else amplitudes.shape
+            if plot_type == 'Surface':
+                max_times, max_freqs = min(max_times, self.surface_max_bins), min(max_freqs, self.surface_max_bins)
+            pooled = log_freq or amplitudes.shape[0] > max_times or amplitudes.shape[1] > max_freqs
+            if pooled:
+                x, y, z = bin_spectrum(frequencies, times, amplitudes, max_times, max_freqs, log_freq=log_freq)
+            else:
+                x, y, z = _pivot_spectrum(frequencies, times, amplitudes)
+            trace_type = 'heatmap' if plot_type == 'Heatmap' else 'surface'
+            trace = dict(type=trace_type, x=x, y=y, z=z, connectgaps=True, showscale=False,
+                         colorscale=_get_colorscale(colorscale))
+            if trace_type == 'heatmap':
+                trace['zsmooth'] = 'best'
+            traces = [trace]
+
+        fig = self._make_figure(traces, f"Spectrum Plot ({plot_type})", "Frequency (Hz)", "Time (s)")
+        extra_layout = {}
+        if plot_type in ('Surface', 'Waterfall'):
+            extra_layout['scene'] = dict(
+                aspectratio=dict(x=2.0, y=1.0, z=0.3),
+                xaxis=dict(title=dict(text='Timestamp')),
+                yaxis=dict(title=dict(text='Frequency (Hz)')),
+                zaxis=dict(title=dict(text='')),
+                camera=dict(eye=dict(x=-1.5, y=-1.5, z=1)),
+            )
+            if log_freq:
+                extra_layout['scene']['yaxis']['type'] = 'log'
+        elif log_freq:
+            extra_layout['yaxis'] = _axis(fig, 'yaxis', type='log')
+        if pooled and tile_url is not None and plot_type == 'Heatmap':
+            extra_layout['meta'] = {'weTileUrl': tile_url}
+        if plot_type == 'Waterfall':
+            # The shared style legend must not be mutated, so the waterfall gets its own copy
+            extra_layout['legend'] = _axis(fig, 'legend', title=dict(text='Timestamps'), tracegroupgap=0,
+                                           orientation='v')
+        _update_layout(fig, extra_layout)
+        return fig
 
-        # Create the figure first
-        fig = spectrum_over_time(
-            fft_df,
-            plot_type=plot_type,
-            freq_max=freq_max,
-            var_to_process=data_column_name
-        )
+    def create_multi_spectrum_figure(self, spectra, plot_type, freq_max=None, colorscale='Hot', resolution=None,
+                                     log_freq=False):
+        """
+        Spectrum plot of several compute_spectrum() results (trace name -> result, e.g. one per DataFolder).
+        MEAN_SPECTRUM overlays the time-averaged spectrum of every result; any other plot type draws one
+        heatmap facet per result, sharing one color axis so amplitudes compare across facets.
+        resolution: (width, height) of the whole figure in pixels, split between the facets for pooling.
+        """
+        spectra = {name: spectrum for name, spectrum in spectra.items() if spectrum[1].size}
+        if not spectra:
+            return self._empty_figure()
+
+        if plot_type == self.MEAN_SPECTRUM:
+            hover_template = self._get_hover_template('Frequency')
+            mean_spectra = [(name,) + limit_spectrum(frequencies, amplitudes.mean(axis=0, keepdims=True,
+                                                                                   dtype=np.float64), freq_max)
+                            for name, (frequencies, _, amplitudes) in spectra.items()]
+            trace_type = self._get_scatter_type(sum(frequencies.size for _, frequencies, _ in mean_spectra))
+            traces = [self._scatter_trace(trace_type, frequencies, amplitudes[0], name, hover_template, mode='lines')
+                      for name, frequencies, amplitudes in mean_spectra]
+            fig = self._make_figure(traces, f"Spectrum Plot ({self.MEAN_SPECTRUM})", "Frequency (Hz)",
+                                    "Mean Amplitude")
+            if log_freq:
+                _update_layout(fig, {'xaxis': _axis(fig, 'xaxis', type='log')})
+            return fig
+
+        count = len(spectra)
+        cols = 1 if count <= 2 else 2
+        rows = -(-count // cols)
+        width, height = resolution if resolution is not None else (4096, 4096)
+        max_times, max_freqs = max(16, width // cols), max(16, height // rows)
+
+        traces = []
+        z_min, z_max = np.inf, -np.inf
+        for i, (name, (frequencies, times, amplitudes)) in enumerate(spectra.items()):
+            frequencies, amplitudes = limit_spectrum(frequencies, amplitudes, freq_max)
+            if frequencies.size == 0:
+                continue
+            x, y, z = bin_spectrum(frequencies, np.round(times, 2), amplitudes, max_times, max_freqs,
+                                   log_freq=log_freq)
+            if np.isfinite(z).any():
+                z_min, z_max = min(z_min, np.nanmin(z)), max(z_max, np.nanmax(z))
+            suffix = '' if i == 0 else str(i + 1)
+            traces.append(dict(type='heatmap', x=x, y=y, z=z, name=str(name), connectgaps=True, zsmooth='best',
+                               coloraxis='coloraxis', xaxis=f'x{suffix}', yaxis=f'y{suffix}'))
+
+        fig = self._make_figure(traces, "Spectrum Plot (Heatmap)", None, None)
+        coloraxis = dict(colorscale=_get_colorscale(colorscale), showscale=False)
+        if z_min <= z_max:
+            coloraxis.update(cmin=float(z_min), cmax=float(z_max))
+        extra_layout = _facet_layout(list(spectra), cols, "Time (s)", "Frequency (Hz)", log_freq)
+        extra_layout['coloraxis'] = coloraxis
+        _update_layout(fig, extra_layout)
+        return fig
+
+    def create_psd_figure(self, psds, title, freq_max=None, log_freq=False):
+        """
+        Power spectral density lines (trace name -> (frequencies, psd) from analysis.spectral.compute_psd(s))
+        on a log PSD axis. Frequencies above freq_max are left out; log_freq also draws frequencies on a log
+        scale (without the DC bin).
+        """
+        return self._frequency_lines_figure(psds, title, "PSD (Value²/Hz)", freq_max, log_freq)
+
+    def create_srs_figure(self, spectra, title):
+        """Shock response spectrum lines (trace name -> (frequencies, srs) from analysis.shock.compute_srs) on log-log axes."""
+        return self._frequency_lines_figure(spectra, title, "SRS Peak (Value)", log_freq=True)
+
+    def create_transfer_function_figure(self, transfer_functions, title):
+        """
+        Gain lines of frequency responses (trace name -> (frequencies, complex H) from
+        analysis.spectral.transfer_function_h1) on a log gain axis; the phase is shown on hover.
+        """
+        hover_template = ("%{fullData.name}<br>Hz: %{x}<br>Gain: %{y:.4g}<br>Phase: %{customdata:.1f}°"
+                          "<extra></extra>")
+        lines = [(name, frequencies, np.abs(response), np.angle(response, deg=True))
+                 for name, (frequencies, response) in transfer_functions.items()]
+        if not lines:
+            return self._empty_figure()
+        trace_type = self._get_scatter_type(sum(x.size for _, x, _, _ in lines))
+        traces = [self._scatter_trace(trace_type, x, gain, name, hover_template, mode='lines', customdata=phase)
+                  for name, x, gain, phase in lines]
+        fig = self._make_figure(traces, title, "Frequency (Hz)", "|H1| (Response / Reference)")
+        _update_layout(fig, {'yaxis': _axis(fig, 'yaxis', type='log')})
+        return fig
 
-        # Check if plot type is one that uses a colorscale
-        if plot_type in ['Heatmap', 'Surface']:
-            # Loop through all traces to find the spectrum plot type
-            for trace in fig.data:
-                # Check if the trace is a Heatmap or a Surface and apply the colorscale
-                if isinstance(trace, (go.Heatmap, go.Surface)):
-                    trace.colorscale = colorscale
-                    break  # Stop after finding and updating the first one
+    def create_coherence_figure(self, coherences, title):
+        """Magnitude-squared coherence lines (trace name -> (frequencies, coherence)) on a 0..1 axis."""
+        if not coherences:
+            return self._empty_figure()
+        hover_template = self._get_hover_template('Frequency')
+        trace_type = self._get_scatter_type(sum(f.size for f, _ in coherences.values()))
+        traces = [self._scatter_trace(trace_type, frequencies, values, name, hover_template, mode='lines')
+                  for name, (frequencies, values) in coherences.items()]
+        fig = self._make_figure(traces, title, "Frequency (Hz)", "Coherence")
+        _update_layout(fig, {'yaxis': _axis(fig, 'yaxis', range=[0, 1.05])})
+        return fig
 
-        self._apply_standard_layout(fig, f"Spectrum Plot ({plot_type})", "Frequency (Hz)", "Time (s)")
+    def _frequency_lines_figure(self, lines, title, y_axis_title, freq_max=None, log_freq=False):
+        """One line per (frequencies, values) pair on a log value axis, optionally limited to freq_max."""
+        hover_template = self._get_hover_template('Frequency')
+        limited = []
+        for name, (frequencies, values) in lines.items():
+            keep = np.ones(frequencies.size, dtype=bool)
+            if freq_max is not None:
+                keep &= frequencies <= freq_max
+            if log_freq:
+                keep &= frequencies > 0
+            limited.append((name, frequencies[keep], values[keep]))
+        return self._log_lines_figure(limited, title, "Frequency (Hz)", y_axis_title, hover_template, 'lines', log_freq)
+
+    def create_rainflow_figure(self, results, title):
+        """
+        Rainflow cycle histograms (trace name -> analysis.fatigue.FatigueResult): cycles per range bin, summed
+        over the mean bins, on a log cycle axis. Empty bins are left out.
+        """
+        hover_template = "%{fullData.name}<br>Range: %{x:.4g}<br>Cycles: %{y}<extra></extra>"
+        lines = []
+        for name, result in results.items():
+            cycles = result.matrix.sum(axis=1)
+            centers = (result.range_edges[1:] + result.range_edges[:-1]) / 2
+            keep = cycles > 0
+            lines.append((name, centers[keep], cycles[keep]))
+        return self._log_lines_figure(lines, title, "Cycle Range (Value)", "Cycles", hover_template, 'lines+markers')
+
+    def create_level_statistics_figure(self, statistics, title, plot_type):
+        """
+        Histograms (plot_type HISTOGRAM; trace name -> (edges, counts)) or level-crossing counts
+        (LEVEL_CROSSINGS; trace name -> (levels, counts)) from analysis.level_statistics, on a log count axis.
+        Empty bins / uncrossed levels are left out.
+        """
+        is_histogram = plot_type == self.HISTOGRAM
+        y_axis_title = "Samples" if is_histogram else "Up-Crossings"
+        hover_template = f"%{{fullData.name}}<br>Level: %{{x:.4g}}<br>{y_axis_title}: %{{y}}<extra></extra>"
+        lines = []
+        for name, (x, counts) in statistics.items():
+            if is_histogram:
+                x = (x[1:] + x[:-1]) / 2
+            keep = counts > 0
+            lines.append((name, x[keep], counts[keep]))
+        return self._log_lines_figure(lines, title, "Level (Value)", y_axis_title, hover_template, 'lines+markers')
+
+    def create_band_figure(self, centers, levels, title):
+        """
+        Grouped bars of fractional-octave band levels (trace name -> RMS level per band, from
+        analysis.bands.band_levels) over the band centre frequencies, on a log level axis.
+        """
+        if centers.size == 0 or not levels:
+            return self._empty_figure()
+        labels = [f'{center:.3g}' for center in centers]
+        hover_template = "%{fullData.name}<br>Band: %{x} Hz<br>RMS: %{y:.4g}<extra></extra>"
+        traces = [self._scatter_trace('bar', labels, band_levels, name, hover_template)
+                  for name, band_levels in levels.items()]
+        fig = self._make_figure(traces, title, "Band Centre Frequency (Hz)", "Band Level (RMS)")
+        _update_layout(fig, {
+            'barmode': 'group',
+            'xaxis': _axis(fig, 'xaxis', type='category'),
+            'yaxis': _axis(fig, 'yaxis', type='log'),
+        })
         return fig
 
-        # Apply the standard layout for a consistent styling
-        self._apply_standard_layout(fig, f"Spectrum Plot ({plot_type})", "Frequency (Hz)", "Time (s)")
+    def _log_lines_figure(self, lines, title, x_axis_title, y_axis_title, hover_template, mode, log_x=False):
+        """One trace per (name, x, y) on a log y axis (and optionally a log x axis)."""
+        if not lines:
+            return self._empty_figure()
+
+        trace_type = self._get_scatter_type(sum(x.size for _, x, _ in lines))
+        traces = [self._scatter_trace(trace_type, x, y, name, hover_template, mode=mode) for name, x, y in lines]
+        fig = self._make_figure(traces, title, x_axis_title, y_axis_title)
+        extra_layout = {'yaxis': _axis(fig, 'yaxis', type='log')}
+        if log_x:
+            extra_layout['xaxis'] = _axis(fig, 'xaxis', type='log')
+        _update_layout(fig, extra_layout)
         return fig
 
     def create_comparison_figure(self, df1, df2, column, title):
-        fig = go.Figure()
         x_label = df1.index.name
         hover_template = self._get_hover_template(x_label)
+        trace_type = self._get_scatter_type(len(df1) + len(df2))
 
-        fig.add_trace(go.Scatter(
-            x=df1.index,
-            y=df1[column],
-            name=f"Original - {column}",
-            hovertemplate=hover_template,
-            opacity=self.trace_opacity
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=df2.index,
-            y=df2[column],
-            name=f"Compare - {column}",
-            hovertemplate=hover_template,
-            opacity=self.trace_opacity
-        ))
-
-        self._apply_standard_layout(fig, title, x_label, "Value")
-        return fig
+        traces = [
+            self._scatter_trace(trace_type, df1.index, df1[column], f"Original - {column}", hover_template),
+            self._scatter_trace(trace_type, df2.index, df2[column], f"Compare - {column}", hover_template),
+        ]
+        return self._make_figure(traces, title, x_label, "Value")
 
     def create_difference_figure(self, diff_df, title, y_title):
-        fig = go.Figure()
         hover_template = self._get_hover_template(diff_df.index.name)
+        trace_type = self._get_scatter_type(diff_df.size)
 
-        for col in diff_df.columns:
-            fig.add_trace(go.Scatter(
-                x=diff_df.index,
-                y=diff_df[col],
-                name=col,
-                hovertemplate=hover_template,
-                opacity=self.trace_opacity
-            ))
+        traces = [
+            self._scatter_trace(trace_type, diff_df.index, diff_df[col], col, hover_template)
+            for col in diff_df.columns
+        ]
+        return self._make_figure(traces, title, diff_df.index.name, y_title)
 
-        self._apply_standard_layout(fig, title, diff_df.index.name, y_title)
+    def create_rolling_envelope_figure(self, pyramids, title, desired_num_points, plot_as_bars,
+                                       x_axis_title=None, tile_url=None):
+        """
+        Draws the min/max envelope of every series (trace name -> MinMaxPyramid) like endaq's
+        rolling_min_max_envelope: bars spanning min to max, or separate min and max lines.
+        Every series gets two traces whose data get_envelope_tile() computes, so tile_url (stored in the
+        layout meta) lets the page replace them with a finer envelope after a zoom.
+        """
+        pyramids = {name: pyramid for name, pyramid in pyramids.items() if len(pyramid)}
+        if not pyramids:
+            return self._empty_figure()
+
+        colorway = _get_template_dict().get('layout', {}).get('colorway') or pc.DEFAULT_PLOTLY_COLORS
+        hover_template = self._get_hover_template(x_axis_title or '')
+        tile = self.get_envelope_tile(pyramids, desired_num_points, plot_as_bars)
+        line_type = self._get_scatter_type(sum(len(attrs['x']) for attrs in tile.values()))
+
+        traces = []
+        for i, name in enumerate(pyramids):
+            color = colorway[i % len(colorway)]
+            common = dict(name=str(name), legendgroup=str(name), opacity=self.trace_opacity)
+            if plot_as_bars:
+                first = dict(type='bar', marker=dict(color=color, line=dict(width=0)), **common)
+                second = dict(type='scatter', mode='lines', line=dict(color=color), showlegend=False,
+                              hovertemplate=hover_template, **common)
+            else:
+                first = dict(type=line_type, mode='lines', line=dict(color=color), hovertemplate=hover_template,
+                             **common)
+                second = dict(first, showlegend=False)
+            first.update(tile[2 * i])
+            second.update(tile[2 * i + 1])
+            traces += [first, second]
+
+        fig = self._make_figure(traces, title, x_axis_title, "Value")
+        extra_layout = {}
+        if plot_as_bars:
+            extra_layout.update(bargap=0, barmode='overlay')
+            # Like endaq, bar plots get an explicit y range padded by 6 %, since bars would pull autorange to 0
+            low = min(pyramid.value_range[0] for pyramid in pyramids.values())
+            high = max(pyramid.value_range[1] for pyramid in pyramids.values())
+            if np.isfinite(low) and np.isfinite(high):
+                padding = (high - low) * 0.06
+                extra_layout['yaxis'] = _axis(fig, 'yaxis', range=[low - padding, high + padding])
+        if tile_url is not None:
+            extra_layout['meta'] = {'weTileUrl': tile_url}
+        _update_layout(fig, extra_layout)
         return fig
 
-    def create_rolling_envelope_figure(self, df_dict, title, desired_num_points, plot_as_bars):
-        if not df_dict:
-            return go.Figure()
-
-        # Combine all dataframes for the endaq function
-        # The keys (trace names) will become the column names
-        combined_df = pd.concat([df.rename(columns={df.columns[0]: name}) for name, df in df_dict.items()], axis=1)
-
-        if combined_df.empty:
-            return go.Figure()
-
-        fig = rolling_min_max_envelope(
-            combined_df,
-            opacity=self.trace_opacity,
-            desired_num_points=desired_num_points,
-            plot_as_bars=plot_as_bars
-        )
-        # Ensure all traces reflect global opacity regardless of how the helper sets them
-        for trace in fig.data:
-            try:
-                trace.opacity = self.trace_opacity
-            except Exception:
-                pass
-        x_axis_title = list(df_dict.values())[0].index.name
-        self._apply_standard_layout(fig, title, x_axis_title, "Value")
-        return fig
+    @staticmethod
+    def get_envelope_tile(pyramids, desired_num_points, plot_as_bars, x_range=None):
+        """
+        Trace data of an envelope figure for x_range (the whole signal by default), as
+        {trace index: {attribute: array}} with two traces per series.
+        Bars: a bar from min to max per block, plus a line with a short horizontal segment for every block
+        whose min equals its max (a bar of zero height would be invisible). Lines: the min and max curves.
+        Where the range holds few enough samples, the samples are drawn as a plain line instead.
+        """
+        tile = {}
+        for i, pyramid in enumerate(pyramids.values()):
+            blocks = pyramid.query(desired_num_points, x_range)
+            x = (blocks.x_start + blocks.x_end) / 2
+            empty = np.empty(0)
+            if blocks.level == 0:
+                tile[2 * i] = {'x': empty, 'y': empty, 'base': empty} if plot_as_bars else {'x': x, 'y': blocks.mins}
+                tile[2 * i + 1] = {'x': x, 'y': blocks.mins} if plot_as_bars else {'x': empty, 'y': empty}
+            elif plot_as_bars:
+                tile[2 * i] = {'x': x, 'y': blocks.maxs - blocks.mins, 'base': blocks.mins}
+                flat = blocks.mins == blocks.maxs
+                # Segments are separated by NaN gaps: [start, end, NaN, start, end, NaN, ...]
+                segments_x = np.full((np.count_nonzero(flat), 3), np.nan)
+                segments_x[:, 0], segments_x[:, 1] = blocks.x_start[flat], blocks.x_end[flat]
+                segments_y = np.repeat(blocks.mins[flat].astype(np.float64), 3)
+                segments_y[2::3] = np.nan
+                tile[2 * i + 1] = {'x': segments_x.ravel(), 'y': segments_y}
+            else:
+                tile[2 * i] = {'x': x, 'y': blocks.mins}
+                tile[2 * i + 1] = {'x': x, 'y': blocks.maxs}
+        return tile
+
+    def _get_style_layout(self):
+        """
+        Returns the styled part of the standard layout. It is rebuilt only when a style setting changes,
+        so fast-path figures share one layout template instead of re-validating it for every figure.
+        """
+        legend_pos = self._get_legend_position()
+        style_key = (self.legend_font_size, self.default_font_size, self.hover_font_size, self.hover_mode,
+                     self.legend_visible, self.current_legend_position_index)
+        if self._style_layout_key != style_key:
+            self._style_layout = dict(
+                margin=dict(l=40, r=20, t=50, b=40),
+                legend=dict(
+                    font=dict(family='Open Sans', size=self.legend_font_size, color='black'),
+                    x=legend_pos['x'], y=legend_pos['y'],
+                    xanchor=legend_pos.get('xanchor', 'auto'),
+                    yanchor=legend_pos.get('yanchor', 'auto'),
+                    bgcolor='rgba(255, 255, 255, 0.6)'
+                ),
+                hoverlabel=dict(bgcolor='rgba(240, 240, 240, 0.9)', font=dict(size=self.hover_font_size)),
+                hovermode=self.hover_mode,
+                font=dict(family='Open Sans', size=self.default_font_size, color='black'),
+                showlegend=self.legend_visible,
+            )
+            self._style_layout_key = style_key
+        return self._style_layout
+
+    def _get_layout_dict(self, title, x_axis_title, y_axis_title):
+        """Builds the complete standard layout (template included) as a plain dict. Shared parts must not be mutated."""
+        layout = {'template': _get_template_dict(), 'title': {'text': title}}
+        layout.update(self._get_style_layout())
+        if x_axis_title is not None:
+            layout['xaxis'] = {'title': {'text': x_axis_title}}
+        if y_axis_title is not None:
+            layout['yaxis'] = {'title': {'text': y_axis_title}}
+        return layout
 
     def _apply_standard_layout(self, fig, title, x_axis_title, y_axis_title):
         """Applies a consistent style to all figures."""
-        legend_pos = self._get_legend_position()
-        fig.update_layout(
-            title=title,
-            margin=dict(l=40, r=20, t=50, b=40),
-            legend=dict(
-                font=dict(family='Open Sans', size=self.legend_font_size, color='black'),
-                x=legend_pos['x'], y=legend_pos['y'],
-                xanchor=legend_pos.get('xanchor', 'auto'),
-                yanchor=legend_pos.get('yanchor', 'auto'),
-                bgcolor='rgba(255, 255, 255, 0.6)'
-            ),
-            hoverlabel=dict(bgcolor='rgba(240, 240, 240, 0.9)', font_size=self.hover_font_size),
-            hovermode=self.hover_mode,
-            font=dict(family='Open Sans', size=self.default_font_size, color='black'),
-            showlegend=self.legend_visible,
-            xaxis_title=x_axis_title,
-            yaxis_title=y_axis_title
-        )
-
-# Helper function (used by tab classes)
-def load_fig_to_webview(fig, web_view):
-    """Generates full HTML, saves to a temp file, and loads it into a QWebEngineView."""
-    try:
-        html_content = pio.to_html(fig, full_html=True, include_plotlyjs=True, config={'responsive': True})
-        # Store temp files on the web_view object
-        if not hasattr(web_view, '_temp_files'):
-            web_view._temp_files = []
-
-        # Clean up old temp files for this specific widget
-        for old_file in web_view._temp_files:
-            try:
-                os.remove(old_file)
-            except OSError:
-                pass
-        web_view._temp_files.clear()
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as tmp_file:
-            tmp_file.write(html_content)
-            file_path = tmp_file.name
-            web_view._temp_files.append(file_path)
-
-        web_view.setUrl(QtCore.QUrl.fromLocalFile(file_path))
-        web_view.show()
-
-    except Exception as e:
-        print(f"Error loading figure to webview: {e}")
-        tb = traceback.format_exc()
-        error_html = f"<html><body><h1>Error loading plot</h1><pre>{e}</pre><pre>{tb}</pre></body></html>"
-        web_view.setHtml(error_html)
+        layout = self._get_layout_dict(title, x_axis_title, y_axis_title)
+        del layout['template']
+        fig.update_layout(layout)
+
+
+def _get_template_dict():
+    """Returns the active plotly template as a plain dict, converted once per template name."""
+    template_name = pio.templates.default
+    if template_name not in _template_dicts:
+        _template_dicts[template_name] = pio.templates[template_name].to_plotly_json()
+    return _template_dicts[template_name]
+
+
+_template_dicts = {}
+
+
+def _axis(fig, name, **settings):
+    """
+    A layout entry of the figure (e.g. 'yaxis') with settings added, for _update_layout. The fast-path dict
+    layout replaces entries as a whole, so its current entry is copied; go.Figure merges nested updates.
+    """
+    current = fig['layout'].get(name, {}) if isinstance(fig, dict) else {}
+    return dict(current, **settings)
+
+
+def _update_layout(fig, extra_layout):
+    """Applies a layout update to a figure from Plotter._make_figure, either a plain dict or a go.Figure."""
+    if isinstance(fig, dict):
+        fig['layout'].update(extra_layout)
+    elif extra_layout:
+        fig.update_layout(extra_layout)
+
+
+def _facet_layout(names, cols, x_axis_title, y_axis_title, log_y=False, gap=0.08):
+    """
+    Layout of a grid of subplots, one per name, filled row by row: axes x, x2, ... / y, y2, ... with their
+    domains, axis titles on the outer facets and the names as subplot titles.
+    """
+    rows = -(-len(names) // cols)
+    width = (1.0 - gap * (cols - 1)) / cols
+    height = (1.0 - gap * (rows - 1)) / rows
+    layout = {'annotations': []}
+    for i, name in enumerate(names):
+        row, col = divmod(i, cols)
+        suffix = '' if i == 0 else str(i + 1)
+        x0 = col * (width + gap)
+        y1 = 1.0 - row * (height + gap)
+        # Clamped, since rounding can push the outer edges just past [0, 1]
+        xaxis = {'domain': [x0, min(1.0, x0 + width)], 'anchor': f'y{suffix}'}
+        yaxis = {'domain': [max(0.0, y1 - height), y1], 'anchor': f'x{suffix}'}
+        if row == rows - 1 or i + cols >= len(names):
+            xaxis['title'] = {'text': x_axis_title}
+        if col == 0:
+            yaxis['title'] = {'text': y_axis_title}
+        if log_y:
+            yaxis['type'] = 'log'
+        layout[f'xaxis{suffix}'] = xaxis
+        layout[f'yaxis{suffix}'] = yaxis
+        layout['annotations'].append({'text': str(name), 'x': x0 + width / 2, 'y': y1, 'xref': 'paper',
+                                      'yref': 'paper', 'xanchor': 'center', 'yanchor': 'bottom',
+                                      'showarrow': False})
+    return layout
+
+
+def _get_colorscale(name):
+    """Resolves a named colorscale to explicit stops, as go.Heatmap would (plotly.js lacks e.g. 'Plasma')."""
+    if name not in _colorscales:
+        _colorscales[name] = pc.get_colorscale(name)
+    return _colorscales[name]
+
+
+_colorscales = {}
+
+# Waterfall line colors, sampled across the frames (endaq's waterfall_line_sequence)
+_WATERFALL_COLORSCALE = [[0.0, '#6914F0'], [0.2, '#3764FF'], [0.4, '#2DB473'],
+                         [0.6, '#FAC85F'], [0.8, '#EE7F27'], [1.0, '#D72D2D']]
+
+
+def _group_mean(values, keys, axis):
+    """
+    Averages the slices of values whose keys are equal along one axis, ignoring NaN, and returns
+    the sorted unique keys with the averaged values (the aggregation pivot_table applies).
+    """
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    if unique_keys.size == len(keys) and np.all(np.diff(keys) > 0):
+        return keys, values
+    moved = np.moveaxis(values, axis, 0)
+    finite = np.isfinite(moved)
+    sums = np.zeros((unique_keys.size,) + moved.shape[1:], dtype=np.float64)
+    counts = np.zeros_like(sums)
+    np.add.at(sums, inverse, np.where(finite, moved, 0.0))
+    np.add.at(counts, inverse, finite)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums / counts).astype(values.dtype)
+    return unique_keys, np.moveaxis(means, 0, axis)
+
+
+def _pivot_spectrum(frequencies, times, amplitudes):
+    """
+    Arranges the spectrum like spectrum_over_time's pivot table: z[frequency, time], frequencies snapped
+    to multiples of the lowest bin, duplicate keys averaged and all-empty rows and columns dropped.
+    """
+    if frequencies.size > 2 and np.isclose(frequencies[1] - frequencies[0], frequencies[2] - frequencies[1]):
+        min_freq = np.round(frequencies.min(), 2)
+        frequencies = np.round(frequencies / min_freq, 0) * min_freq
+    z = amplitudes.T
+    frequencies, z = _group_mean(z, frequencies, axis=0)
+    times, z = _group_mean(z, times, axis=1)
+    valid = np.isfinite(z)
+    rows, cols = valid.any(axis=1), valid.any(axis=0)
+    return times[cols], frequencies[rows], np.ascontiguousarray(z[rows][:, cols])
+
+
+def _waterfall_traces(frequencies, times, amplitudes):
+    """One 3D line per timestamp label, as px.line_3d builds them for spectrum_over_time's waterfall."""
+    labels, starts = np.unique(times, return_index=True)
+    colors = pc.sample_colorscale(_WATERFALL_COLORSCALE, len(labels))
+    bounds = list(starts) + [len(times)]
+    traces = []
+    for i, label in enumerate(labels):
+        block = amplitudes[bounds[i]:bounds[i + 1]]
+        valid = np.isfinite(block)
+        name = str(float(label))
+        traces.append(dict(
+            type='scatter3d',
+            x=np.repeat(times[bounds[i]:bounds[i + 1]], valid.sum(axis=1)),
+            y=np.broadcast_to(frequencies, block.shape)[valid],
+            z=block[valid],
+            mode='lines',
+            name=name,
+            legendgroup=name,
+            showlegend=True,
+            scene='scene',
+            line=dict(color=colors[i], dash='solid'),
+            marker=dict(symbol='circle'),
+            hovertemplate=(f'label_column={name}<br>timestamp=%{{x}}<br>frequency (Hz)=%{{y}}'
+                           '<br>value=%{z}<extra></extra>'),
+        ))
+    return traces
+
+
+def _spectrum_long_frame(frequencies, times, amplitudes, variable):
+    """Melted spectrum in the rolling_fft output format, for the plot types drawn by spectrum_over_time."""
+    num_frames, num_bins = amplitudes.shape
+    return pd.DataFrame({
+        'frequency (Hz)': np.tile(frequencies, num_frames),
+        'timestamp': np.repeat(times, num_bins),
+        'value': amplitudes.ravel().astype(np.float64),
+        'variable': variable,
+    })
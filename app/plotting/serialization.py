@@ -0,0 +1,129 @@
+# File: app/plotting/serialization.py
+
+import base64
+import json
+
+import numpy as np
+from plotly.basedatatypes import BaseFigure
+from plotly.utils import PlotlyJSONEncoder
+
+# float32 is used when the rounding error stays below this fraction of the array's value range
+FLOAT32_RELATIVE_TOLERANCE = 1e-7
+# Coordinate arrays (x) must additionally keep their samples apart: the error must stay below this
+# fraction of the smallest step between consecutive values
+FLOAT32_STEP_TOLERANCE = 1e-3
+_STEP_CHECKED_KEYS = ('x',)
+
+# Integer typed arrays supported by plotly.js, smallest first
+_INTEGER_TYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+
+def _fits_float32(values, values_f32, check_steps):
+    """Returns True if casting to float32 does not visibly change the array."""
+    finite = np.isfinite(values)
+    if not finite.any():
+        return True
+    if finite.all():
+        finite_values, finite_values_f32 = values, values_f32
+    else:
+        finite_values, finite_values_f32 = values[finite], values_f32[finite]
+    error = np.max(np.abs(finite_values - finite_values_f32.astype(np.float64)))
+    if error == 0.0:
+        return True
+    span = float(finite_values.max() - finite_values.min())
+    if error > FLOAT32_RELATIVE_TOLERANCE * span:
+        return False
+    if check_steps and finite_values.ndim == 1 and finite_values.size > 1:
+        steps = np.abs(np.diff(finite_values))
+        steps = steps[steps > 0]
+        if steps.size and error > FLOAT32_STEP_TOLERANCE * steps.min():
+            return False
+    return True
+
+
+def _integer_type(values):
+    if values.size == 0:
+        return 'i1'
+    lo, hi = values.min(), values.max()
+    for short_type in _INTEGER_TYPES:
+        info = np.iinfo(np.dtype(short_type))
+        if info.min <= lo and hi <= info.max:
+            return short_type
+    return None
+
+
+def encode_typed_array(values, check_steps=False):
+    """
+    Encodes a numeric NumPy array as a plotly.js typed array spec
+    ({'dtype': ..., 'bdata': <base64>, 'shape': ...}).
+    Returns None for arrays that cannot be encoded (object, string, datetime, complex).
+    """
+    kind = values.dtype.kind
+    if kind == 'b':
+        short_type = 'u1'
+    elif kind in 'iu':
+        short_type = _integer_type(values) or 'f8'
+    elif kind == 'f':
+        if values.dtype.itemsize <= 4:
+            short_type = 'f4'
+        else:
+            values_f32 = values.astype(np.float32)
+            short_type = 'f4' if _fits_float32(values, values_f32, check_steps) else 'f8'
+            if short_type == 'f4':
+                values = values_f32
+    else:
+        return None
+
+    buffer = np.ascontiguousarray(values, dtype=np.dtype(short_type).newbyteorder('<'))
+    typed_array = {'dtype': short_type, 'bdata': base64.b64encode(buffer.data).decode('ascii')}
+    if buffer.ndim > 1:
+        typed_array['shape'] = ','.join(str(n) for n in buffer.shape)
+    return typed_array
+
+
+def _encode_value(key, value):
+    if isinstance(value, np.ndarray):
+        typed_array = encode_typed_array(value, check_steps=key in _STEP_CHECKED_KEYS)
+        return typed_array if typed_array is not None else value
+    if isinstance(value, dict):
+        return {k: _encode_value(k, v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], dict):
+        return [_encode_value(key, v) for v in value]
+    return value
+
+
+def _json_default(obj):
+    # Non-numeric arrays (strings, objects with gaps) are written as plain lists; NaN gaps become null
+    if isinstance(obj, np.ndarray) and obj.dtype.kind == 'O':
+        return [None if isinstance(v, float) and v != v else v for v in obj.tolist()]
+    return PlotlyJSONEncoder.default(PlotlyJSONEncoder(), obj)
+
+
+def figure_to_dict(fig):
+    """Returns the figure as a plain dict without the deep copy made by go.Figure.to_dict()."""
+    if isinstance(fig, BaseFigure):
+        fig_dict = {'data': fig._data, 'layout': fig._layout}
+        if fig.frames:
+            fig_dict['frames'] = [frame.to_plotly_json() for frame in fig.frames]
+        return fig_dict
+    return fig
+
+
+def figure_to_json(fig):
+    """
+    Serializes a go.Figure or figure dict to JSON, writing numeric arrays as base64 typed arrays
+    (float32 where precision allows) straight from their NumPy buffers.
+    """
+    if isinstance(fig, SerializedFigure):
+        return fig.json
+    fig_dict = figure_to_dict(fig)
+    encoded = {key: _encode_value(key, value) for key, value in fig_dict.items()}
+    return json.dumps(encoded, default=_json_default, separators=(',', ':'))
+
+
+class SerializedFigure:
+    """A figure serialized ahead of time (e.g. in a worker thread); figure_to_json returns its JSON as-is."""
+    __slots__ = ('json',)
+
+    def __init__(self, fig):
+        self.json = figure_to_json(fig)
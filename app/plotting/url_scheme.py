@@ -0,0 +1,95 @@
+# File: app/plotting/url_scheme.py
+
+from PyQt5 import QtCore
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+# Plot pages, plotly.js and figure payloads are served from memory under wedavis://app/
+SCHEME_NAME = b'wedavis'
+BASE_URL = 'wedavis://app/'
+
+# path -> (mime type, QByteArray or a callable returning bytes on first request)
+_resources = {}
+# path -> (mime type, callable(query dict) returning bytes for every request)
+_providers = {}
+_handler = None
+
+
+def register_url_scheme():
+    """Registers the wedavis:// scheme with QtWebEngine. Must be called before the QApplication is created."""
+    scheme = QWebEngineUrlScheme(SCHEME_NAME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    flags = QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalAccessAllowed
+    # Lets the page fetch() figure payloads from its own origin (Qt 5.14+)
+    if hasattr(QWebEngineUrlScheme, 'CorsEnabled'):
+        flags |= QWebEngineUrlScheme.CorsEnabled
+    scheme.setFlags(flags)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def is_url_scheme_registered():
+    return QWebEngineUrlScheme.schemeByName(SCHEME_NAME).name() == SCHEME_NAME
+
+
+def set_resource(path, mime_type, data):
+    """Publishes bytes (or a callable producing them) at wedavis://app/<path> and returns the URL."""
+    if not callable(data):
+        data = QtCore.QByteArray(data)
+    _resources[path] = (mime_type, data)
+    return BASE_URL + path
+
+
+def set_resource_provider(path, mime_type, provider):
+    """Answers every request for wedavis://app/<path> with provider(query), query being the URL's query items."""
+    _providers[path] = (mime_type, provider)
+    return BASE_URL + path
+
+
+def remove_resource(path):
+    _resources.pop(path, None)
+    _providers.pop(path, None)
+
+
+class WedavisUrlSchemeHandler(QWebEngineUrlSchemeHandler):
+    """Answers wedavis:// requests from the in-memory resources, without touching the disk."""
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        path = url.path().lstrip('/')
+        if path in _providers:
+            mime_type, provider = _providers[path]
+            query = dict(QtCore.QUrlQuery(url).queryItems())
+            try:
+                data = QtCore.QByteArray(provider(query))
+            except Exception as e:
+                print(f"Error answering '{path}': {e}")
+                job.fail(QWebEngineUrlRequestJob.RequestFailed)
+                return
+            self._reply(job, mime_type, data)
+            return
+
+        entry = _resources.get(path)
+        if entry is None:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+        mime_type, data = entry
+        if callable(data):
+            data = QtCore.QByteArray(data())
+            _resources[path] = (mime_type, data)
+        self._reply(job, mime_type, data)
+
+    @staticmethod
+    def _reply(job, mime_type, data):
+        # The buffer is parented to the job, so it is released together with the request
+        buffer = QtCore.QBuffer(job)
+        buffer.setData(data)
+        buffer.open(QtCore.QIODevice.ReadOnly)
+        job.reply(mime_type, buffer)
+
+
+def install_url_scheme_handler(profile):
+    """Installs the shared handler on a QWebEngineProfile once."""
+    global _handler
+    if _handler is None:
+        _handler = WedavisUrlSchemeHandler()
+    if profile.urlSchemeHandler(SCHEME_NAME) is None:
+        profile.installUrlSchemeHandler(SCHEME_NAME, _handler)
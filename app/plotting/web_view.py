@@ -0,0 +1,411 @@
+# File: app/plotting/web_view.py
+
+import atexit
+import json
+import os
+import tempfile
+import traceback
+
+import numpy as np
+import plotly
+from plotly.offline import get_plotlyjs
+from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtWebEngineWidgets import QWebEnginePage, QWebEngineProfile, QWebEngineView
+
+from . import url_scheme
+from .serialization import encode_typed_array, figure_to_json
+
+# A single page is loaded once per web view. Subsequent figures are pushed into it
+# with Plotly.react, so plotly.js is parsed only once and the WebGL context is reused.
+# plotly.js is referenced from one local file shared by all views instead of being inlined in the page.
+_PLOT_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+    html, body { margin: 0; padding: 0; width: 100%; height: 100%; overflow: hidden; }
+    #plot { width: 100%; height: 100%; }
+    #busy {
+        position: absolute; top: 8px; right: 8px; z-index: 1000; padding: 4px 10px;
+        font: 12px 'Open Sans', sans-serif; color: white; background: rgba(0, 131, 143, 0.85);
+        border-radius: 10px; opacity: 0; pointer-events: none; transition: opacity 0.15s;
+    }
+    /* Short updates finish before the indicator fades in */
+    #busy.visible { opacity: 1; transition-delay: 0.2s; }
+</style>
+<script type="text/javascript" src="__PLOTLY_JS_URL__"></script>
+</head>
+<body>
+<div id="plot"></div>
+<div id="busy">Updating...</div>
+<script type="text/javascript">
+    // Indices of the traces whose opacity follows the global trace opacity setting
+    window.weStyledTraces = [];
+    // Figure loads, style updates and busy changes run one after another in request order
+    window.weQueue = Promise.resolve();
+    window.weRequestCount = 0;
+    window.weRenderCount = 0;
+    window.weTileRequest = 0;
+
+    function weEnqueue(task) {
+        window.weQueue = window.weQueue.then(task).catch(function (e) { console.error(e); });
+        return window.weQueue;
+    }
+
+    window.weRenderFigure = function (fig) {
+        var plotDiv = document.getElementById('plot');
+        var data = fig.data || [];
+        window.weStyledTraces = [];
+        data.forEach(function (trace, i) {
+            if (trace.opacity !== undefined) { window.weStyledTraces.push(i); }
+        });
+        return Plotly.react(plotDiv, {
+            data: data,
+            layout: fig.layout || {},
+            frames: fig.frames || [],
+            config: {responsive: true}
+        }).then(function () {
+            // Lets the host (e.g. the latency benchmark) observe render completion via titleChanged
+            document.title = 'rendered ' + (++window.weRenderCount);
+            if (!plotDiv.weTilesBound) {
+                plotDiv.weTilesBound = true;
+                plotDiv.on('plotly_relayout', function (update) {
+                    if (Object.keys(update).some(function (key) { return /^[xy]axis\.(range|autorange)/.test(key); })) {
+                        weRequestTile(plotDiv);
+                    }
+                });
+            }
+        });
+    };
+
+    // Figures with zoom tiles (pooled spectrum heatmaps, min/max envelopes) carry a tile URL in layout.meta:
+    // after a zoom, the data of the visible region is fetched again and swapped into the listed traces
+    function weRequestTile(plotDiv) {
+        var meta = plotDiv.layout.meta;
+        if (!meta || !meta.weTileUrl) { return; }
+        var request = ++window.weTileRequest;
+        var render = window.weRenderCount;
+        var ratio = window.devicePixelRatio || 1;
+        var size = plotDiv._fullLayout._size;
+        var params = ['w=' + Math.round(size.w * ratio), 'h=' + Math.round(size.h * ratio)];
+        var xaxis = plotDiv.layout.xaxis || {};
+        var yaxis = plotDiv.layout.yaxis || {};
+        if (xaxis.autorange === false && xaxis.range) {
+            params.push('x0=' + xaxis.range[0], 'x1=' + xaxis.range[1]);
+        }
+        if (yaxis.autorange === false && yaxis.range) {
+            var y = yaxis.range.map(function (v) { return yaxis.type === 'log' ? Math.pow(10, v) : v; });
+            params.push('y0=' + y[0], 'y1=' + y[1]);
+        }
+        return weEnqueue(function () {
+            return fetch(meta.weTileUrl + '?' + params.join('&')).then(function (response) {
+                return response.json();
+            }).then(function (tile) {
+                // A newer zoom or another figure was requested meanwhile
+                if (request !== window.weTileRequest || render !== window.weRenderCount) { return; }
+                return tile.traces.reduce(function (done, trace) {
+                    return done.then(function () {
+                        var update = {};
+                        Object.keys(trace.update).forEach(function (key) { update[key] = [trace.update[key]]; });
+                        return Plotly.restyle(plotDiv, update, [trace.index]);
+                    });
+                }, Promise.resolve());
+            });
+        });
+    }
+
+    // Figures sent inline with the script
+    window.weShowFigure = function (fig) {
+        var request = ++window.weRequestCount;
+        return weEnqueue(function () {
+            if (request === window.weRequestCount) { return window.weRenderFigure(fig); }
+        });
+    };
+
+    // Large figures are fetched from the in-memory URL scheme instead of being passed through runJavaScript
+    window.weLoadFigure = function (url) {
+        var request = ++window.weRequestCount;
+        return weEnqueue(function () {
+            // A newer figure was requested meanwhile
+            if (request !== window.weRequestCount) { return; }
+            return fetch(url).then(function (response) { return response.json(); }).then(window.weRenderFigure);
+        });
+    };
+
+    window.weSetBusy = function (busy) {
+        if (busy) {
+            document.getElementById('busy').classList.add('visible');
+            return;
+        }
+        return weEnqueue(function () { document.getElementById('busy').classList.remove('visible'); });
+    };
+
+    // Applies style-only changes to the current figure without resending its data
+    window.weApplyStyle = function (layoutUpdate, opacity) {
+        return weEnqueue(function () {
+            var plotDiv = document.getElementById('plot');
+            if (!plotDiv.data) { return; }
+            var traceUpdate = {};
+            var traces = [];
+            if (opacity !== null && window.weStyledTraces.length) {
+                traceUpdate = {opacity: opacity};
+                traces = window.weStyledTraces;
+            }
+            return Plotly.update(plotDiv, traceUpdate, layoutUpdate, traces);
+        });
+    };
+</script>
+</body>
+</html>
+"""
+
+# Figures larger than this are fetched by the page from the URL scheme instead of being inlined in a script
+INLINE_FIGURE_MAX_BYTES = 256 * 1024
+
+_plotly_js_path = None
+_plot_profile = None
+
+
+def _remove_temp_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _get_bundled_plotly_js_path():
+    return os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+
+
+def _read_plotly_js():
+    bundled_path = _get_bundled_plotly_js_path()
+    if os.path.isfile(bundled_path):
+        with open(bundled_path, 'rb') as js_file:
+            return js_file.read()
+    return get_plotlyjs().encode('utf-8')
+
+
+def get_plotly_js_path():
+    """
+    Returns the local plotly.min.js shipped with the plotly package (bundled by the PyInstaller spec).
+    If it cannot be found, the library is written once to a temp file, so pages never need the network.
+    Only used when the wedavis:// scheme is not registered.
+    """
+    global _plotly_js_path
+    if _plotly_js_path is None:
+        bundled_path = _get_bundled_plotly_js_path()
+        if os.path.isfile(bundled_path):
+            _plotly_js_path = bundled_path
+        else:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False, encoding='utf-8') as tmp_file:
+                tmp_file.write(get_plotlyjs())
+            _plotly_js_path = tmp_file.name
+            atexit.register(_remove_temp_file, _plotly_js_path)
+    return _plotly_js_path
+
+
+def get_plot_page_html(plotly_js_url=None):
+    """Returns the plot page HTML referencing the shared plotly.js (the local file by default)."""
+    if plotly_js_url is None:
+        plotly_js_url = QtCore.QUrl.fromLocalFile(get_plotly_js_path()).toString()
+    return _PLOT_PAGE_TEMPLATE.replace('__PLOTLY_JS_URL__', plotly_js_url)
+
+
+def _publish_plot_page():
+    """Serves the plot page and plotly.js from memory under wedavis://app/ and returns the page URL."""
+    url_scheme.set_resource('plotly.min.js', b'application/javascript', _read_plotly_js)
+    return url_scheme.set_resource('plot.html', b'text/html', get_plot_page_html('plotly.min.js').encode('utf-8'))
+
+
+def get_plot_profile():
+    """
+    Returns the profile shared by all plot views. It is off-the-record (memory only), and sharing it lets
+    Chromium reuse one renderer process and the compiled plotly.js for every plot page.
+    """
+    global _plot_profile
+    if _plot_profile is None:
+        _plot_profile = QWebEngineProfile(QtWidgets.QApplication.instance())
+        _plot_profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        if url_scheme.is_url_scheme_registered():
+            url_scheme.install_url_scheme_handler(_plot_profile)
+    return _plot_profile
+
+
+def get_tile_url(name):
+    """URL the page fetches zoom tiles of a plot from, or None when the wedavis:// scheme is not available."""
+    if not url_scheme.is_url_scheme_registered():
+        return None
+    return f"{url_scheme.BASE_URL}tiles/{name}.json"
+
+
+def set_tile_provider(name, provider):
+    """
+    Serves zoom tiles at get_tile_url(name). provider(query) receives the request parameters (w, h in pixels,
+    optional x0/x1/y0/y1 axis ranges) and returns the new data of the figure's traces as
+    {trace index: {attribute: array}}, e.g. {0: {'x': x, 'y': y, 'z': z}}.
+    """
+    def respond(query):
+        traces = []
+        for index, attributes in provider(query).items():
+            # Coordinates keep neighbouring samples apart when they are narrowed to float32
+            update = {key: encode_typed_array(np.asarray(values), check_steps=key in ('x', 'y'))
+                      for key, values in attributes.items()}
+            traces.append({'index': int(index), 'update': update})
+        return json.dumps({'traces': traces}).encode('utf-8')
+    url_scheme.set_resource_provider(f"tiles/{name}.json", b'application/json', respond)
+
+
+def create_plot_view(parent=None):
+    """Creates a QWebEngineView whose page uses the shared plot profile."""
+    web_view = QWebEngineView(parent)
+    web_view.setPage(QWebEnginePage(get_plot_profile(), web_view))
+    return web_view
+
+
+class _PlotPageState:
+    """Tracks whether the plot page of a web view is ready to receive figures."""
+
+    def __init__(self, web_view):
+        self.web_view = web_view
+        self.ready = False
+        self.pending_script = None
+        self.pending_style_script = None
+        # Set when the page is served by the wedavis:// scheme; large figures are published at this path
+        self.figure_path = None
+        self.figure_version = 0
+        # Replayed after the page is reloaded, e.g. when a discarded page becomes active again
+        self.last_script = None
+        self.last_style_script = None
+
+    def on_load_finished(self, ok):
+        if not ok:
+            print("Error loading plot page into webview.")
+            return
+        self.ready = True
+        if self.pending_script is not None:
+            script, self.pending_script = self.pending_script, None
+            self.web_view.page().runJavaScript(script)
+        if self.pending_style_script is not None:
+            script, self.pending_style_script = self.pending_style_script, None
+            self.web_view.page().runJavaScript(script)
+
+    def run_script(self, script):
+        self.last_script = script
+        self.last_style_script = None
+        # Only the most recent figure matters while the page is still loading
+        if self.ready:
+            self.web_view.page().runJavaScript(script)
+        else:
+            self.pending_script = script
+            # The new figure already carries the current style
+            self.pending_style_script = None
+
+    def run_style_script(self, script):
+        self.last_style_script = script
+        # Style updates are applied after the queued figure, and only the latest one is kept
+        if self.ready:
+            self.web_view.page().runJavaScript(script)
+        else:
+            self.pending_style_script = script
+
+    def prepare_reload(self):
+        """Queues the last figure and style again so they are rendered when the page has reloaded."""
+        self.ready = False
+        self.pending_script = self.last_script
+        self.pending_style_script = self.last_style_script
+
+
+def _ensure_plot_page(web_view):
+    state = getattr(web_view, '_plot_page', None)
+    if state is None:
+        state = _PlotPageState(web_view)
+        web_view._plot_page = state
+        web_view.loadFinished.connect(state.on_load_finished)
+        if url_scheme.is_url_scheme_registered():
+            url_scheme.install_url_scheme_handler(web_view.page().profile())
+            state.figure_path = f"figure/{id(web_view):x}.json"
+            web_view.destroyed.connect(lambda _=None, path=state.figure_path: url_scheme.remove_resource(path))
+            web_view.setUrl(QtCore.QUrl(_publish_plot_page()))
+        else:
+            # Without the scheme the small page is passed directly; plotly.js still comes from a local file
+            base_url = QtCore.QUrl.fromLocalFile(os.path.dirname(get_plotly_js_path()) + os.sep)
+            web_view.setHtml(get_plot_page_html(), base_url)
+    return state
+
+
+def _release_plot_page(web_view):
+    state = getattr(web_view, '_plot_page', None)
+    if state is not None:
+        try:
+            web_view.loadFinished.disconnect(state.on_load_finished)
+        except TypeError:
+            pass
+        if state.figure_path is not None:
+            url_scheme.remove_resource(state.figure_path)
+        web_view._plot_page = None
+
+
+# Helper function (used by tab classes)
+def load_fig_to_webview(fig, web_view):
+    """Pushes the figure JSON (numeric arrays as typed arrays) into the persistent plot page of a QWebEngineView."""
+    try:
+        fig_json = figure_to_json(fig)
+        state = _ensure_plot_page(web_view)
+        if state.figure_path is not None and len(fig_json) > INLINE_FIGURE_MAX_BYTES:
+            # The page fetches the payload from memory; the query makes every figure a new URL
+            state.figure_version += 1
+            figure_url = url_scheme.set_resource(state.figure_path, b'application/json', fig_json.encode('utf-8'))
+            state.run_script(f"weLoadFigure({json.dumps(f'{figure_url}?v={state.figure_version}')});")
+        else:
+            state.run_script(f"weShowFigure({fig_json});")
+        web_view.show()
+
+    except Exception as e:
+        print(f"Error loading figure to webview: {e}")
+        tb = traceback.format_exc()
+        # The error page replaces the plot page, so the next figure reloads it
+        _release_plot_page(web_view)
+        error_html = f"<html><body><h1>Error loading plot</h1><pre>{e}</pre><pre>{tb}</pre></body></html>"
+        web_view.setHtml(error_html)
+
+
+def apply_style_to_webviews(web_views, layout_update, trace_opacity=None):
+    """
+    Pushes a style-only change into every web view that already shows a plot page,
+    using Plotly.update (relayout + restyle) so no figure data is rebuilt or resent.
+    """
+    script = f"weApplyStyle({json.dumps(layout_update)}, {json.dumps(trace_opacity)});"
+    for web_view in web_views:
+        state = getattr(web_view, '_plot_page', None)
+        if state is not None:
+            state.run_style_script(script)
+
+
+def set_webviews_busy(web_views, busy):
+    """Shows or hides the busy indicator of web views whose plot page is loaded."""
+    script = f"weSetBusy({'true' if busy else 'false'});"
+    for web_view in web_views:
+        state = getattr(web_view, '_plot_page', None)
+        if state is not None and state.ready:
+            web_view.page().runJavaScript(script)
+
+
+def set_webviews_suspended(web_views, suspended):
+    """
+    Discards the pages of hidden plot views to free renderer memory (Qt 5.14+), or reactivates them.
+    A reactivated page reloads and replays its last figure and style from memory.
+    """
+    for web_view in web_views:
+        state = getattr(web_view, '_plot_page', None)
+        page = web_view.page()
+        if state is None or not hasattr(page, 'setLifecycleState'):
+            continue
+        current_state = page.lifecycleState()
+        if suspended:
+            # Only pages that are not on screen may be discarded
+            if web_view.isVisible() or current_state == QWebEnginePage.LifecycleState.Discarded:
+                continue
+            state.prepare_reload()
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+        elif current_state != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
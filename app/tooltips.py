@@ -13,6 +13,49 @@ to see how the frequency content changes over time.<br><br>
 A good starting point is 400.
 """
 
+SPECTRUM_FREQ_MAX = """
+<b>Highest frequency shown in the spectrum plot.</b><br><br>
+Leave empty to show all frequencies up to the Nyquist frequency.
+"""
+
+SPECTRUM_LOG_FREQ = """
+<b>Groups frequencies into log-spaced bins.</b><br><br>
+Heatmap and Surface plots keep the maximum amplitude of each bin, and the
+frequency axis is drawn on a log scale.
+"""
+
+PSD_PLOT = """
+<b>Shows a spectrum of the components instead of the time series.</b><br><br>
+&#8226; <b>PSD:</b> power spectral density by Welch's method (Hann window, 1 Hz bins, 50% overlap)<br>
+&#8226; <b>SRS:</b> maximax shock response spectrum (5% damping, 12 frequencies per octave
+  from 0.5 Hz)<br>
+&#8226; <b>Rainflow:</b> cycle counts per load range; the export adds 1 Hz damage-equivalent
+  loads (Wöhler exponents 3, 4, 5, 8, 10) and range/mean cycle matrices<br>
+&#8226; <b>Histogram:</b> samples per level bin (64 bins over each component's range)<br>
+&#8226; <b>Level Crossings:</b> number of upward crossings of 64 levels per component<br>
+&#8226; <b>Octave / 1/3-Octave Bands:</b> RMS level per band (IEC 61260-1 base-10 bands); also
+  available for FREQ data, where the amplitudes of the lines in each band are integrated<br><br>
+Computed for all components at once; Section Data and the Tukey window are applied first (TIME).
+Use Export Results to save the tables as CSV.
+"""
+
+CROSS_SPECTRUM = """
+<b>Compares the selected column with a reference.</b><br><br>
+&#8226; <b>Difference:</b> both datasets with their absolute and relative differences<br>
+&#8226; <b>Cross Spectrum:</b> Welch auto-spectra and cross-spectral density (Hann window, 1 Hz bins,
+  50% overlap), H1 transfer function (gain; phase on hover) and coherence. The reference is the
+  comparison data's column of the same name or another column of the primary data (TIME data only)<br><br>
+All columns are paired with the reference in one pass, so switching the column is immediate.
+"""
+
+ROLLING_STATISTICS = """
+<b>Running statistic of a column over a trailing time window.</b><br><br>
+&#8226; <b>Rolling RMS / Mean / Std:</b> root mean square, mean and standard deviation of the window<br>
+&#8226; <b>Rolling Peak:</b> largest absolute value in the window<br><br>
+Each point summarises the window ending at its time stamp, so the first window of samples is empty.
+The window is converted to samples with each folder's mean time step.
+"""
+
 TUKEY_WINDOW = """
 <b>Smoothly tapers data at boundaries to prevent spectral leakage.</b><br><br>
 When extracting a <i>section</i> of time-domain data for detailed simulations, 
@@ -62,4 +105,22 @@ The dialog automatically detects installed ANSYS versions and allows you to sele
 which one to use. If a version fails, try selecting a different version.<br><br>
 <i>Requires ansys-mechanical-core package to be installed and licensed. 
 Applies current Section Data and Tukey Window settings if enabled.</i>
-"""
\ No newline at end of file
+"""
+
+WEBGL_THRESHOLD = """
+<b>Switches line plots to WebGL rendering above this many points.</b><br><br>
+Standard (SVG) traces become sluggish with a few hundred thousand points, while
+WebGL traces stay responsive with millions of points.<br><br>
+&#8226; The count is the total number of points in a figure, summed over all traces<br>
+&#8226; Opacity, hover labels and legend behaviour are identical in both modes<br><br>
+<i>Lower this value if overlays of many folders feel slow to zoom or pan.</i>
+"""
+
+SPECTRUM_DISK_CACHE = """
+<b>Keeps computed spectra on disk, so a run opened again skips the FFT.</b><br><br>
+Spectral matrices are written to the WE-DAVIS folder of the local application data
+(%LOCALAPPDATA%\\WE-DAVIS\\spectrum); the least recently used files are deleted beyond 512 MB.<br><br>
+&#8226; Unchecked, spectra are only cached in memory for the current session<br>
+&#8226; Files already written are kept and used again once the option is checked<br><br>
+<i>Uncheck this on shared or nearly full drives.</i>
+"""
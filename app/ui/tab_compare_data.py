@@ -1,12 +1,20 @@
 # File: app/ui/tab_compare_data.py
 
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QSplitter, QComboBox, QPushButton, QSizePolicy
-from ..plotting.plotter import load_fig_to_webview
+from PyQt5 import QtWidgets, QtCore
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QSplitter, QComboBox, QPushButton, QSizePolicy, QLabel
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
+from .. import tooltips
 from .. import config_manager
 
 
 class CompareDataTab(QtWidgets.QWidget):
+    # Analyses: differences of the two datasets, or auto/cross spectra, H1 and coherence against a reference
+    DIFFERENCE = 'Difference'
+    CROSS_SPECTRUM = 'Cross Spectrum'
+    ANALYSIS_TYPES = [DIFFERENCE, CROSS_SPECTRUM]
+    # Reference of the cross spectrum: the comparison data's column of the same name, or a primary column
+    COMPARE_REFERENCE = 'Comparison Data'
+
     plot_parameters_changed = QtCore.pyqtSignal()
     # Signal to open the file dialog for comparison data
     select_compare_data_requested = QtCore.pyqtSignal()
@@ -17,11 +25,11 @@ class CompareDataTab(QtWidgets.QWidget):
 
     def _setup_ui(self):
         # Plots
-        self.compare_regular_plot = QtWebEngineWidgets.QWebEngineView()
+        self.compare_regular_plot = create_plot_view()
         self.compare_regular_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.compare_absolute_diff_plot = QtWebEngineWidgets.QWebEngineView()
+        self.compare_absolute_diff_plot = create_plot_view()
         self.compare_absolute_diff_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.compare_percent_diff_plot = QtWebEngineWidgets.QWebEngineView()
+        self.compare_percent_diff_plot = create_plot_view()
         self.compare_percent_diff_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
 
         splitter_upper = QSplitter(QtCore.Qt.Vertical)
@@ -38,12 +46,23 @@ class CompareDataTab(QtWidgets.QWidget):
         # Controls
         self.compare_column_selector = QComboBox()
         self.compare_column_selector.setEditable(False)
+        self.analysis_selector = QComboBox()
+        self.analysis_selector.addItems(self.ANALYSIS_TYPES)
+        self.analysis_selector.setToolTip(tooltips.CROSS_SPECTRUM)
+        self.reference_label = QLabel("Reference:")
+        self.reference_selector = QComboBox()
+        self.reference_selector.addItem(self.COMPARE_REFERENCE)
+        self.reference_label.setVisible(False)
+        self.reference_selector.setVisible(False)
         self.compare_button = QPushButton("Select Data for Comparison")
         self.compare_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
 
         # Layout
         controls_layout = QHBoxLayout()
         controls_layout.addWidget(self.compare_column_selector)
+        controls_layout.addWidget(self.analysis_selector)
+        controls_layout.addWidget(self.reference_label)
+        controls_layout.addWidget(self.reference_selector)
         controls_layout.addStretch()
         controls_layout.addWidget(self.compare_button)
 
@@ -57,6 +76,25 @@ class CompareDataTab(QtWidgets.QWidget):
         # Connections
         self.compare_button.clicked.connect(self.select_compare_data_requested)
         self.compare_column_selector.currentIndexChanged.connect(self.plot_parameters_changed)
+        self.analysis_selector.currentIndexChanged.connect(self._on_analysis_changed)
+        self.reference_selector.currentIndexChanged.connect(self.plot_parameters_changed)
+
+    @QtCore.pyqtSlot(int)
+    def _on_analysis_changed(self, index):
+        is_cross_spectrum = self.analysis_selector.currentText() == self.CROSS_SPECTRUM
+        self.reference_label.setVisible(is_cross_spectrum)
+        self.reference_selector.setVisible(is_cross_spectrum)
+        self.plot_parameters_changed.emit()
+
+    def set_time_domain_features_visibility(self, visible):
+        """Cross spectra need time-domain data; FREQ data always show the differences."""
+        if not visible:
+            self.analysis_selector.blockSignals(True)
+            self.analysis_selector.setCurrentIndex(0)
+            self.analysis_selector.blockSignals(False)
+            self.reference_label.setVisible(False)
+            self.reference_selector.setVisible(False)
+        self.analysis_selector.setVisible(visible)
 
     def update_column_selector(self, columns):
         """
@@ -71,6 +109,15 @@ class CompareDataTab(QtWidgets.QWidget):
         if current_text in columns:
             self.compare_column_selector.setCurrentText(current_text)
 
+        # Any common column can also serve as the reference of the cross spectrum
+        current_reference = self.reference_selector.currentText()
+        self.reference_selector.blockSignals(True)
+        self.reference_selector.clear()
+        self.reference_selector.addItems([self.COMPARE_REFERENCE] + list(columns))
+        if current_reference in columns:
+            self.reference_selector.setCurrentText(current_reference)
+        self.reference_selector.blockSignals(False)
+
     def display_comparison_plot(self, fig):
         load_fig_to_webview(fig, self.compare_regular_plot)
 
@@ -1,8 +1,8 @@
 # File: app/ui/tab_compare_part_loads.py
 
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QSplitter, QComboBox, QCheckBox
-from ..plotting.plotter import load_fig_to_webview
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
 
 
 class ComparePartLoadsTab(QtWidgets.QWidget):
@@ -19,9 +19,9 @@ class ComparePartLoadsTab(QtWidgets.QWidget):
         self.exclude_checkbox = QCheckBox("Filter out T2, T3, R2, and R3 from graphs")
 
         # Plots
-        self.t_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.t_series_plot = create_plot_view()
         self.t_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.r_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.r_series_plot = create_plot_view()
         self.r_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
         splitter = QSplitter(QtCore.Qt.Vertical)
         splitter.addWidget(self.t_series_plot)
@@ -2,9 +2,9 @@
 
 import re
 from natsort import natsorted
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QSplitter, QComboBox, QLabel, QSizePolicy
-from ..plotting.plotter import load_fig_to_webview
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
 
 class InterfaceDataTab(QtWidgets.QWidget):
     plot_parameters_changed = QtCore.pyqtSignal()
@@ -24,9 +24,9 @@ class InterfaceDataTab(QtWidgets.QWidget):
         self.interface_selector.setEditable(True)
         self.side_selector = QComboBox()
         self.side_selector.setEditable(True)
-        self.t_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.t_series_plot = create_plot_view()
         self.t_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.r_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.r_series_plot = create_plot_view()
         self.r_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
 
         splitter = QSplitter(QtCore.Qt.Vertical)
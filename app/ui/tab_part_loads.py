@@ -1,18 +1,27 @@
 # File: app/ui/tab_part_loads.py
 
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QSplitter, QComboBox,
                              QPushButton, QCheckBox, QDoubleSpinBox, QLineEdit, QLabel)
-from ..plotting.plotter import load_fig_to_webview
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
 from .. import tooltips
 from .. import config_manager
 
 class PartLoadsTab(QtWidgets.QWidget):
+    # Plot types per data domain; the first one shows the loads themselves
+    TIME_PLOT_TYPES = ['Time Series', 'PSD', 'SRS', 'Rainflow', 'Histogram', 'Level Crossings',
+                       'Octave Bands', '1/3-Octave Bands']
+    FREQ_PLOT_TYPES = ['Spectrum', 'Octave Bands', '1/3-Octave Bands']
+
     plot_parameters_changed = QtCore.pyqtSignal()
     export_to_ansys_requested = QtCore.pyqtSignal()
+    export_results_requested = QtCore.pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Tables behind the displayed spectrum, rainflow and level-statistics plots (file name suffix -> DataFrame),
+        # set by the PlotController and saved by Export Results
+        self.current_export_tables = {}
         self._setup_ui()
 
     def _setup_ui(self):
@@ -22,6 +31,12 @@ class PartLoadsTab(QtWidgets.QWidget):
 
         self.exclude_checkbox = QCheckBox(r"Filter out T2, T3, R2, and R3 from graphs")
 
+        self.plot_type_selector = QComboBox()
+        self.plot_type_selector.addItems(self.TIME_PLOT_TYPES)
+        self.plot_type_selector.setToolTip(tooltips.PSD_PLOT)
+        self.export_results_button = QPushButton("Export Results (CSV)")
+        self.export_results_button.setVisible(False)
+
         self.tukey_checkbox = QCheckBox("Apply Tukey Window")
         self.tukey_checkbox.setVisible(False)
         self.tukey_alpha_spin = QDoubleSpinBox()
@@ -43,9 +58,9 @@ class PartLoadsTab(QtWidgets.QWidget):
         self.section_max_input.setVisible(False)
 
         # Plots
-        self.t_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.t_series_plot = create_plot_view()
         self.t_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.r_series_plot = QtWebEngineWidgets.QWebEngineView()
+        self.r_series_plot = create_plot_view()
         self.r_series_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
         splitter = QSplitter(QtCore.Qt.Vertical)
         splitter.addWidget(self.t_series_plot)
@@ -60,6 +75,8 @@ class PartLoadsTab(QtWidgets.QWidget):
         upper_layout = QHBoxLayout()
         upper_layout.addWidget(self.side_filter_selector)
         upper_layout.addWidget(self.exclude_checkbox)
+        upper_layout.addWidget(self.plot_type_selector)
+        upper_layout.addWidget(self.export_results_button)
         upper_layout.addWidget(self.tukey_checkbox)
         upper_layout.addWidget(self.tukey_alpha_spin)
         upper_layout.addWidget(self.section_checkbox)
@@ -77,6 +94,8 @@ class PartLoadsTab(QtWidgets.QWidget):
         # Connect signals
         self.side_filter_selector.currentIndexChanged.connect(self.plot_parameters_changed)
         self.exclude_checkbox.stateChanged.connect(self.plot_parameters_changed)
+        self.plot_type_selector.currentIndexChanged.connect(self._on_plot_type_changed)
+        self.export_results_button.clicked.connect(self.export_results_requested)
         self.tukey_checkbox.stateChanged.connect(self._on_tukey_toggled)
         self.tukey_alpha_spin.valueChanged.connect(self.plot_parameters_changed)
         self.section_checkbox.stateChanged.connect(self._on_section_toggled)
@@ -91,6 +110,16 @@ class PartLoadsTab(QtWidgets.QWidget):
         self.tukey_checkbox.setVisible(visible)
         self.section_checkbox.setVisible(visible)
 
+        # Keep the selected plot type if the domain offers it as well
+        plot_types = self.TIME_PLOT_TYPES if visible else self.FREQ_PLOT_TYPES
+        current = self.plot_type_selector.currentText()
+        self.plot_type_selector.blockSignals(True)
+        self.plot_type_selector.clear()
+        self.plot_type_selector.addItems(plot_types)
+        self.plot_type_selector.setCurrentIndex(plot_types.index(current) if current in plot_types else 0)
+        self.plot_type_selector.blockSignals(False)
+        self.export_results_button.setVisible(self.plot_type_selector.currentIndex() > 0)
+
         # If the main features are being hidden, also hide their sub-options
         if not visible:
             self.tukey_alpha_spin.setVisible(False)
@@ -99,6 +128,11 @@ class PartLoadsTab(QtWidgets.QWidget):
             self.section_max_label.setVisible(False)
             self.section_max_input.setVisible(False)
 
+    @QtCore.pyqtSlot(int)
+    def _on_plot_type_changed(self, index):
+        self.export_results_button.setVisible(self.plot_type_selector.currentIndex() > 0)
+        self.plot_parameters_changed.emit()
+
     @QtCore.pyqtSlot(int)
     def _on_tukey_toggled(self, state):
         self.tukey_alpha_spin.setVisible(state == QtCore.Qt.Checked)
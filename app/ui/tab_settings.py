@@ -8,6 +8,8 @@ from .. import tooltips
 
 class SettingsTab(QtWidgets.QWidget):
     settings_changed = QtCore.pyqtSignal()
+    # Emitted for settings that only change how figures look (fonts, hover, opacity)
+    style_changed = QtCore.pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -35,6 +37,11 @@ class SettingsTab(QtWidgets.QWidget):
         control_layout.addWidget(self.desired_num_points_input)
         control_layout.addStretch()
         data_processing_layout.addLayout(control_layout)
+
+        self.spectrum_disk_cache_checkbox = QCheckBox("Keep Computed Spectra on Disk")
+        self.spectrum_disk_cache_checkbox.setChecked(True)
+        self.spectrum_disk_cache_checkbox.setToolTip(tooltips.SPECTRUM_DISK_CACHE)
+        data_processing_layout.addWidget(self.spectrum_disk_cache_checkbox)
         data_processing_group.setLayout(data_processing_layout)
 
         # Graphical Settings Group
@@ -64,6 +71,15 @@ class SettingsTab(QtWidgets.QWidget):
         self.opacity_spin.setToolTip("Controls opacity of all traces in all plots. 0.0 = transparent, 1.0 = opaque.")
         graphical_settings_layout.addLayout(self._create_setting_row("Trace Opacity", self.opacity_spin))
 
+        # Point count above which line plots switch to WebGL rendering
+        self.webgl_threshold_spin = QtWidgets.QSpinBox()
+        self.webgl_threshold_spin.setRange(1000, 100000000)
+        self.webgl_threshold_spin.setSingleStep(10000)
+        self.webgl_threshold_spin.setValue(100000)
+        self.webgl_threshold_spin.setToolTip(tooltips.WEBGL_THRESHOLD)
+        graphical_settings_layout.addLayout(
+            self._create_setting_row("WebGL Point Threshold", self.webgl_threshold_spin))
+
         graphical_settings_group.setLayout(graphical_settings_layout)
 
         # Contact Label
@@ -85,11 +101,12 @@ class SettingsTab(QtWidgets.QWidget):
         self.rolling_min_max_checkbox.stateChanged.connect(self._on_rolling_min_max_toggled)
         self.plot_as_bars_checkbox.stateChanged.connect(self.settings_changed)
         self.desired_num_points_input.textChanged.connect(self.settings_changed)
-        self.legend_font_size_selector.currentIndexChanged.connect(self.settings_changed)
-        self.default_font_size_selector.currentIndexChanged.connect(self.settings_changed)
-        self.hover_font_size_selector.currentIndexChanged.connect(self.settings_changed)
-        self.hover_mode_selector.currentIndexChanged.connect(self.settings_changed)
-        self.opacity_spin.valueChanged.connect(self.settings_changed)
+        self.legend_font_size_selector.currentIndexChanged.connect(self.style_changed)
+        self.default_font_size_selector.currentIndexChanged.connect(self.style_changed)
+        self.hover_font_size_selector.currentIndexChanged.connect(self.style_changed)
+        self.hover_mode_selector.currentIndexChanged.connect(self.style_changed)
+        self.opacity_spin.valueChanged.connect(self.style_changed)
+        self.webgl_threshold_spin.valueChanged.connect(self.settings_changed)
 
     def _create_selector(self, items, default):
         selector = QComboBox()
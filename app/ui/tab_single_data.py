@@ -1,14 +1,17 @@
 # File: app/ui/tab_single_data.py
 
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QSplitter, QComboBox,
                              QLabel, QSizePolicy, QCheckBox, QLineEdit, QSpinBox)
 
-from ..plotting.plotter import load_fig_to_webview
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
 from .. import tooltips
 
 
 class SingleDataTab(QtWidgets.QWidget):
+    # Spectrum plot types with a multi-folder figure (faceted heatmaps, mean-spectrum overlay, PSD lines)
+    MULTI_FOLDER_SPECTRUM_TYPES = ('Heatmap', 'Mean Spectrum', 'PSD')
+
     plot_parameters_changed = QtCore.pyqtSignal()
     spectrum_parameters_changed = QtCore.pyqtSignal()
 
@@ -21,11 +24,11 @@ class SingleDataTab(QtWidgets.QWidget):
 
     def _setup_ui(self):
         self.splitter = QSplitter(QtCore.Qt.Vertical)
-        self.regular_plot = QtWebEngineWidgets.QWebEngineView()
+        self.regular_plot = create_plot_view()
         self.regular_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.phase_plot = QtWebEngineWidgets.QWebEngineView()
+        self.phase_plot = create_plot_view()
         self.phase_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
-        self.spectrum_plot = QtWebEngineWidgets.QWebEngineView()
+        self.spectrum_plot = create_plot_view()
         self.spectrum_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
 
         self.splitter.addWidget(self.regular_plot)
@@ -36,7 +39,7 @@ class SingleDataTab(QtWidgets.QWidget):
         self.column_selector.setSizeAdjustPolicy(QComboBox.AdjustToContents)
         self.spectrum_checkbox = QCheckBox("Show Spectrum Plot")
         self.plot_type_selector = QComboBox()
-        self.plot_type_selector.addItems(['Heatmap', 'Surface', 'Waterfall', 'Animation', 'Peak', 'Lines'])
+        self.plot_type_selector.addItems(['Heatmap', 'Surface', 'Waterfall', 'Animation', 'Peak', 'Lines', 'Mean Spectrum', 'PSD'])
 
         self.colorscale_label = QLabel("Colorscale:")
         self.colorscale_selector = QComboBox()
@@ -44,6 +47,10 @@ class SingleDataTab(QtWidgets.QWidget):
 
         self.num_slices_label = QLabel("Spectrum Slices:")
         self.num_slices_input = QLineEdit("400")
+        self.freq_max_label = QLabel("Max Freq [Hz]:")
+        self.freq_max_input = QLineEdit()
+        self.freq_max_input.setPlaceholderText("All")
+        self.log_freq_checkbox = QCheckBox("Log Freq. Bins")
         self.filter_checkbox = QCheckBox("Apply Low-Pass Filter")
         self.cutoff_frequency_label = QLabel("Cutoff Freq [Hz]:")
         self.cutoff_frequency_input = QLineEdit()
@@ -52,6 +59,13 @@ class SingleDataTab(QtWidgets.QWidget):
         self.filter_order_input.setRange(1, 10)
         self.filter_order_input.setValue(2)
 
+        # Rolling statistic controls (computed selections 'Rolling ...')
+        self.rolling_source_label = QLabel("Source:")
+        self.rolling_source_selector = QComboBox()
+        self.rolling_source_selector.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.rolling_window_label = QLabel("Window [sec]:")
+        self.rolling_window_input = QLineEdit("1.0")
+
         # Section Data controls
         self.section_checkbox = QCheckBox("Section Data")
         self.section_min_label = QLabel("Min Time [sec]")
@@ -60,8 +74,15 @@ class SingleDataTab(QtWidgets.QWidget):
         self.section_max_input = QLineEdit()
 
         self.plot_type_selector.setVisible(False)
+        self.rolling_source_label.setVisible(False)
+        self.rolling_source_selector.setVisible(False)
+        self.rolling_window_label.setVisible(False)
+        self.rolling_window_input.setVisible(False)
         self.num_slices_label.setVisible(False)
         self.num_slices_input.setVisible(False)
+        self.freq_max_label.setVisible(False)
+        self.freq_max_input.setVisible(False)
+        self.log_freq_checkbox.setVisible(False)
         self.colorscale_label.setVisible(False)
         self.colorscale_selector.setVisible(False)
         self.cutoff_frequency_label.setVisible(False)
@@ -78,12 +99,19 @@ class SingleDataTab(QtWidgets.QWidget):
 
         selector_layout = QHBoxLayout()
         selector_layout.addWidget(self.column_selector)
+        selector_layout.addWidget(self.rolling_source_label)
+        selector_layout.addWidget(self.rolling_source_selector)
+        selector_layout.addWidget(self.rolling_window_label)
+        selector_layout.addWidget(self.rolling_window_input)
         selector_layout.addWidget(self.spectrum_checkbox)
         selector_layout.addWidget(self.plot_type_selector)
         selector_layout.addWidget(self.colorscale_label)
         selector_layout.addWidget(self.colorscale_selector)
         selector_layout.addWidget(self.num_slices_label)
         selector_layout.addWidget(self.num_slices_input)
+        selector_layout.addWidget(self.freq_max_label)
+        selector_layout.addWidget(self.freq_max_input)
+        selector_layout.addWidget(self.log_freq_checkbox)
         selector_layout.addWidget(self.filter_checkbox)
         selector_layout.addWidget(self.cutoff_frequency_label)
         selector_layout.addWidget(self.cutoff_frequency_input)
@@ -102,6 +130,8 @@ class SingleDataTab(QtWidgets.QWidget):
 
         # Controls that affect the main plot
         self.column_selector.currentIndexChanged.connect(self._on_column_changed)
+        self.rolling_source_selector.currentIndexChanged.connect(self.plot_parameters_changed)
+        self.rolling_window_input.editingFinished.connect(self.plot_parameters_changed)
         self.filter_checkbox.stateChanged.connect(self._on_filter_toggled)
         self.cutoff_frequency_input.textChanged.connect(self.plot_parameters_changed)
         self.filter_order_input.valueChanged.connect(self.plot_parameters_changed)
@@ -115,9 +145,14 @@ class SingleDataTab(QtWidgets.QWidget):
         self.plot_type_selector.currentIndexChanged.connect(self._update_colorscale_visibility)
         self.colorscale_selector.currentIndexChanged.connect(self.spectrum_parameters_changed)
         self.num_slices_input.returnPressed.connect(self.spectrum_parameters_changed)
+        self.freq_max_input.editingFinished.connect(self.spectrum_parameters_changed)
+        self.log_freq_checkbox.stateChanged.connect(self.spectrum_parameters_changed)
 
         # Set Tooltips
         self.num_slices_input.setToolTip(tooltips.SPECTRUM_SLICES)
+        self.freq_max_input.setToolTip(tooltips.SPECTRUM_FREQ_MAX)
+        self.log_freq_checkbox.setToolTip(tooltips.SPECTRUM_LOG_FREQ)
+        self.rolling_window_input.setToolTip(tooltips.ROLLING_STATISTICS)
 
     def display_regular_plot(self, fig):
         load_fig_to_webview(fig, self.regular_plot)
@@ -162,6 +197,9 @@ class SingleDataTab(QtWidgets.QWidget):
             self.plot_type_selector.setVisible(False)
             self.num_slices_label.setVisible(False)
             self.num_slices_input.setVisible(False)
+            self.freq_max_label.setVisible(False)
+            self.freq_max_input.setVisible(False)
+            self.log_freq_checkbox.setVisible(False)
             self.colorscale_label.setVisible(False)
             self.colorscale_selector.setVisible(False)
 
@@ -185,6 +223,9 @@ class SingleDataTab(QtWidgets.QWidget):
             self.plot_type_selector.setVisible(False)
             self.num_slices_label.setVisible(False)
             self.num_slices_input.setVisible(False)
+            self.freq_max_label.setVisible(False)
+            self.freq_max_input.setVisible(False)
+            self.log_freq_checkbox.setVisible(False)
             self.colorscale_label.setVisible(False)
             self.colorscale_selector.setVisible(False)
             self.set_spectrum_plot_visibility(False)
@@ -207,6 +248,9 @@ class SingleDataTab(QtWidgets.QWidget):
         self.colorscale_selector.setVisible(is_checked)
         self.num_slices_label.setVisible(is_checked)
         self.num_slices_input.setVisible(is_checked)
+        self.freq_max_label.setVisible(is_checked)
+        self.freq_max_input.setVisible(is_checked)
+        self.log_freq_checkbox.setVisible(is_checked)
 
         # Manage the splitter layout
         if is_checked:
@@ -239,8 +283,12 @@ class SingleDataTab(QtWidgets.QWidget):
     @QtCore.pyqtSlot(int)
     def _on_column_changed(self, index):
         text = self.column_selector.currentText()
-        is_computed = text in ('Time Step (Δt)', 'Sampling Rate (Hz)')
+        is_rolling = text in ('Rolling RMS', 'Rolling Mean', 'Rolling Std', 'Rolling Peak')
+        is_computed = is_rolling or text in ('Time Step (Δt)', 'Sampling Rate (Hz)')
         self._computed_selection_active = is_computed
+        for widget in (self.rolling_source_label, self.rolling_source_selector,
+                       self.rolling_window_label, self.rolling_window_input):
+            widget.setVisible(is_rolling)
 
         if is_computed:
             # Uncheck and hide spectrum controls
@@ -250,6 +298,9 @@ class SingleDataTab(QtWidgets.QWidget):
             self.plot_type_selector.setVisible(False)
             self.num_slices_label.setVisible(False)
             self.num_slices_input.setVisible(False)
+            self.freq_max_label.setVisible(False)
+            self.freq_max_input.setVisible(False)
+            self.log_freq_checkbox.setVisible(False)
             self.colorscale_label.setVisible(False)
             self.colorscale_selector.setVisible(False)
             self.set_spectrum_plot_visibility(False)
@@ -271,6 +322,18 @@ class SingleDataTab(QtWidgets.QWidget):
         # Trigger a full plot update
         self.plot_parameters_changed.emit()
 
+    def set_multi_folder_spectrum_types(self, is_multi_folder):
+        """Disables the spectrum plot types without a multi-folder figure while several folders are loaded."""
+        model = self.plot_type_selector.model()
+        for i in range(self.plot_type_selector.count()):
+            text = self.plot_type_selector.itemText(i)
+            model.item(i).setEnabled(not is_multi_folder or text in self.MULTI_FOLDER_SPECTRUM_TYPES)
+        if not model.item(self.plot_type_selector.currentIndex()).isEnabled():
+            self.plot_type_selector.blockSignals(True)
+            self.plot_type_selector.setCurrentText(self.MULTI_FOLDER_SPECTRUM_TYPES[0])
+            self.plot_type_selector.blockSignals(False)
+            self._update_colorscale_visibility()
+
     def _update_colorscale_visibility(self):
         """Shows or hides the colorscale option based on the selected plot type."""
         # First, check if the spectrum plot itself is visible
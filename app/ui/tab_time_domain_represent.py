@@ -1,8 +1,8 @@
 # File: app/ui/tab_time_domain_represent.py
 
-from PyQt5 import QtWidgets, QtCore, QtWebEngineWidgets
+from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QLabel
-from ..plotting.plotter import load_fig_to_webview
+from ..plotting.web_view import create_plot_view, load_fig_to_webview
 
 
 class TimeDomainRepresentTab(QtWidgets.QWidget):
@@ -21,7 +21,7 @@ class TimeDomainRepresentTab(QtWidgets.QWidget):
         self.data_point_selector.setEditable(True)
         self.data_point_selector.addItem("Select a frequency [Hz] to plot")
 
-        self.time_domain_plot = QtWebEngineWidgets.QWebEngineView()
+        self.time_domain_plot = create_plot_view()
         self.time_domain_plot.setContextMenuPolicy(QtCore.Qt.NoContextMenu)
 
         self.interval_selector = QComboBox()
@@ -1,6 +1,8 @@
 # File: main.py
+import os
 import sys
 import logging
+import multiprocessing
 
 # Suppress third-party logging (e.g., Titus/log4net)
 logging.getLogger().setLevel(logging.CRITICAL)
@@ -11,9 +13,18 @@ from PyQt5.QtCore import QTimer
 
 from app.data_manager import DataManager
 from app.main_window import MainWindow
+from app.plotting.url_scheme import register_url_scheme
 
 if __name__ == "__main__":
+    # Worker processes of the fatigue analysis start the frozen executable again; let them run their task
+    multiprocessing.freeze_support()
     # 1. Create the application instance
+    # The in-memory wedavis:// scheme for plot pages must be registered before the QApplication exists
+    register_url_scheme()
+    # All plot pages come from one site, so they share a single renderer process
+    chromium_flags = os.environ.get('QTWEBENGINE_CHROMIUM_FLAGS', '')
+    if '--process-per-site' not in chromium_flags:
+        os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = f"{chromium_flags} --process-per-site".strip()
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     app = QApplication(sys.argv)
 
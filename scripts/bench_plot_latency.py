@@ -0,0 +1,355 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import statistics
+
+import numpy as np
+import pandas as pd
+
+# Run headless unless a platform is forced by the caller
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('QTWEBENGINE_CHROMIUM_FLAGS', '--process-per-site')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QApplication
+
+from app.plotting.url_scheme import register_url_scheme
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, 'scripts', 'plot_latency_baseline.json')
+STAGES = ('debounce', 'queued', 'builders', 'figure', 'serialize', 'apply', 'render', 'total')
+INTERFACES = ('I1', 'I2', 'I3')
+SIDES = ('Housing', 'Shaft')
+COMPONENTS = ('T1', 'T2', 'T3', 'T2/T3', 'R1', 'R2', 'R3', 'R2/R3')
+
+
+def make_dataset(domain: str, num_points: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a single-folder dataset shaped like DataManager output (columns like 'I1 - Housing (T1)')."""
+    rng = np.random.default_rng(seed)
+    if domain == 'TIME':
+        axis = np.arange(num_points) / 1000.0
+    else:
+        axis = np.linspace(1.0, 500.0, num_points)
+    data = {'NO': np.arange(num_points), domain: axis}
+    for interface in INTERFACES:
+        for side in SIDES:
+            for component in COMPONENTS:
+                name = f'{interface} - {side} ({component})'
+                freq = rng.uniform(5.0, 80.0)
+                data[name] = np.sin(2 * np.pi * freq * axis / axis[-1] * 50) + 0.1 * rng.standard_normal(num_points)
+                if domain == 'FREQ':
+                    data[f'Phase_{name}'] = rng.uniform(-180.0, 180.0, num_points)
+    df = pd.DataFrame(data)
+    df['DataFolder'] = 'bench_folder'
+    return df
+
+
+class StageRecorder:
+    """
+    Splits each worker build into data builders, figure construction and serialization by timing the
+    Plotter.create_* methods and figure_to_json in the worker thread that runs the PlotTask.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.builds = {}
+
+    def _add(self, stage, seconds):
+        bucket = getattr(self._local, 'bucket', None)
+        if bucket is not None:
+            bucket[stage] = bucket.get(stage, 0.0) + seconds
+
+    def _timed(self, stage, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._add(stage, time.perf_counter() - start)
+        return wrapper
+
+    def install(self):
+        from app.controllers import plot_tasks
+        from app.plotting import plotter, serialization
+
+        for name in dir(plotter.Plotter):
+            if name.startswith('create_'):
+                setattr(plotter.Plotter, name, self._timed('figure', getattr(plotter.Plotter, name)))
+        serialization.figure_to_json = self._timed('serialize', serialization.figure_to_json)
+
+        original_run = plot_tasks.PlotTask.run
+        recorder = self
+
+        def run(task):
+            # Registered before the build so the GUI thread finds it when the finished signal arrives
+            bucket = recorder.builds.setdefault((task.view, task.generation), {})
+            recorder._local.bucket = bucket
+            try:
+                original_run(task)
+            finally:
+                recorder._local.bucket = None
+
+        plot_tasks.PlotTask.run = run
+
+
+class LatencyBench:
+    def __init__(self, app, main_window, recorder, wait_for_render, timeout_ms):
+        self.app = app
+        self.mw = main_window
+        self.controller = main_window.plot_controller
+        self.recorder = recorder
+        self.wait_for_render = wait_for_render
+        self.timeout_ms = timeout_ms
+        self._timings = {}
+        self._rendered = {}
+        self.controller.plot_timing.connect(self._on_plot_timing)
+        for view in ('single_data', 'single_data_spectrum', 'interface_data', 'part_loads',
+                     'time_domain_represent', 'compare_data', 'compare_part_loads'):
+            web_view = self.controller.view_web_views(view)[0]
+            web_view.titleChanged.connect(lambda title, view=view: self._on_title_changed(view, title))
+
+    def _on_plot_timing(self, view, timing):
+        self._timings[view] = timing
+
+    def _on_title_changed(self, view, title):
+        if title.startswith('rendered'):
+            self._rendered[view] = time.perf_counter()
+
+    def _wait(self, condition):
+        loop = QtCore.QEventLoop()
+        poll = QtCore.QTimer()
+        poll.timeout.connect(lambda: loop.quit() if condition() else None)
+        poll.start(5)
+        QtCore.QTimer.singleShot(self.timeout_ms, loop.quit)
+        loop.exec_()
+        poll.stop()
+        return condition()
+
+    def settle(self):
+        """Lets pending updates and renders finish before the next measurement."""
+        self._wait(self.controller.is_idle)
+        self.app.processEvents()
+
+    def measure(self, view, action):
+        self.settle()
+        self._timings.pop(view, None)
+        self._rendered.pop(view, None)
+        started_at = time.perf_counter()
+        action()
+        if not self._wait(lambda: view in self._timings):
+            raise TimeoutError(f"'{view}' was not updated within {self.timeout_ms} ms")
+        timing = self._timings[view]
+        rendered_at = timing['applied_at']
+        if self.wait_for_render:
+            if not self._wait(lambda: view in self._rendered):
+                raise TimeoutError(f"'{view}' did not finish rendering within {self.timeout_ms} ms")
+            rendered_at = self._rendered[view]
+
+        stages = self.recorder.builds.pop((view, timing['generation']), {})
+        figure = stages.get('figure', 0.0)
+        serialize = stages.get('serialize', 0.0)
+        result = {
+            'debounce': timing['submitted_at'] - started_at,
+            'queued': timing['queued'],
+            'builders': max(timing['build'] - figure - serialize, 0.0),
+            'figure': figure,
+            'serialize': serialize,
+            'apply': timing['apply'],
+            'render': rendered_at - timing['applied_at'],
+            'total': rendered_at - started_at,
+        }
+        return {stage: seconds * 1000.0 for stage, seconds in result.items()}
+
+
+def _cycle(combo):
+    """Selects the next entry of a combobox."""
+    return lambda: combo.setCurrentIndex((combo.currentIndex() + 1) % combo.count())
+
+
+def _next_frequency(combo):
+    # Index 0 is the 'Select a frequency' placeholder
+    return lambda: combo.setCurrentIndex(combo.currentIndex() % (combo.count() - 1) + 1)
+
+
+def _toggle(checkbox):
+    return lambda: checkbox.setChecked(not checkbox.isChecked())
+
+
+def _set_text_and_submit(line_edit, values, repeat):
+    def action():
+        line_edit.setText(values[repeat % len(values)])
+        line_edit.returnPressed.emit()
+    return action
+
+
+def time_scenarios(mw, repeat):
+    single, part_loads, interface = mw.tab_single_data, mw.tab_part_loads, mw.tab_interface_data
+    return [
+        ('single_data.column', 'single_data', mw.tab_single_data, _cycle(single.column_selector)),
+        ('single_data.spectrum_slices', 'single_data_spectrum', mw.tab_single_data,
+         _set_text_and_submit(single.num_slices_input, ['60', '90', '120'], repeat)),
+        ('interface_data.interface', 'interface_data', interface, _cycle(interface.interface_selector)),
+        ('part_loads.side', 'part_loads', part_loads, _cycle(part_loads.side_filter_selector)),
+        ('part_loads.exclude', 'part_loads', part_loads, _toggle(part_loads.exclude_checkbox)),
+        ('compare_data.column', 'compare_data', mw.tab_compare_data,
+         _cycle(mw.tab_compare_data.compare_column_selector)),
+        ('compare_part_loads.side', 'compare_part_loads', mw.tab_compare_part_loads,
+         _cycle(mw.tab_compare_part_loads.side_filter_selector)),
+    ]
+
+
+def freq_scenarios(mw, repeat):
+    time_domain = mw.tab_time_domain_represent
+    return [
+        ('single_data.column', 'single_data', mw.tab_single_data, _cycle(mw.tab_single_data.column_selector)),
+        ('interface_data.interface', 'interface_data', mw.tab_interface_data,
+         _cycle(mw.tab_interface_data.interface_selector)),
+        ('part_loads.side', 'part_loads', mw.tab_part_loads, _cycle(mw.tab_part_loads.side_filter_selector)),
+        ('time_domain_represent.frequency', 'time_domain_represent', time_domain,
+         _next_frequency(time_domain.data_point_selector)),
+        ('compare_data.column', 'compare_data', mw.tab_compare_data,
+         _cycle(mw.tab_compare_data.compare_column_selector)),
+    ]
+
+
+def load_dataset(bench, domain, num_points):
+    mw = bench.mw
+    df = make_dataset(domain, num_points)
+    # The previous comparison frame has the other domain's length
+    mw.df_compare = None
+    mw.on_data_loaded(df, domain, os.path.join(ROOT_DIR, 'bench', 'bench_folder'))
+    # Comparison data is attached directly; on_comparison_data_loaded would open a message box
+    df_compare = make_dataset(domain, num_points, seed=1)
+    mw.compare_data_version += 1
+    mw.df_compare = df_compare
+    bench.controller.update_compare_column_list()
+    if domain == 'TIME':
+        mw.tab_single_data.spectrum_checkbox.setChecked(True)
+    bench.settle()
+
+
+def run_benchmark(args):
+    register_url_scheme()
+    app = QApplication(sys.argv[:1])
+
+    from app.data_manager import DataManager
+    from app.main_window import MainWindow
+
+    recorder = StageRecorder()
+    recorder.install()
+    mw = MainWindow(DataManager())
+    # Spectra of the synthetic datasets go to a throwaway folder, not the user's cache, and start cold every run
+    cache_dir = tempfile.TemporaryDirectory(prefix='wedavis-bench-')
+    mw.plot_controller.set_spectrum_cache_dir(cache_dir.name)
+    mw.resize(1600, 1000)
+    mw.show()
+    bench = LatencyBench(app, mw, recorder, wait_for_render=not args.no_render, timeout_ms=args.timeout_ms)
+
+    results = {}
+    for domain, num_points, scenarios in (('TIME', args.time_points, time_scenarios),
+                                          ('FREQ', args.freq_points, freq_scenarios)):
+        load_dataset(bench, domain, num_points)
+        samples = {}
+        for repeat in range(args.repeats):
+            for name, view, tab, action in scenarios(mw, repeat):
+                mw.tab_widget.setCurrentWidget(tab)
+                bench.settle()
+                try:
+                    measurement = bench.measure(view, action)
+                except TimeoutError as e:
+                    print(f"  {domain} {name}: {e}")
+                    continue
+                samples.setdefault(f'{domain}.{name}', []).append(measurement)
+        for scenario, runs in samples.items():
+            results[scenario] = {stage: round(statistics.median(run[stage] for run in runs), 2) for stage in STAGES}
+
+    mw.close()
+    cache_dir.cleanup()
+    return {
+        'meta': {
+            'time_points': args.time_points,
+            'freq_points': args.freq_points,
+            'repeats': args.repeats,
+            'render_measured': not args.no_render,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def print_results(report):
+    header = f"{'scenario':40s}" + ''.join(f'{stage:>11s}' for stage in STAGES)
+    print(header)
+    print('-' * len(header))
+    for scenario, stages in report['results'].items():
+        print(f'{scenario:40s}' + ''.join(f'{stages[stage]:11.1f}' for stage in STAGES))
+    print("(milliseconds, median of repeats)")
+
+
+def compare_with_baseline(report, baseline, tolerance, floor_ms):
+    """Returns a list of regressions: stages slower than the baseline by more than the tolerance and the floor."""
+    regressions = []
+    for scenario, stages in report['results'].items():
+        base_stages = baseline.get('results', {}).get(scenario)
+        if base_stages is None:
+            continue
+        for stage in STAGES:
+            current, base = stages.get(stage), base_stages.get(stage)
+            if current is None or base is None:
+                continue
+            if current > base * (1.0 + tolerance) and current - base > floor_ms:
+                regressions.append(f"{scenario} {stage}: {base:.1f} ms -> {current:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure parameter-change to plot-visible latency of WE-DAVIS views.")
+    parser.add_argument('--time-points', type=int, default=200000, help='Samples per channel in the TIME dataset')
+    parser.add_argument('--freq-points', type=int, default=2000, help='Frequencies in the FREQ dataset')
+    parser.add_argument('--repeats', type=int, default=3, help='Measurements per scenario (median is reported)')
+    parser.add_argument('--timeout-ms', type=int, default=60000, help='Give up on a single update after this time')
+    parser.add_argument('--no-render', action='store_true', help='Stop timing when figures are handed to the views')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown per stage')
+    parser.add_argument('--floor-ms', type=float, default=20.0, help='Ignore slowdowns smaller than this')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('meta', {}).get('time_points') != args.time_points or \
+            baseline.get('meta', {}).get('render_measured') != (not args.no_render):
+        print("\nWarning: baseline was recorded with different settings; comparison may be meaningless.")
+    regressions = compare_with_baseline(report, baseline, args.tolerance, args.floor_ms)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -125,6 +125,36 @@ def check_plotly_resources():
         print(f"Warning: Could not check package resources: {e}")
         print()
 
+def check_shared_plotly_asset():
+    """Check that the WE-DAVIS plot page references a local plotly.js file only."""
+    print("Checking shared plotly.js asset used by the plot views...")
+    print()
+
+    try:
+        from app.plotting.web_view import get_plotly_js_path, get_plot_page_html
+
+        js_path = get_plotly_js_path()
+        if os.path.isfile(js_path) and os.path.getsize(js_path) > 100000:
+            print(f"✓ plotly.js found: {js_path} ({os.path.getsize(js_path):,} bytes)")
+        else:
+            print(f"✗ plotly.js missing or incomplete: {js_path}")
+            print()
+            return False
+
+        html_content = get_plot_page_html()
+        if 'http://' in html_content or 'https://' in html_content or 'cdn' in html_content.lower():
+            print("✗ Plot page references a remote URL")
+            print()
+            return False
+        print(f"✓ Plot page references only local files (page size: {len(html_content):,} bytes)")
+        print()
+        return True
+
+    except Exception as e:
+        print(f"✗ Could not check shared plotly.js asset: {e}")
+        print()
+        return False
+
 if __name__ == "__main__":
     print()
     print("╔════════════════════════════════════════════════════════════╗")
@@ -137,7 +167,7 @@ if __name__ == "__main__":
     
     # Run test
     try:
-        success = test_plotly_inline()
+        success = check_shared_plotly_asset() and test_plotly_inline()
         if success:
             sys.exit(0)
         else:
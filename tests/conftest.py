@@ -0,0 +1,7 @@
+# File: tests/conftest.py
+
+import os
+import sys
+
+# The tests import the application package from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,67 @@
+# File: tests/test_fatigue.py
+
+import numpy as np
+
+from app.analysis.fatigue import (
+    analyse_signals,
+    damage_equivalent_load,
+    rainflow_cycles,
+    turning_points,
+)
+
+
+def _rainflow_reference(values):
+    """Sequential four-point rainflow count (stack of turning points), the textbook algorithm."""
+    stack, ranges, means, counts = [], [], [], []
+    for point in turning_points(values):
+        stack.append(point)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            if abs(c - b) <= abs(b - a) and abs(c - b) <= abs(d - c):
+                ranges.append(abs(c - b))
+                means.append((b + c) / 2)
+                counts.append(1.0)
+                del stack[-3:-1]
+            else:
+                break
+    for a, b in zip(stack[:-1], stack[1:]):
+        ranges.append(abs(b - a))
+        means.append((a + b) / 2)
+        counts.append(0.5)
+    return np.array(ranges), np.array(means), np.array(counts)
+
+
+def _sorted_cycles(ranges, means, counts):
+    order = np.lexsort((means, ranges, counts))
+    return ranges[order], means[order], counts[order]
+
+
+def test_turning_points_drop_nan_repeats_and_monotonic_samples():
+    values = [0.0, 1.0, 1.0, 2.0, np.nan, 1.0, 3.0, 3.0, -1.0]
+    np.testing.assert_array_equal(turning_points(values), [0.0, 2.0, 1.0, 3.0, -1.0])
+
+
+def test_rainflow_matches_sequential_reference():
+    rng = np.random.default_rng(0)
+    for values in (rng.standard_normal(5000), np.cumsum(rng.standard_normal(5000)), rng.integers(-3, 4, 500)):
+        for actual, expected in zip(_sorted_cycles(*rainflow_cycles(values)),
+                                    _sorted_cycles(*_rainflow_reference(values))):
+            np.testing.assert_allclose(actual, expected)
+
+
+def test_damage_equivalent_load_of_constant_amplitude():
+    ranges, _, counts = rainflow_cycles(np.tile([-3.0, 3.0], 10))
+    # Every cycle has range 6, so normalised to the counted cycles the DEL is that range for any exponent
+    for exponent in (3.0, 10.0):
+        np.testing.assert_allclose(damage_equivalent_load(ranges, counts, exponent, counts.sum()), 6.0)
+    np.testing.assert_allclose(damage_equivalent_load(ranges, counts, 4.0, 2 * counts.sum()), 6.0 / 2 ** 0.25)
+
+
+def test_analyse_signals_keeps_the_order_and_totals():
+    rng = np.random.default_rng(1)
+    signals = {name: (rng.standard_normal(2000), 20.0) for name in ('b', 'a')}
+    results = analyse_signals(signals)
+    assert list(results) == ['b', 'a']
+    for name, result in results.items():
+        _, _, counts = rainflow_cycles(signals[name][0])
+        np.testing.assert_allclose(result.matrix.sum(), counts.sum())
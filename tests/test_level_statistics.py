@@ -0,0 +1,55 @@
+# File: tests/test_level_statistics.py
+
+import numpy as np
+import pytest
+
+from app.analysis.level_statistics import (
+    ROW_BLOCK,
+    compute_level_statistics,
+    histograms,
+    level_crossings,
+)
+
+
+def _values(seed=0):
+    # Longer than one row block, so the blocking is exercised
+    values = np.random.default_rng(seed).standard_normal((ROW_BLOCK + 1234, 3))
+    values[:, 1] *= 5.0
+    return values
+
+
+def test_histograms_match_numpy():
+    values = _values()
+    edges, counts = histograms(values, 16)
+    for col in range(values.shape[1]):
+        expected_counts, expected_edges = np.histogram(values[:, col], bins=16)
+        np.testing.assert_allclose(edges[col], expected_edges)
+        np.testing.assert_array_equal(counts[col], expected_counts)
+
+
+def test_histograms_drop_nan_samples():
+    values = _values()
+    values[::7, 0] = np.nan
+    values[:, 2] = np.nan
+    _, counts = histograms(values, 16)
+    assert counts[0].sum() == np.count_nonzero(~np.isnan(values[:, 0]))
+    assert counts[1].sum() == len(values)
+    assert counts[2].sum() == 0
+
+
+def test_level_crossings_match_brute_force():
+    values = _values(1)
+    levels, counts = level_crossings(values, 16)
+    for col in range(values.shape[1]):
+        before, after = values[:-1, col], values[1:, col]
+        expected = [np.count_nonzero((before < level) & (after >= level)) for level in levels[col]]
+        np.testing.assert_array_equal(counts[col], expected)
+
+
+def test_compute_level_statistics_of_several_blocks():
+    blocks = {'left': _values(2)[:500], 'right': _values(3)[:700]}
+    statistics = compute_level_statistics(blocks, 'histogram', bins=8)
+    assert list(statistics) == ['left', 'right']
+    assert statistics['right'][1].sum() == 700 * 3
+    with pytest.raises(ValueError):
+        compute_level_statistics(blocks, 'median')
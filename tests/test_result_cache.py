@@ -0,0 +1,65 @@
+# File: tests/test_result_cache.py
+
+import os
+
+import numpy as np
+
+from app.analysis.result_cache import ResultCache, hash_arrays
+
+
+def test_hash_arrays_follows_content_dtype_and_shape():
+    values = np.arange(12, dtype=np.float64)
+    assert hash_arrays(values) == hash_arrays(values.copy())
+    # A strided view hashes like its contiguous copy
+    assert hash_arrays(np.arange(24, dtype=np.float64)[::2]) == hash_arrays(np.arange(0, 24, 2, dtype=np.float64))
+    assert hash_arrays(values) != hash_arrays(values.astype(np.float32))
+    assert hash_arrays(values) != hash_arrays(values.reshape(3, 4))
+    assert hash_arrays(values, values) != hash_arrays(values)
+
+
+def test_memory_entries_are_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put('a', (np.zeros(1),))
+    cache.put('b', (np.ones(1),))
+    cache.get('a')
+    cache.put('c', (np.ones(1),))
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_disk_entries_survive_a_new_cache(tmp_path):
+    result = (np.arange(5.0), np.eye(2, dtype=np.float32))
+    ResultCache(disk_dir=str(tmp_path)).put(('key', 1), result)
+    loaded = ResultCache(disk_dir=str(tmp_path)).get(('key', 1))
+    assert len(loaded) == 2
+    for expected, actual in zip(result, loaded):
+        np.testing.assert_array_equal(actual, expected)
+        assert actual.dtype == expected.dtype
+
+
+def test_any_picklable_value_is_cached_as_is(tmp_path):
+    result = {'folder_a': (np.arange(3.0), np.ones((2, 2))), 'folder_b': None}
+    cache = ResultCache(disk_dir=str(tmp_path))
+    cache.put('dict', result)
+    assert cache.get('dict') is result
+    loaded = ResultCache(disk_dir=str(tmp_path)).get('dict')
+    assert loaded.keys() == result.keys()
+    np.testing.assert_array_equal(loaded['folder_a'][1], result['folder_a'][1])
+    assert loaded['folder_b'] is None
+
+
+def test_disk_eviction_removes_least_recently_used_files(tmp_path):
+    payload = (np.zeros(1000),)
+    cache = ResultCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=10 ** 9)
+    for i, key in enumerate(['old', 'used', 'new']):
+        cache.put(key, payload)
+        os.utime(cache._disk_path(key), (1000.0 + i, 1000.0 + i))
+    # Reading a file from disk marks it as recently used
+    cache.clear()
+    assert cache.get('old') is not None
+    file_size = os.path.getsize(cache._disk_path('new'))
+    cache.max_disk_bytes = 2 * file_size
+    cache.put('newest', payload)
+    assert [os.path.exists(cache._disk_path(key)) for key in ('old', 'used', 'new', 'newest')] == [
+        True, False, False, True]
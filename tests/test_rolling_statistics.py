@@ -0,0 +1,45 @@
+# File: tests/test_rolling_statistics.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analysis.data_processing import rolling_statistic
+
+
+def _pandas_rolling(values, window, statistic):
+    frame = pd.DataFrame(values)
+    if statistic == 'mean':
+        return frame.rolling(window).mean().to_numpy()
+    if statistic == 'std':
+        return frame.rolling(window).std().to_numpy()
+    if statistic == 'rms':
+        return np.sqrt((frame ** 2).rolling(window).mean().to_numpy())
+    return frame.abs().rolling(window).max().to_numpy()
+
+
+@pytest.mark.parametrize('statistic', ['mean', 'rms', 'std', 'peak'])
+@pytest.mark.parametrize('window', [1, 5, 16])
+def test_matches_pandas_rolling(statistic, window):
+    values = np.random.default_rng(0).standard_normal((200, 3)) * 3 + 100
+    np.testing.assert_allclose(rolling_statistic(values, window, statistic),
+                               _pandas_rolling(values, window, statistic), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('statistic', ['mean', 'rms', 'std', 'peak'])
+def test_nan_only_blanks_the_windows_containing_it(statistic):
+    values = np.random.default_rng(1).standard_normal((20, 3)) * 3 + 100
+    values[7, 0] = np.nan
+    values[19, 1] = np.nan
+    values[:, 2] = np.nan
+    result = rolling_statistic(values, 5, statistic)
+    expected = _pandas_rolling(values, 5, statistic)
+    np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+    # 4 rows of warm-up plus the 5 windows that contain the NaN sample
+    assert np.isnan(result[:, 0]).sum() == 9
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_unknown_statistic():
+    with pytest.raises(ValueError):
+        rolling_statistic(np.zeros((4, 1)), 2, 'median')
@@ -0,0 +1,19 @@
+# File: tests/test_shock.py
+
+import numpy as np
+import pandas as pd
+from endaq.calc.shock import shock_spectrum
+
+from app.analysis.shock import compute_srs
+
+
+def test_srs_matches_endaq_shock_spectrum():
+    fs = 200.0
+    t = np.arange(2000) / fs
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': np.sin(2 * np.pi * 10 * t) + 0.1 * rng.standard_normal(t.size),
+                       'b': rng.standard_normal(t.size)}, index=t)
+    frequencies, srs = compute_srs(df)
+    # max_time covers the whole record, so endaq does not split it into separately evaluated chunks
+    expected = shock_spectrum(df, freqs=frequencies, max_time=100.0)
+    np.testing.assert_allclose(srs, expected[['a', 'b']].to_numpy(), rtol=1e-9)
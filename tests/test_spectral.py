@@ -0,0 +1,106 @@
+# File: tests/test_spectral.py
+
+import numpy as np
+import pandas as pd
+from endaq.calc.fft import rolling_fft
+from scipy import signal
+
+from app.analysis.spectral import (
+    bin_spectrum,
+    coherence,
+    compute_spectra,
+    compute_spectrum,
+    transfer_function_h1,
+    welch_csd,
+    welch_psd,
+)
+
+FS = 200.0
+
+
+def _signal_df(n=2000, seed=0):
+    t = np.arange(n) / FS
+    noise = np.random.default_rng(seed).standard_normal(n)
+    return pd.DataFrame({'a': np.sin(2 * np.pi * 10 * t) + 0.1 * noise}, index=t)
+
+
+def test_rolling_spectrum_matches_endaq_rolling_fft():
+    df = _signal_df()
+    frequencies, times, amplitudes = compute_spectrum(df, 20)
+    reference = rolling_fft(df, bin_width=1.0, num_slices=20, add_resultant=False)
+    reference = reference.pivot(index='timestamp', columns='frequency (Hz)', values='value')
+    np.testing.assert_allclose(times, reference.index.to_numpy())
+    np.testing.assert_allclose(frequencies, reference.columns.to_numpy())
+    np.testing.assert_allclose(amplitudes, reference.to_numpy(), atol=1e-5)
+
+
+def test_compute_spectra_batches_like_single_spectra():
+    signals = {'f1': _signal_df(seed=1), 'f2': _signal_df(seed=2), 'short': _signal_df(n=1500, seed=3),
+               'one sample': _signal_df(n=1)}
+    spectra = compute_spectra(signals, 20)
+    assert list(spectra) == ['f1', 'f2', 'short']
+    for name, spectrum in spectra.items():
+        for batched, single in zip(spectrum, compute_spectrum(signals[name], 20)):
+            np.testing.assert_allclose(batched, single, atol=1e-6)
+
+
+def test_bin_spectrum_keeps_peaks():
+    amplitudes = np.random.default_rng(0).random((300, 500)).astype(np.float32)
+    amplitudes[123, 321] = 10.0
+    times, frequencies, z = bin_spectrum(np.arange(500.0), np.arange(300.0), amplitudes, 40, 60)
+    assert z.shape == (frequencies.size, times.size) == (60, 40)
+    assert z.max() == 10.0
+
+
+def test_welch_psd_matches_scipy():
+    values = np.random.default_rng(0).standard_normal((30001, 3))
+    frequencies, psd = welch_psd(values, 1 / FS)
+    expected_frequencies, expected = signal.welch(values.T, fs=FS, nperseg=int(FS))
+    np.testing.assert_allclose(frequencies, expected_frequencies)
+    np.testing.assert_allclose(psd.T, expected, rtol=1e-4, atol=1e-6 * expected.max())
+
+
+def test_welch_csd_matches_scipy_csd_and_coherence():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(40000)
+    y = signal.lfilter([0.5, 0.3], [1, -0.5], x) + 0.3 * rng.standard_normal(x.size)
+    z = rng.standard_normal(x.size)
+    frequencies, auto, csd = welch_csd(np.column_stack((x, y, z)), [(0, 1), (0, 2)], 1 / FS)
+
+    _, expected_csd = signal.csd(x, y, fs=FS, nperseg=int(FS))
+    _, expected_auto = signal.welch(np.vstack((x, y, z)), fs=FS, nperseg=int(FS))
+    _, expected_coherence = signal.coherence(x, y, fs=FS, nperseg=int(FS))
+    scale = np.abs(expected_csd).max()
+    np.testing.assert_allclose(csd[:, 0], expected_csd, atol=1e-5 * scale)
+    np.testing.assert_allclose(auto.T, expected_auto, atol=1e-5 * expected_auto.max())
+    np.testing.assert_allclose(coherence(auto[:, 0], auto[:, 1], csd[:, 0]), expected_coherence, atol=1e-5)
+
+
+def test_transfer_function_h1_recovers_a_gain():
+    x = np.random.default_rng(0).standard_normal(20000)
+    _, auto, csd = welch_csd(np.column_stack((x, -2.0 * x)), [(0, 1)], 1 / FS)
+    h1 = transfer_function_h1(auto[:, 0], csd[:, 0])
+    np.testing.assert_allclose(h1[1:], -2.0, rtol=1e-4)
+    np.testing.assert_allclose(coherence(auto[:, 0], auto[:, 1], csd[:, 0])[1:], 1.0, rtol=1e-4)
+
+
+def _offset_sine(n=4000):
+    # A small fluctuation on a large offset, e.g. a strain gauge reading around its static load
+    t = np.arange(n) / FS
+    return 1e4 + 0.01 * np.sin(2 * np.pi * 50 * t)
+
+
+def test_rolling_spectrum_resolves_a_small_signal_on_a_large_offset():
+    values = _offset_sine()
+    df = pd.DataFrame({'a': values}, index=np.arange(values.size) / FS)
+    _, _, amplitudes = compute_spectrum(df, 20)
+    reference = rolling_fft(df, bin_width=1.0, num_slices=20, add_resultant=False)
+    reference = reference.pivot(index='timestamp', columns='frequency (Hz)', values='value').to_numpy()
+    np.testing.assert_allclose(amplitudes, reference, atol=1e-6)
+
+
+def test_welch_psd_resolves_a_small_signal_on_a_large_offset():
+    values = _offset_sine()[:, np.newaxis]
+    _, psd = welch_psd(values, 1 / FS)
+    _, expected = signal.welch(values[:, 0], fs=FS, nperseg=int(FS))
+    np.testing.assert_allclose(psd[:, 0], expected, rtol=1e-3, atol=1e-6 * expected.max())